@@ -1,151 +1,163 @@
+import argparse
 import asyncio
-from tortoise import Tortoise
 import os
 from dotenv import load_dotenv
-from src.core.game_manager import GameManager
-from src.models.base import ItemType
-from colorama import init, Fore, Style
 
+# Before the game modules: metrics reads PTHFNDR_METRICS when it is imported
 load_dotenv()
-init(autoreset=True)  # Initialize colorama
+
+from src.utils.startup import lazy_import, startup_phase, format_startup_report
+from src.utils import metrics
+
+def parse_args() -> argparse.Namespace:
+    """Command line options"""
+    parser = argparse.ArgumentParser(description="Pathfinder text adventure")
+    parser.add_argument("--import-report", action="store_true",
+                        help="print import and startup phase timings before the first turn")
+    parser.add_argument("--seed", type=int, default=None, help="world seed")
+    parser.add_argument("--serve", action="store_true",
+                        help="host a multiplayer server instead of a local game")
+    parser.add_argument("--host", default="127.0.0.1", help="server bind address")
+    parser.add_argument("--port", type=int, default=8023, help="server port")
+    parser.add_argument("--max-sessions", type=int, default=500,
+                        help="maximum concurrent players in server mode")
+    parser.add_argument("--script", metavar="PATH",
+                        help="run the commands in a script file (or - for stdin) as one batch and exit")
+    parser.add_argument("--load", type=int, default=None, metavar="ID",
+                        help="game to run --script against instead of a new one")
+    return parser.parse_args()
 
 async def init_db():
     """Initialize database connection"""
-    await Tortoise.init(
-        db_url=os.getenv('DATABASE_URL'),
-        modules={'models': ['src.models.base']}
-    )
-    await Tortoise.generate_schemas()
+    with startup_phase("database init"):
+        Tortoise = lazy_import("tortoise").Tortoise
+        await Tortoise.init(
+            db_url=os.getenv('DATABASE_URL'),
+            modules={'models': ['src.models.base']}
+        )
+        await Tortoise.generate_schemas()
+        await lazy_import("src.models.database").upgrade_schema(Tortoise.get_connection("default"))
+
+async def prepare_game_manager(seed=None):
+    """Import the game core and warm up the world generator in the background"""
+    with startup_phase("world warm-up"):
+        GameManager = lazy_import("src.core.game_manager").GameManager
+        game_manager = GameManager(seed=seed)
+        await asyncio.to_thread(game_manager.world_generator.warm_up)
+    return game_manager
 
-async def play_game():
+def start_prompt(text: str) -> asyncio.Future:
+    """Show a prompt immediately and read the reply on a worker thread"""
+    return asyncio.get_running_loop().run_in_executor(None, input, text)
+
+async def prompt(text: str) -> str:
+    """Read a line of input without blocking background work on the loop"""
+    return await start_prompt(text)
+
+async def play_game(args: argparse.Namespace):
     """Main game loop with user input"""
-    # Create game manager with random seed
-    game_manager = GameManager()
-    
+    from colorama import Fore, Style
+    from src.core.commands import render_location, execute_command
+
     print(f"{Fore.GREEN}Welcome to Pathfinder!{Style.RESET_ALL}")
-    print("Starting new game...")
-    game_state = await game_manager.new_game()
+    start_input = start_prompt(
+        f"{Fore.GREEN}Press Enter to start a new game, or type 'load <id>' to resume: {Style.RESET_ALL}"
+    )
+
+    # The database and world warm up while the player reads the prompt
+    await init_db()
+    game_manager = await prepare_game_manager(args.seed)
+    start_command = (await start_input).lower().split()
+
+    game_state = None
+    if len(start_command) >= 2 and start_command[0] == "load":
+        try:
+            game_state = await game_manager.load_game(int(start_command[1]))
+            print(f"Resuming game {game_state.id}...")
+        except ValueError as e:
+            print(f"Error: {e}")
+    if game_state is None:
+        print("Starting new game...")
+        game_state = await game_manager.new_game()
+        print(f"Game id: {game_state.id}")
+
+    if args.import_report:
+        print(format_startup_report())
     
     while True:
-        # Display current location
-        location = await game_manager.get_current_location()
-        print(f"\n{Fore.CYAN}Current Location:{Style.RESET_ALL}")
-        print(f"Position: ({location.x}, {location.y})")
-        print(f"Biome: {location.biome_type}")
-        print(f"Description: {location.description}")
-        print(f"Weather: {location.weather}")
-        
-        # Display available actions
-        actions = await game_manager.get_available_actions()
-        print(f"\n{Fore.YELLOW}Available Actions:{Style.RESET_ALL}")
-        for action in actions:
-            if action["type"] == "move":
-                print(f"- move {action['direction']} [distance]")
-            elif action["type"] == "interact":
-                print(f"- interact {action['target']} {action['variant']}")
-        
-        # Get user input
+        # Display current location unless we're mid-interaction
         try:
-            command = input(f"\n{Fore.GREEN}What would you like to do? {Style.RESET_ALL}").lower().split()
-            
-            if not command:
-                continue
-                
-            if command[0] == "quit":
-                print("Saving game and exiting...")
-                await game_manager.save_game()
+            # Writes are committed together once per turn; no turn stays open while waiting for input
+            if not game_manager.in_interaction:
+                async with game_manager.turn():
+                    print(await render_location(game_manager))
+
+            # Get user input
+            line = await prompt(f"\n{Fore.GREEN}What would you like to do? {Style.RESET_ALL}")
+            async with game_manager.turn():
+                output, quit_requested = await execute_command(game_manager, line)
+            if output:
+                print(output)
+            if quit_requested:
                 break
-                
-            if command[0] == "move" and len(command) >= 2:
-                direction = command[1]
-                distance = int(command[2]) if len(command) > 2 else 100
-                
-                if direction in ["north", "south", "east", "west"]:
-                    result, updates = await game_manager.process_action("move", {
-                        "direction": direction,
-                        "distance": distance
-                    })
-                    print(f"\n{result}")
-                else:
-                    print("Invalid direction. Use: north, south, east, or west")
-                    
-            elif command[0] == "interact" and len(command) >= 3:
-                target = command[1]
-                variant = command[2]
-                
-                # Start interaction mode
-                result = await game_manager.interaction_manager.start_interaction(target, variant)
-                print(result)
-                
-                # Enter interaction loop
-                while True:
-                    try:
-                        interaction_command = input(f"\n{Fore.GREEN}What would you like to do? {Style.RESET_ALL}").lower()
-                        
-                        if not interaction_command:
-                            continue
-                            
-                        result = await game_manager.interaction_manager.process_interaction(interaction_command)
-                        print(f"\n{result}")
-                        
-                        if interaction_command == "leave" or result == "Ending interaction.":
-                            break
-                            
-                    except Exception as e:
-                        print(f"Interaction error: {e}")
-                        break
-                
-            elif command[0] == "inventory":
-                items = await game_manager.get_inventory()
-                if items:
-                    print(f"\n{Fore.YELLOW}Inventory:{Style.RESET_ALL}")
-                    for item in items:
-                        print(f"- {Fore.CYAN}{item['name']}{Style.RESET_ALL}")
-                        print(f"  Type: {item['type']}")
-                        print(f"  Description: {item['description']}")
-                        if item['properties']:
-                            print(f"  Properties:")
-                            for prop, value in item['properties'].items():
-                                print(f"    {prop}: {value}")
-                else:
-                    print("\nInventory is empty")
-                    
-            elif command[0] == "take" and len(command) >= 2:
-                item_name = " ".join(command[1:])
-                result = await game_manager.add_item(item_name)
-                print(f"\n{result}")
-                
-            elif command[0] == "drop" and len(command) >= 2:
-                item_name = " ".join(command[1:])
-                result = await game_manager.drop_item(item_name)
-                print(f"\n{result}")
-                
-            else:
-                print("Invalid command. Available commands:")
-                print("- move <direction> [distance]")
-                print("- interact <target> <variant>")
-                print("- inventory")
-                print("- take <item_name>")
-                print("- drop <item_name>")
-                print("- quit")
-                
-        except ValueError as e:
-            print(f"Error: {e}")
         except Exception as e:
             print(f"An error occurred: {e}")
 
-async def main():
-    # Initialize database
+async def run_script(args: argparse.Namespace):
+    """Run a script of commands against a new or loaded game in a single turn"""
+    from src.core.commands import execute_batch, read_script
+
+    lines = read_script(args.script)
     await init_db()
-    
+    game_manager = await prepare_game_manager(args.seed)
+    if args.load is not None:
+        game_state = await game_manager.load_game(args.load)
+    else:
+        game_state = await game_manager.new_game()
+    print(f"Game id: {game_state.id}")
+
+    # Every tile and state change of the script is committed in one transaction
+    async with game_manager.turn():
+        output, quit_requested = await execute_batch(game_manager, lines)
+        if not quit_requested:
+            await game_manager.save_game()
+    if output:
+        print(output)
+    if game_manager.journal is not None:
+        game_manager.journal.close()
+
+async def run_server(args: argparse.Namespace):
+    """Host many players over one shared world until interrupted"""
+    import random
+    from src.core.server import serve
+
+    await init_db()
+    seed = args.seed or random.randint(0, 1000000)
+    if args.import_report:
+        print(format_startup_report())
+    await serve(seed, host=args.host, port=args.port, max_sessions=args.max_sessions)
+
+async def main():
+    from colorama import init, Fore, Style
+    init(autoreset=True)  # Initialize colorama
+
+    args = parse_args()
     try:
-        # Start the game loop
-        await play_game()
+        if args.serve:
+            await run_server(args)
+        elif args.script:
+            await run_script(args)
+        else:
+            # Start the game loop; the database is initialized behind the first prompt
+            await play_game(args)
     except Exception as e:
         print(f"{Fore.RED}Error: {e}{Style.RESET_ALL}")
     finally:
         # Cleanup
-        await Tortoise.close_connections()
+        metrics.export_metrics()
+        from src.core.generation import shutdown_executor
+        shutdown_executor()
+        await lazy_import("tortoise").Tortoise.close_connections()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,118 @@
+"""Biome classification as a lookup table over quantized elevation and moisture.
+
+Elevation and moisture are each cut into bands at configurable edges, and
+a band is either one category or a dithered pair. In a dithered pair, a
+tile takes the upper category when its seeded band dither exceeds
+`dither_threshold`. The table is expanded once into an array indexed by
+[elevation band, moisture band, elevation bit, moisture bit]. Whole grids
+are then classified with one searchsorted per axis and one fancy index.
+
+The default table reproduces the original thresholds. Pass another table
+as a dict to WorldGenerator, or name a JSON file of the same shape in
+PTHFNDR_BIOME_TABLE, to retune biomes without touching code.
+"""
+import json
+import os
+from bisect import bisect_left
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+from src.models.base import BiomeType
+from src.utils.startup import lazy_import
+
+DEFAULT_BIOME_TABLE: Dict[str, Any] = {
+    # Band i covers (edges[i-1], edges[i]]; a [lower, upper] pair is dithered
+    "elevation": {
+        "edges": [-0.2, 0.1, 0.4],
+        "bands": ["low", ["low", "medium"], "medium", "high"]
+    },
+    "moisture": {
+        "edges": [-0.3, 0.0, 0.3],
+        "bands": ["dry", ["dry", "medium"], "medium", "wet"]
+    },
+    "dither_threshold": 0.3,
+    # Biome for each [elevation category][moisture category]
+    "matrix": {
+        "high": {"wet": "MOUNTAIN", "medium": "MOUNTAIN", "dry": "DESERT"},
+        "medium": {"wet": "SWAMP", "medium": "FOREST", "dry": "PLAINS"},
+        "low": {"wet": "SWAMP", "medium": "PLAINS", "dry": "TUNDRA"}
+    }
+}
+
+# JSON file with a replacement for DEFAULT_BIOME_TABLE
+BIOME_TABLE_PATH = os.getenv("PTHFNDR_BIOME_TABLE", "")
+
+def _band_pair(band: Union[str, Sequence[str]]) -> Tuple[str, str]:
+    """(category below the dither threshold, category above it)"""
+    if isinstance(band, str):
+        return band, band
+    lower, upper = band
+    return lower, upper
+
+class BiomeTable:
+    """Precomputed mapping from (elevation, moisture, band dithers) to biome codes"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        from src.core.world import BIOME_INDEX
+        config = config or DEFAULT_BIOME_TABLE
+        self.elevation_edges = tuple(float(edge) for edge in config["elevation"]["edges"])
+        self.moisture_edges = tuple(float(edge) for edge in config["moisture"]["edges"])
+        elevation_bands = [_band_pair(band) for band in config["elevation"]["bands"]]
+        moisture_bands = [_band_pair(band) for band in config["moisture"]["bands"]]
+        if (len(elevation_bands) != len(self.elevation_edges) + 1
+                or len(moisture_bands) != len(self.moisture_edges) + 1):
+            raise ValueError("A biome table needs one band more than it has edges on each axis")
+        if list(self.elevation_edges) != sorted(self.elevation_edges) or \
+                list(self.moisture_edges) != sorted(self.moisture_edges):
+            raise ValueError("Biome table edges must be in ascending order")
+        self.dither_threshold = float(config["dither_threshold"])
+        matrix = config["matrix"]
+
+        # Only bands whose categories differ need their dither evaluated
+        self.elevation_dithered = tuple(lower != upper for lower, upper in elevation_bands)
+        self.moisture_dithered = tuple(lower != upper for lower, upper in moisture_bands)
+        # Nested lists [e][m][e_bit][m_bit] of codes, the scalar form of `lut`
+        self.codes = [
+            [
+                [
+                    [BIOME_INDEX[BiomeType[matrix[e_band[e_bit]][m_band[m_bit]]]] for m_bit in (0, 1)]
+                    for e_bit in (0, 1)
+                ]
+                for m_band in moisture_bands
+            ]
+            for e_band in elevation_bands
+        ]
+        self.key = json.dumps(config, sort_keys=True)  # Identifies the table in world keys
+        self._lut = None
+
+    @classmethod
+    def from_environment(cls) -> "BiomeTable":
+        """The table named by PTHFNDR_BIOME_TABLE, or the default one"""
+        if not BIOME_TABLE_PATH:
+            return cls()
+        with open(BIOME_TABLE_PATH, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    @property
+    def lut(self):
+        """uint8 array of biome codes [elevation band, moisture band, elevation bit, moisture bit]"""
+        if self._lut is None:
+            np = lazy_import("numpy")
+            self._lut = np.array(self.codes, dtype=np.uint8)
+            self._lut.flags.writeable = False
+        return self._lut
+
+    def classify(self, elevation: float, moisture: float, elevation_dither, moisture_dither) -> int:
+        """Biome code of one tile; the dithers are callables, evaluated only for dithered bands"""
+        e = bisect_left(self.elevation_edges, elevation)
+        m = bisect_left(self.moisture_edges, moisture)
+        e_bit = int(self.elevation_dithered[e] and elevation_dither() > self.dither_threshold)
+        m_bit = int(self.moisture_dithered[m] and moisture_dither() > self.dither_threshold)
+        return self.codes[e][m][e_bit][m_bit]
+
+    def classify_grid(self, elevation, moisture, elevation_dither, moisture_dither):
+        """Biome codes for arrays of values; the dithers are arrays of the same shape"""
+        np = lazy_import("numpy")
+        e = np.searchsorted(self.elevation_edges, elevation, side="left")
+        m = np.searchsorted(self.moisture_edges, moisture, side="left")
+        e_bit = (elevation_dither > self.dither_threshold).view(np.uint8)
+        m_bit = (moisture_dither > self.dither_threshold).view(np.uint8)
+        return self.lut[e, m, e_bit, m_bit]
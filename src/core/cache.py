@@ -0,0 +1,41 @@
+from collections import OrderedDict
+from typing import Optional, Tuple
+from src.core.tile import Tile
+from src.utils import metrics
+
+class LocationCache:
+    """LRU cache of tiles keyed by (x, y), shared by every game on a world"""
+
+    def __init__(self, max_size: int = 50000):
+        self.max_size = max_size
+        self._locations: "OrderedDict[Tuple[int, int], Tile]" = OrderedDict()
+
+    def get(self, x: int, y: int) -> Optional[Tile]:
+        """Return the cached location at (x, y), if any"""
+        location = self._locations.get((x, y))
+        metrics.cache_lookup("location_cache", location is not None)
+        if location is not None:
+            self._locations.move_to_end((x, y))
+        return location
+
+    def peek(self, x: int, y: int) -> Optional[Tile]:
+        """Cached location at (x, y) without touching recency or hit statistics"""
+        return self._locations.get((x, y))
+
+    def put(self, location: Tile) -> None:
+        """Cache a location, evicting the least recently used one when full"""
+        key = (location.x, location.y)
+        self._locations[key] = location
+        self._locations.move_to_end(key)
+        if len(self._locations) > self.max_size:
+            self._locations.popitem(last=False)
+
+    def invalidate(self, x: int, y: int) -> None:
+        """Forget the cached location at (x, y)"""
+        self._locations.pop((x, y), None)
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    def __contains__(self, key: Tuple[int, int]) -> bool:
+        return key in self._locations
@@ -0,0 +1,222 @@
+from typing import Iterable, List, Tuple
+from colorama import Fore, Style
+from src.core.weather import WeatherSystem
+
+HELP_TEXT = "\n".join([
+    "Invalid command. Available commands:",
+    "- move <direction> [distance]",
+    "- interact <target> <variant>",
+    "- inventory",
+    "- take <item_name>",
+    "- drop <item_name>",
+    "- map [radius]",
+    "- find <biome|feature>",
+    "- look [direction]",
+    "- quit",
+    "Separate several commands with ';' to run them as one turn."
+])
+
+BATCH_SEPARATOR = ";"  # Separates commands given together on one line
+MAX_MAP_RADIUS = 32
+MAX_FEATURE_SEARCH = 64  # Steps; feature searches derive tiles one by one
+MAX_BIOME_SEARCH = 256  # Steps; biome searches read whole chunk arrays
+
+async def render_location(game_manager) -> str:
+    """Describe the current location and the actions available there"""
+    location = await game_manager.get_current_location()
+    weather = game_manager.get_weather(location)
+    lines = [
+        f"\n{Fore.CYAN}Current Location:{Style.RESET_ALL}",
+        f"Position: ({location.x}, {location.y})",
+        f"Biome: {location.biome_type}",
+        f"Description: {location.description} {WeatherSystem.describe(weather)}",
+        f"Weather: {weather.value}"
+    ]
+
+    actions = await game_manager.get_available_actions()
+    lines.append(f"\n{Fore.YELLOW}Available Actions:{Style.RESET_ALL}")
+    for action in actions:
+        if action["type"] == "move":
+            lines.append(f"- move {action['direction']} [distance]")
+        elif action["type"] == "interact":
+            lines.append(f"- interact {action['target']} {action['variant']}")
+    return "\n".join(lines)
+
+async def render_inventory(game_manager) -> str:
+    """Describe the items the player is carrying"""
+    items = await game_manager.get_inventory()
+    if not items:
+        return "\nInventory is empty"
+
+    lines = [f"\n{Fore.YELLOW}Inventory:{Style.RESET_ALL}"]
+    for item in items:
+        lines.append(f"- {Fore.CYAN}{item['name']}{Style.RESET_ALL}")
+        lines.append(f"  Type: {item['type']}")
+        lines.append(f"  Description: {item['description']}")
+        if item['properties']:
+            lines.append(f"  Properties:")
+            for prop, value in item['properties'].items():
+                lines.append(f"    {prop}: {value}")
+    return "\n".join(lines)
+
+async def render_map(game_manager, radius: int = 8) -> str:
+    """Minimap centred on the player, dimming tiles nobody has visited yet"""
+    from src.core.map_renderer import render_ascii, explored_tiles
+    if not 1 <= radius <= MAX_MAP_RADIUS:
+        raise ValueError(f"Map radius must be between 1 and {MAX_MAP_RADIUS}")
+    position = game_manager.current_game_state.current_position
+    center = (position["x"], position["y"])
+    size = 2 * radius + 1
+    explored = await explored_tiles(game_manager.seed, center[0] - radius, center[1] - radius, size, size)
+    return f"\n{Fore.CYAN}Map:{Style.RESET_ALL}\n" + render_ascii(game_manager.world_generator, center, radius, explored)
+
+def render_horizon(game_manager, direction: str = None) -> str:
+    """What lies ahead in one or all directions, from a low-detail preview of the terrain"""
+    from src.core.world import COMPASS
+    if direction is not None and direction not in COMPASS:
+        raise ValueError("Invalid direction. Use: north, south, east, or west")
+    position = game_manager.current_game_state.current_position
+    lines = [f"\n{Fore.CYAN}On the horizon:{Style.RESET_ALL}"]
+    for name in ([direction] if direction else COMPASS):
+        samples = game_manager.world_generator.horizon(position["x"], position["y"], name)
+        # Collapse consecutive samples of one biome into a span of distances
+        spans = []
+        for steps, biome in samples:
+            if spans and spans[-1][0] == biome:
+                spans[-1][2] = steps
+            else:
+                spans.append([biome, steps, steps])
+        stretches = ", ".join(f"{biome.name.lower()} ~{start}-{end}" for biome, start, end in spans)
+        lines.append(f"{name.title()}: {stretches}")
+    return "\n".join(lines)
+
+def _direction(dx: int, dy: int) -> str:
+    """Rough compass direction of an offset, north being +y"""
+    parts = []
+    if dy:
+        parts.append("north" if dy > 0 else "south")
+    if dx:
+        parts.append("east" if dx > 0 else "west")
+    if dx and dy and max(abs(dx), abs(dy)) > 2 * min(abs(dx), abs(dy)):
+        # Mostly along one axis
+        parts = [parts[0]] if abs(dy) > abs(dx) else [parts[1]]
+    return "-".join(parts) or "here"
+
+def render_search(game_manager, query: str) -> str:
+    """Find the nearest biome, feature type or feature variant named by `query`"""
+    from src.core.world import BIOME_FEATURES
+    from src.models.base import BiomeType
+    position = game_manager.current_game_state.current_position
+    x, y = position["x"], position["y"]
+    search = game_manager.world_search
+    biome = next((b for b in BiomeType if b.name.lower() == query), None)
+    if biome is not None:
+        result = search.nearest_biome(x, y, biome, MAX_BIOME_SEARCH)
+        limit = MAX_BIOME_SEARCH
+    else:
+        table = [entry for entries in BIOME_FEATURES.values() for entry in entries]
+        if any(kind == query for kind, _ in table):
+            result = search.nearest_feature(x, y, feature_type=query, max_distance=MAX_FEATURE_SEARCH)
+        elif any(query in variants for _, variants in table):
+            result = search.nearest_feature(x, y, variant=query, max_distance=MAX_FEATURE_SEARCH)
+        else:
+            raise ValueError(f"Unknown biome or feature: {query}")
+        limit = MAX_FEATURE_SEARCH
+    if result is None:
+        return f"\nNo {query} within {limit} steps"
+    found = result.biome.name.lower()
+    if result.feature is not None:
+        found = f"{result.feature['type']} {result.feature['variant']} in the {found}"
+    steps = "1 step" if result.distance == 1 else f"{result.distance} steps"
+    return (f"\nNearest {found}: {steps} {_direction(result.x - x, result.y - y)}, "
+            f"at ({result.x}, {result.y})")
+
+def read_script(path: str) -> List[str]:
+    """Command lines from a script file, or from stdin for "-", without blanks or # comments"""
+    import sys
+    if path == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    return [line for line in (line.strip() for line in lines) if line and not line.startswith("#")]
+
+async def execute_batch(game_manager, lines: Iterable[str]) -> Tuple[str, bool]:
+    """Run several commands in order and return their joined output and whether one quit
+
+    The caller's turn covers the whole batch, so its writes are committed
+    together. Commands after a quit are not run.
+    """
+    outputs = []
+    for line in lines:
+        output, quit_requested = await execute_command(game_manager, line)
+        if output:
+            outputs.append(output)
+        if quit_requested:
+            return "\n".join(outputs), True
+    return "\n".join(outputs), False
+
+async def execute_command(game_manager, line: str) -> Tuple[str, bool]:
+    """Run one line of player input and return (output, quit_requested)"""
+    # Input to an interaction is passed on whole, separators included
+    if BATCH_SEPARATOR in line and not game_manager.in_interaction:
+        return await execute_batch(game_manager, line.split(BATCH_SEPARATOR))
+    try:
+        if game_manager.in_interaction:
+            interaction_command = line.lower().strip()
+            if not interaction_command:
+                return "", False
+            result = await game_manager.interaction_manager.process_interaction(interaction_command)
+            return f"\n{result}", False
+
+        command = line.lower().split()
+        if not command:
+            return "", False
+
+        if command[0] == "quit":
+            await game_manager.save_game()
+            return "Saving game and exiting...", True
+
+        if command[0] == "move" and len(command) >= 2:
+            direction = command[1]
+            distance = int(command[2]) if len(command) > 2 else 100
+
+            if direction not in ["north", "south", "east", "west"]:
+                return "Invalid direction. Use: north, south, east, or west", False
+            result, updates = await game_manager.process_action("move", {
+                "direction": direction,
+                "distance": distance
+            })
+            return f"\n{result}", False
+
+        if command[0] == "interact" and len(command) >= 3:
+            # Start interaction mode; following lines go to the feature until "leave"
+            return await game_manager.interaction_manager.start_interaction(command[1], command[2]), False
+
+        if command[0] == "inventory":
+            return await render_inventory(game_manager), False
+
+        if command[0] == "take" and len(command) >= 2:
+            result = await game_manager.add_item(" ".join(command[1:]))
+            return f"\n{result}", False
+
+        if command[0] == "drop" and len(command) >= 2:
+            result = await game_manager.drop_item(" ".join(command[1:]))
+            return f"\n{result}", False
+
+        if command[0] == "map":
+            radius = int(command[1]) if len(command) > 1 else 8
+            return await render_map(game_manager, radius), False
+
+        if command[0] == "look":
+            return render_horizon(game_manager, command[1] if len(command) > 1 else None), False
+
+        if command[0] == "find" and len(command) >= 2:
+            return render_search(game_manager, "_".join(command[1:])), False
+
+        return HELP_TEXT, False
+
+    except ValueError as e:
+        return f"Error: {e}", False
+    except Exception as e:
+        return f"An error occurred: {e}", False
@@ -1,70 +1,394 @@
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterable, Mapping, Optional, Tuple
 from src.models.base import GameState, Location, BiomeType, Item, ItemType
-from src.core.world import WorldGenerator
-from src.core.weather import WeatherSystem
-from src.utils.items import generate_item_name, generate_item_description, get_item_properties
-from src.utils.item_definitions import get_item_definition
-from src.utils.structure_definitions import get_structure_interaction
-from src.utils.resource_definitions import get_resource_interaction
-from tortoise.exceptions import DoesNotExist
+from src.core.tile import Tile
+from src.core.weather import WeatherSystem, WeatherType
+from src.utils import metrics
+from tortoise.exceptions import DoesNotExist, IntegrityError
+from contextlib import asynccontextmanager
+import asyncio
 import random
 
+# Tiles around the player loaded in one query when a game is resumed
+LOAD_PREFETCH_RADIUS = 8
+# Tiles around a location cache miss loaded along with it
+MISS_PREFETCH_RADIUS = 2
+# Bound on remembered missing tiles before the set is reset
+ABSENT_TILES_LIMIT = 50000
+
+# Features a player uses up by taking from them
+DEPLETABLE_FEATURE_TYPES = ("resource", "mineral")
+
+# Interactions every feature of these types supports beyond the definitions files
+DEFAULT_INTERACTION_TYPES = {
+    "fish": ("examine", "catch", "feed"),
+    "creature": ("examine", "follow", "call"),
+    "water": ("examine", "drink", "swim")
+}
+
 class GameManager:
-    def __init__(self, seed: Optional[int] = None):
-        """Initialize the game manager with optional seed"""
+    def __init__(self, seed: Optional[int] = None, share_world: bool = True, journal: bool = True):
+        """Initialize the game manager with optional seed
+
+        With share_world, the world generator and location cache come from
+        the process-wide SharedWorld for the seed instead of being private.
+        Shared tiles are never modified; this game's changes to them live
+        in its overlay. Without `journal`, no action journal is opened even
+        when JOURNAL_DIR is set, e.g. for replays against a scratch database.
+        """
         self.seed = seed or random.randint(0, 1000000)
-        self.world_generator = WorldGenerator(seed=self.seed)
+        self.share_world = share_world
+        self.journaling = journal
         self.current_game_state: Optional[GameState] = None
+        # Subsystems are constructed on first use to keep startup cheap
+        self._world_generator = None
+        self._location_cache = None
+        self._interaction_manager = None
+        self._mcts_manager = None
+        self._world_search = None
+        self._unit_of_work = None  # Set for the duration of turn()
+        self.journal = None  # ActionJournal of the current game
+        self._inventory: Optional[List[Item]] = None  # Session copy of the inventory rows
+        self._absent_tiles = set()  # Tiles a prefetch found missing from the database
+        self.overlay = None  # GameOverlay of the current game
+        self.simulation = None  # WorldSimulation around the player, see turn()
+
+    @property
+    def world_generator(self):
+        """World generator for this game's seed, created lazily"""
+        if self._world_generator is None:
+            if self.share_world:
+                from src.core.shared_world import get_shared_world
+                self._world_generator = get_shared_world(self.seed).world_generator
+            else:
+                from src.core.world import WorldGenerator
+                self._world_generator = WorldGenerator(seed=self.seed)
+        return self._world_generator
+
+    @property
+    def location_cache(self):
+        """Cache of tiles this game has touched, created lazily"""
+        if self._location_cache is None:
+            if self.share_world:
+                from src.core.shared_world import get_shared_world
+                self._location_cache = get_shared_world(self.seed).location_cache
+            else:
+                from src.core.cache import LocationCache
+                self._location_cache = LocationCache()
+        return self._location_cache
+
+    @property
+    def interaction_manager(self):
+        """Interaction manager for this game, created lazily"""
+        if self._interaction_manager is None:
+            from src.core.interactions import InteractionManager
+            self._interaction_manager = InteractionManager(self)
+        return self._interaction_manager
+
+    @property
+    def mcts_manager(self):
+        """MCTS search for this game; its transposition table persists across turns"""
+        if self._mcts_manager is None:
+            from src.core.mcts_manager import MCTSManager
+            self._mcts_manager = MCTSManager(self)
+        return self._mcts_manager
+
+    @property
+    def world_search(self):
+        """Nearest-biome and nearest-feature queries over this game's world"""
+        if self._world_search is None:
+            from src.core.spatial_search import WorldSearch
+            self._world_search = WorldSearch(self.world_generator, self.location_cache, self.overlay)
+        return self._world_search
+
+    @property
+    def in_interaction(self) -> bool:
+        """Whether the player is currently interacting with a feature"""
+        return (self._interaction_manager is not None
+                and self._interaction_manager.current_feature is not None)
+
+    @asynccontextmanager
+    async def turn(self):
+        """Unit of work for one player turn
+
+        Writes inside the block are queued and committed together in one
+        transaction when it exits normally; reads are counted toward the
+        turn. If the block or the commit raises, nothing is written: tiles
+        generated during the turn are dropped from the cache so they are
+        stored when next reached, the inventory is re-read on next use, and
+        the overlay and simulation return to where the turn began. The world
+        simulation catches up to the game clock as the turn begins.
+        """
+        from src.core.unit_of_work import UnitOfWork
+        unit_of_work = self._unit_of_work = UnitOfWork()
+        overlay, simulation = self.overlay, self.simulation
+        if simulation is not None:
+            position = self.current_game_state.current_position
+            simulation.activate(position["x"], position["y"])
+            simulation.advance()
+            simulation.checkpoint()
+            overlay.checkpoint()
+        try:
+            try:
+                yield unit_of_work
+                self._unit_of_work = None
+                await unit_of_work.commit()
+            except BaseException:
+                self._unit_of_work = None
+                for location in unit_of_work.new_locations:
+                    self.location_cache.invalidate(location.x, location.y)
+                # Re-read on next use instead of trusting items the turn never stored
+                self._inventory = None
+                if simulation is not None:
+                    overlay.rollback()
+                    simulation.rollback()
+                raise
+            if simulation is not None:
+                overlay.drop_checkpoint()
+                simulation.drop_checkpoint()
+        finally:
+            self._unit_of_work = None
+            metrics.end_turn(unit_of_work.reads + unit_of_work.writes)
+
+    def _count_query(self, kind: str = "read") -> None:
+        """Count a database round trip against the current turn"""
+        if self._unit_of_work is not None:
+            self._unit_of_work.count(kind)
+        else:
+            metrics.count_query(kind)
+
+    async def _save_state(self) -> None:
+        """Save the game state now, or when the current turn commits"""
+        if self._unit_of_work is not None:
+            self._unit_of_work.save(self.current_game_state)
+        else:
+            metrics.count_query("write")
+            await self.current_game_state.save()
+
+    async def _inventory_items(self) -> List[Item]:
+        """Inventory rows, read once per session and kept in step with take/drop"""
+        if self._inventory is None:
+            self._count_query("read")
+            self._inventory = list(await self.current_game_state.items.all())
+        return self._inventory
+
+    async def prefetch_locations(self, x: int, y: int, radius: int) -> None:
+        """Cache every stored tile within `radius` of (x, y), fetched in one query
+
+        Tiles the query shows are missing are remembered, so reaching them
+        later generates them without asking the database again.
+        """
+        self._count_query("read")
+        locations = await Location.filter(
+            seed=self.seed, x__gte=x - radius, x__lte=x + radius, y__gte=y - radius, y__lte=y + radius
+        )
+        for location in locations:
+            self.location_cache.put(Tile.from_location(location))
+        if len(self._absent_tiles) > ABSENT_TILES_LIMIT:
+            self._absent_tiles.clear()
+        found = {(location.x, location.y) for location in locations}
+        for tile_x in range(x - radius, x + radius + 1):
+            for tile_y in range(y - radius, y + radius + 1):
+                if (tile_x, tile_y) not in found:
+                    self._absent_tiles.add((tile_x, tile_y))
 
     async def new_game(self) -> GameState:
         """Create a new game state"""
+        metrics.count_query("write")
         self.current_game_state = await GameState.create(
             seed=self.seed,
             current_position={"x": 0, "y": 0},
             current_biome=BiomeType.PLAINS,  # Starting biome
             inventory={},
             health=100,
-            weather=WeatherSystem.get_weather(BiomeType.PLAINS, 0)
+            weather=self.world_generator.weather_at(0, 0, BiomeType.PLAINS)
         )
+        self.journal = self._open_journal()
+        if self.journal is not None:
+            self.journal.begin(self.current_game_state)
+        self._inventory = []
+        self._set_overlay()
         return self.current_game_state
 
     async def load_game(self, game_state_id: int) -> GameState:
-        """Load an existing game state"""
+        """Load an existing game state
+
+        Two sequential round trips: the game state row, which gives the
+        position, and then the inventory, overlay and nearby tiles, whose
+        three queries run concurrently.
+        """
         try:
+            metrics.count_query("read")
             self.current_game_state = await GameState.get(id=game_state_id)
-            return self.current_game_state
         except DoesNotExist:
             raise ValueError(f"No game state found with id {game_state_id}")
 
-    async def get_current_location(self) -> Location:
+        # Regenerate the world from the saved seed rather than this manager's
+        if self.current_game_state.seed != self.seed:
+            self.seed = self.current_game_state.seed
+            self._world_generator = None
+            self._location_cache = None
+            self._mcts_manager = None
+
+        # The row is only rewritten at snapshots; the journal holds the moves since
+        self.journal = self._open_journal()
+        if self.journal is not None:
+            from src.core.journal import apply_snapshot, replay_position
+            snapshot, tail = self.journal.load()
+            if snapshot is not None:
+                apply_snapshot(self.current_game_state, snapshot)
+            if tail:
+                position = replay_position(self.current_game_state.current_position, tail)
+                self.current_game_state.current_position = position
+                self.current_game_state.current_biome = self.world_generator.biome_at(position["x"], position["y"])
+            if not self.journal.trusted:
+                # The row is all there is; journal from it again, but keep the row current too
+                self.journal.begin(self.current_game_state)
+
+        # Warm the inventory, overlay and tiles around the player so the first turn is a warm one
+        self._inventory = None
+        self._absent_tiles = set()
+        self._set_overlay()
+        position = self.current_game_state.current_position
+        self._count_query("read")  # The overlay load; the other two count themselves
+        await asyncio.gather(
+            self._inventory_items(),
+            self.overlay.load(),
+            self.prefetch_locations(position["x"], position["y"], LOAD_PREFETCH_RADIUS)
+        )
+        return self.current_game_state
+
+    def _set_overlay(self) -> None:
+        """Start an empty overlay for the current game"""
+        from src.core.overlay import GameOverlay
+        from src.core.simulation import WorldSimulation
+        self.overlay = GameOverlay(self.current_game_state)
+        self.simulation = WorldSimulation(self.world_generator, self.overlay, self.location_cache)
+        self._world_search = None
+
+    def _open_journal(self):
+        """Action journal for the current game, or None when journaling is disabled"""
+        from src.core.journal import ActionJournal, JOURNAL_DIR, database_identity
+        if not JOURNAL_DIR or not self.journaling:
+            return None
+        return ActionJournal(self.current_game_state.id, self.seed, database_identity(), JOURNAL_DIR)
+
+    @metrics.timed("get_current_location")
+    async def get_current_location(self) -> Tile:
         """Get or generate the current location"""
         if not self.current_game_state:
             raise ValueError("No active game state")
         
         pos = self.current_game_state.current_position
-        location = await Location.get_or_none(x=pos["x"], y=pos["y"])
+        location = self.location_cache.get(pos["x"], pos["y"])
+        if location:
+            return await self._observed(location)
+
+        if (pos["x"], pos["y"]) not in self._absent_tiles:
+            # Fetch the neighbourhood with it so the next few moves hit the cache
+            await self.prefetch_locations(pos["x"], pos["y"], MISS_PREFETCH_RADIUS)
+            location = self.location_cache.get(pos["x"], pos["y"])
+            metrics.cache_lookup("location", location is not None)
         
         if not location:
-            biome, features, description, weather = self.world_generator.generate_location(
+            self._absent_tiles.discard((pos["x"], pos["y"]))
+            biome, features, description = await self.world_generator.generate_location_async(
                 pos["x"], pos["y"]
             )
-            location = await Location.create(
-                x=pos["x"],
-                y=pos["y"],
-                biome_type=biome,
-                features=features,
-                description=description,
-                weather=weather
-            )
+            # Weather is derived on observation, see get_weather
+            location = Tile.create(pos["x"], pos["y"], biome, features, description)
+            if self._unit_of_work is not None:
+                self._unit_of_work.add_location(location.to_location(self.seed))
+            else:
+                metrics.count_query("write")
+                try:
+                    await location.to_location(self.seed).save()
+                except IntegrityError:
+                    # Another game inserted this tile while we were generating it
+                    metrics.count_query("read")
+                    location = Tile.from_location(await Location.get(seed=self.seed, x=pos["x"], y=pos["y"]))
         
-        return location
+        self.location_cache.put(location)
+        return await self._observed(location)
+
+    async def get_locations(self, positions: Iterable[Tuple[int, int]]) -> Dict[Tuple[int, int], Tile]:
+        """Tiles at several positions with this game's overlay applied, resolved together
+
+        Meant for planning: unlike get_current_location, the tiles are not
+        observed, so simulation events due there stay pending and no overlay
+        rows are written. Cached tiles are used as they are. The others are fetched in one
+        query over their bounding box, and any still missing are generated in
+        one call on the generation pool and stored like get_current_location
+        would store them.
+        """
+        requested = set(positions)
+        tiles = {}
+        missing = []
+        for x, y in requested:
+            location = self.location_cache.get(x, y)
+            if location is not None:
+                tiles[(x, y)] = location
+            else:
+                missing.append((x, y))
+
+        unknown = [position for position in missing if position not in self._absent_tiles]
+        if unknown:
+            xs = [x for x, _ in unknown]
+            ys = [y for _, y in unknown]
+            self._count_query("read")
+            box = Location.filter(seed=self.seed, x__gte=min(xs), x__lte=max(xs), y__gte=min(ys), y__lte=max(ys))
+            for row in await box:
+                location = Tile.from_location(row)
+                # The rest of the box is cached too, as prefetch_locations does
+                self.location_cache.put(location)
+                if (row.x, row.y) in requested:
+                    tiles[(row.x, row.y)] = location
+
+        absent = [position for position in missing if position not in tiles]
+        if absent:
+            generated = await self.world_generator.generate_locations_async(absent)
+            rows = []
+            for (x, y), (biome, features, description) in zip(absent, generated):
+                location = Tile.create(x, y, biome, features, description)
+                self.location_cache.put(location)
+                self._absent_tiles.discard((x, y))
+                tiles[(x, y)] = location
+                rows.append(location.to_location(self.seed))
+            if self._unit_of_work is not None:
+                for row in rows:
+                    self._unit_of_work.add_location(row)
+            else:
+                metrics.count_query("write")
+                # Another game may have stored some of these first; its rows win
+                await Location.bulk_create(rows, ignore_conflicts=True)
+        return {position: self.overlay.apply(location) if self.overlay is not None else location
+                for position, location in tiles.items()}
+
+    async def _observed(self, location: Tile) -> Tile:
+        """The tile as this game sees it, after applying simulation events due there"""
+        if self.overlay is None:
+            return location
+        for row in self.simulation.observe(location.x, location.y):
+            await self._save_overlay(row)
+        return self.overlay.apply(location)
+
+    def get_weather(self, location: Tile) -> WeatherType:
+        """Current weather at a location, evaluated from the space-time weather field"""
+        weather = self.world_generator.weather_at(location.x, location.y, location.biome_type)
+        if self.current_game_state and self._is_current(location):
+            self.current_game_state.weather = weather.value
+        return weather
+
+    def _is_current(self, location: Tile) -> bool:
+        """Whether a location is where the player stands"""
+        pos = self.current_game_state.current_position
+        return location.x == pos["x"] and location.y == pos["y"]
 
     async def get_inventory(self) -> List[Dict[str, Any]]:
         """Get current inventory items"""
         if not self.current_game_state:
             raise ValueError("No active game state")
         
-        items = await self.current_game_state.items.all()
+        items = await self._inventory_items()
         return [{"name": item.name, 
                 "type": item.item_type, 
                 "description": item.description,
@@ -76,6 +400,9 @@ class GameManager:
         if not self.current_game_state:
             raise ValueError("No active game state")
 
+        from src.utils.items import get_item_properties
+        from src.utils.item_definitions import get_item_definition
+
         # Get current location features to check if item exists
         location = await self.get_current_location()
         item_found = False
@@ -89,90 +416,108 @@ class GameManager:
         if not item_def:
             return f"Unknown item: {item_name}"
 
-        # Then check if the item can be found in the current location
-        for feature in location.features:
-            if (item_name.lower() in feature["variant"].lower() or 
-                item_name.lower() in feature["type"].lower() or
-                feature["type"].lower() == "resource"):  # Special handling for resources
-                item_found = True
-                item_type = item_def.get("type", ItemType.TREASURE)
-                break
+        # Then check if the item can be found in the current location: any resource,
+        # or a feature whose type or variant contains the name (see vocabulary.matching_ids)
+        from src.core.vocabulary import matching_ids, named_ids
+        takeable = matching_ids(item_name)
+        if any(feature_id in takeable for feature_id in location.feature_ids):
+            item_found = True
+            item_type = item_def.get("type", ItemType.TREASURE)
+            # Only a feature the name refers to is used up; any resource matching isn't one
+            named = named_ids(item_name)
+            for feature_id, feature in zip(location.feature_ids, location.features):
+                if feature_id in named and feature["type"] in DEPLETABLE_FEATURE_TYPES:
+                    # Gone for this player only; the shared tile keeps it
+                    await self._save_overlay(self.overlay.remove_feature(
+                        location.x, location.y, feature, WeatherSystem.game_hours()
+                    ))
+                    break
         
         if not item_found:
             return f"There is no {item_name} here to take."
             
-        location = await self.get_current_location()
         description = f"{item_def['description']} (Found in {location.biome_type.value})"
         properties = get_item_properties(item_name)
 
-        await Item.create(
+        item = Item(
             name=item_name,
             item_type=item_type,
             description=description,
             properties=properties,
             game_state=self.current_game_state
         )
+        if self._unit_of_work is not None:
+            self._unit_of_work.add_item(item)
+        else:
+            metrics.count_query("write")
+            await item.save()
+        if self._inventory is not None:
+            self._inventory.append(item)
         return f"Added {item_name} to inventory"
 
+    async def _save_overlay(self, row) -> None:
+        """Store an overlay row now, or when the current turn commits"""
+        if self._unit_of_work is not None:
+            self._unit_of_work.save_overlay(row)
+        else:
+            metrics.count_query("write")
+            await row.save()
+
     async def drop_item(self, item_name: str) -> str:
         """Remove an item from inventory"""
         if not self.current_game_state:
             raise ValueError("No active game state")
             
-        item = await Item.get_or_none(
-            game_state=self.current_game_state,
-            name=item_name
-        )
-        if item:
-            await item.delete()
+        inventory = await self._inventory_items()
+        index = next((i for i, item in enumerate(inventory) if item.name == item_name), None)
+        if index is not None:
+            # Removed by position: unsaved items all compare equal (pk None)
+            item = inventory.pop(index)
+            if self._unit_of_work is not None:
+                self._unit_of_work.delete_item(item)
+            else:
+                metrics.count_query("write")
+                await item.delete()
             return f"Dropped {item_name}"
         return f"No item named {item_name} in inventory"
 
-    async def get_available_actions(self) -> List[Dict[str, Any]]:
-        """Get list of available actions at current location"""
+    async def get_available_actions(self) -> Tuple[Mapping[str, Any], ...]:
+        """Get the read-only actions available at the current location"""
         if not self.current_game_state:
             raise ValueError("No active game state")
-            
         location = await self.get_current_location()
-        actions = []
-        
-        # Movement actions
-        for direction in ["north", "south", "east", "west"]:
-            actions.append({
-                "type": "move",
-                "direction": direction,
-                "distances": [50, 100, 150]
-            })
-        
-        # Feature interaction actions
-        for feature in location.features:
-            actions.append({
-                "type": "interact",
-                "target": feature["type"],
-                "variant": feature["variant"]
-            })
-            
-        return actions
+        # Cached per set of features; the overlay's view of a changed tile has new ids
+        return location.actions
+
+    def get_interaction_types(self, target: str) -> List[str]:
+        """Interaction names process_action understands for a feature type"""
+        from src.utils.structure_definitions import get_structure_definition
+        from src.utils.resource_definitions import get_resource_definition
+        types = list(get_structure_definition(target).get("interactions", {}))
+        types += [name for name in get_resource_definition(target).get("interactions", {}) if name not in types]
+        types += [name for name in DEFAULT_INTERACTION_TYPES.get(target, ()) if name not in types]
+        return types or ["examine"]
 
     async def get_best_action(self) -> Dict[str, Any]:
         """Use MCTS to select the best action"""
-        from src.core.mcts_manager import MCTSManager
-        mcts = MCTSManager(self)
-        return await mcts.select_action(self.current_game_state)
+        return await self.mcts_manager.select_action(self.current_game_state)
 
-    def __init__(self, seed: Optional[int] = None):
-        """Initialize the game manager with optional seed"""
-        self.seed = seed or random.randint(0, 1000000)
-        self.world_generator = WorldGenerator(seed=self.seed)
-        self.current_game_state: Optional[GameState] = None
-        from src.core.interactions import InteractionManager
-        self.interaction_manager = InteractionManager(self)
+    @metrics.timed("process_action")
+    async def process_action(self, action_type: str, params: Dict[str, Any],
+                             record: bool = True) -> Tuple[str, Dict[str, Any]]:
+        """Process a player action and return the result
 
-    async def process_action(self, action_type: str, params: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
-        """Process a player action and return the result"""
+        Actions are appended to the journal unless `record` is False, as for
+        MCTS simulations; the game state row is then only rewritten at
+        snapshot intervals. If the game was loaded without finding its
+        journal, the row is rewritten after every action instead.
+        """
         if not self.current_game_state:
             raise ValueError("No active game state")
             
+        from src.utils.structure_definitions import get_structure_interaction
+        from src.utils.resource_definitions import get_resource_interaction
+
         result_description = ""
         state_updates = {}
         
@@ -200,10 +545,11 @@ class GameManager:
             
             # Update game state
             self.current_game_state.current_biome = new_location.biome_type
-            await self.current_game_state.save()
+            weather = self.get_weather(new_location)
             
-            result_description = f"You travel {direction} for {distance} yards.\n{new_location.description}"
-            state_updates = {"position": new_pos, "biome": new_location.biome_type}
+            result_description = (f"You travel {direction} for {distance} yards.\n"
+                                  f"{new_location.description} {WeatherSystem.describe(weather)}")
+            state_updates = {"position": new_pos, "biome": new_location.biome_type, "weather": weather}
             
         elif action_type == "interact":
             # Handle interaction with features
@@ -211,40 +557,40 @@ class GameManager:
             variant = params.get("variant")
             
             location = await self.get_current_location()
-            for feature in location.features:
-                if feature["type"] == target and feature["variant"] == variant:
-                    interaction_type = params.get("interaction", "examine")
-                    
-                    # Generate default interaction messages based on feature type
-                    default_interactions = {
-                        "fish": {
-                            "examine": f"You watch the {variant} fish swimming.",
-                            "catch": f"You try to catch the {variant} fish.",
-                            "feed": f"You throw some food to the {variant} fish."
-                        },
-                        "creature": {
-                            "examine": f"You observe the {variant} carefully.",
-                            "follow": f"You attempt to follow the {variant}.",
-                            "call": f"You try to call the {variant} over."
-                        },
-                        "water": {
-                            "examine": f"You look at the {variant} water.",
-                            "drink": f"You take a drink from the {variant} water.",
-                            "swim": f"You wade into the {variant} water."
-                        }
+            feature = location.find_feature(target, variant)
+            if feature is not None:
+                interaction_type = params.get("interaction", "examine")
+                state_updates = {"discovered_feature": {"type": target, "variant": variant}}
+                
+                # Generate default interaction messages based on feature type
+                default_interactions = {
+                    "fish": {
+                        "examine": f"You watch the {variant} fish swimming.",
+                        "catch": f"You try to catch the {variant} fish.",
+                        "feed": f"You throw some food to the {variant} fish."
+                    },
+                    "creature": {
+                        "examine": f"You observe the {variant} carefully.",
+                        "follow": f"You attempt to follow the {variant}.",
+                        "call": f"You try to call the {variant} over."
+                    },
+                    "water": {
+                        "examine": f"You look at the {variant} water.",
+                        "drink": f"You take a drink from the {variant} water.",
+                        "swim": f"You wade into the {variant} water."
                     }
-                    
-                    # First try structure definitions
-                    structure_interaction = get_structure_interaction(
-                        target, 
-                        interaction_type,
-                        variant,
-                        feature.get("condition")
-                    )
-                    if structure_interaction != "You cannot interact with this structure that way.":
-                        result_description = structure_interaction
-                        break
-                    
+                }
+                
+                # First try structure definitions
+                structure_interaction = get_structure_interaction(
+                    target, 
+                    interaction_type,
+                    variant,
+                    feature.get("condition")
+                )
+                if structure_interaction != "You cannot interact with this structure that way.":
+                    result_description = structure_interaction
+                else:
                     # Then try resource definitions
                     resource_interaction = get_resource_interaction(
                         target,
@@ -254,10 +600,8 @@ class GameManager:
                     )
                     if resource_interaction != "You cannot interact with this resource that way.":
                         result_description = resource_interaction
-                        break
-                    
                     # Finally try default interactions
-                    if target in default_interactions:
+                    elif target in default_interactions:
                         result_description = default_interactions[target].get(
                             interaction_type,
                             f"You {interaction_type} the {variant} {target}."
@@ -265,11 +609,21 @@ class GameManager:
                     else:
                         # Generic fallback
                         result_description = f"You {interaction_type} the {variant} {target}."
-                    break
-                    
+
+        if record and self.journal is not None:
+            self.journal.record_action(action_type, params)
+            if self.journal.snapshot_due():
+                self.journal.record_snapshot(self.current_game_state)
+                await self._save_state()
+            elif not self.journal.trusted:
+                await self._save_state()
+        elif action_type == "move":
+            await self._save_state()
         return result_description, state_updates
 
     async def save_game(self) -> None:
         """Save current game state"""
         if self.current_game_state:
-            await self.current_game_state.save()
+            if self.journal is not None:
+                self.journal.record_snapshot(self.current_game_state)
+            await self._save_state()
@@ -0,0 +1,86 @@
+import asyncio
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Executor used for tile generation: "thread", "process" or "inline"
+POOL_MODE = os.getenv("PTHFNDR_GENERATION_POOL", "thread").lower()
+POOL_WORKERS = int(os.getenv("PTHFNDR_GENERATION_WORKERS", "0")) or None
+
+_shared_executor: Optional[Executor] = None
+
+# Generators already warmed inside a process pool worker, keyed by world identity
+_worker_generators: Dict[Tuple, Any] = {}
+
+def _run_in_worker(generator, method: str, args: tuple):
+    """Process pool entry point: reuse a warm generator for this world if we have one"""
+    key = generator.world_key
+    cached = _worker_generators.get(key)
+    if cached is None:
+        cached = _worker_generators[key] = generator
+    return getattr(cached, method)(*args)
+
+def get_executor() -> Optional[Executor]:
+    """Process-wide executor shared by every world generator (None when inline)"""
+    global _shared_executor
+    if POOL_MODE == "inline":
+        return None
+    if _shared_executor is None:
+        if POOL_MODE == "process":
+            _shared_executor = ProcessPoolExecutor(max_workers=POOL_WORKERS)
+        else:
+            _shared_executor = ThreadPoolExecutor(
+                max_workers=POOL_WORKERS, thread_name_prefix="pthfndr-gen"
+            )
+    return _shared_executor
+
+def shutdown_executor() -> None:
+    """Stop the shared executor, e.g. when the game exits"""
+    global _shared_executor
+    if _shared_executor is not None:
+        _shared_executor.shutdown(wait=False, cancel_futures=True)
+        _shared_executor = None
+
+class GenerationPool:
+    """Runs a generator's CPU-bound methods off the event loop, sharing in-flight work"""
+
+    def __init__(self, generator):
+        self.generator = generator
+        self._in_flight: Dict[Tuple, asyncio.Future] = {}
+
+    def _submit(self, method: str, args: tuple) -> asyncio.Future:
+        """Schedule `generator.method(*args)` on the configured executor"""
+        loop = asyncio.get_running_loop()
+        executor = get_executor()
+        if executor is None:
+            future = loop.create_future()
+            try:
+                future.set_result(getattr(self.generator, method)(*args))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+        if isinstance(executor, ProcessPoolExecutor):
+            return loop.run_in_executor(executor, _run_in_worker, self.generator, method, args)
+        call: Callable = getattr(self.generator, method)
+        return loop.run_in_executor(executor, call, *args)
+
+    def _forget(self, key: Tuple, future: asyncio.Future) -> None:
+        """Drop a finished request from the in-flight table"""
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
+
+    async def run(self, method: str, *args) -> Any:
+        """Run `method` with `args`; concurrent identical requests share one future"""
+        key = (method,) + args
+        future = self._in_flight.get(key)
+        if future is None:
+            future = self._submit(method, args)
+            self._in_flight[key] = future
+            future.add_done_callback(lambda done: self._forget(key, done))
+        # Shield so one cancelled caller doesn't cancel the work for the others
+        return await asyncio.shield(future)
+
+    @property
+    def in_flight(self) -> int:
+        """Number of distinct generation requests currently running"""
+        return len(self._in_flight)
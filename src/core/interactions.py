@@ -11,10 +11,10 @@ class InteractionManager:
     async def start_interaction(self, target: str, variant: str) -> str:
         """Start interaction mode with a specific feature"""
         location = await self.game_manager.get_current_location()
-        for feature in location.features:
-            if feature["type"] == target and feature["variant"] == variant:
-                self.current_feature = feature
-                return self._get_interaction_prompt()
+        feature = location.find_feature(target, variant)
+        if feature is not None:
+            self.current_feature = feature
+            return self._get_interaction_prompt()
         return "Cannot find that feature here."
         
     def _get_interaction_prompt(self) -> str:
@@ -0,0 +1,205 @@
+"""Append-only journal of process_action calls with periodic state snapshots.
+
+Each game gets one JSONL file, in a directory per database under
+JOURNAL_DIR. The first line is a header naming the game, its seed and the
+database; every later line is either an action record
+    {"seq": 12, "type": "move", "params": {"direction": "north", "distance": 100}}
+or a snapshot of the fields actions change
+    {"seq": 50, "snapshot": {"position": {...}, "biome": "PLNS", "health": 100, "weather": "clear"}}
+
+Loading restores the last snapshot and replays only the actions after it.
+The file can also be replayed headlessly against a scratch database:
+
+    python -m src.core.journal journals/3f2a9c1e0b7d/game_42.jsonl
+"""
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Directory for journal files, resolved against the project directory rather than
+# the working directory; set PTHFNDR_JOURNAL_DIR to an empty string to disable
+_PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+JOURNAL_DIR = os.getenv("PTHFNDR_JOURNAL_DIR", "journals")
+if JOURNAL_DIR:
+    JOURNAL_DIR = os.path.join(_PROJECT_DIR, os.path.expanduser(JOURNAL_DIR))
+# The game state row is rewritten once per this many journaled actions
+SNAPSHOT_INTERVAL = int(os.getenv("PTHFNDR_SNAPSHOT_INTERVAL", "50"))
+
+def _dumps(record: Dict[str, Any]) -> str:
+    """Compact one-line JSON"""
+    return json.dumps(record, separators=(",", ":")) + "\n"
+
+def database_identity() -> str:
+    """Where the connected database lives: a sqlite file's absolute path, else engine, host, port and name"""
+    from tortoise import connections
+    config = connections.db_config["default"]
+    credentials = config.get("credentials", {})
+    if "file_path" in credentials:
+        path = credentials["file_path"]
+        return path if path == ":memory:" else os.path.abspath(path)
+    return (f"{config.get('engine')}://{credentials.get('host')}:{credentials.get('port')}/"
+            f"{credentials.get('database')}")
+
+class ActionJournal:
+    """Journal file for one game of one database, opened lazily for appending"""
+
+    def __init__(self, game_id: int, seed: int, database: str, directory: str = JOURNAL_DIR):
+        self.game_id = game_id
+        self.seed = seed
+        self.database = database
+        folder = hashlib.sha1(database.encode()).hexdigest()[:12]
+        self.path = os.path.join(directory, folder, f"game_{game_id}.jsonl")
+        self.seq = 0  # Number of actions recorded so far
+        # Whether the moves since the last snapshot can be left to this journal alone:
+        # it was begun with the game, or load found it intact
+        self.trusted = True
+        self._file = None
+
+    def _open(self, mode: str) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        is_new = mode == "w" or not os.path.exists(self.path)
+        self._file = open(self.path, mode, encoding="utf-8")
+        if is_new:
+            self._file.write(_dumps({"game": self.game_id, "seed": self.seed, "database": self.database,
+                                     "version": 2}))
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        if self._file is None:
+            self._open("a")
+        self._file.write(_dumps(record))
+        self._file.flush()
+
+    def begin(self, game_state) -> None:
+        """Start a fresh journal from a game state, replacing any stale file with its id"""
+        self.close()
+        self._open("w")
+        self.seq = 0
+        self.record_snapshot(game_state)
+
+    def record_action(self, action_type: str, params: Dict[str, Any]) -> int:
+        """Append one process_action call and return its sequence number"""
+        self.seq += 1
+        self._append({"seq": self.seq, "type": action_type, "params": params})
+        return self.seq
+
+    def record_snapshot(self, game_state) -> None:
+        """Append the replay-relevant fields of a game state"""
+        self._append({"seq": self.seq, "snapshot": snapshot_of(game_state)})
+
+    def snapshot_due(self) -> bool:
+        """Whether the action just recorded completes a snapshot interval"""
+        return self.seq % SNAPSHOT_INTERVAL == 0
+
+    def load(self) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Last snapshot (or None) and the action records after it; sets `seq` and `trusted`"""
+        snapshot = None
+        tail: List[Dict[str, Any]] = []
+        records = read_records(self.path)
+        header = next(records, None)
+        self.trusted = (header is not None and header.get("game") == self.game_id
+                        and header.get("seed") == self.seed and header.get("database") == self.database)
+        if not self.trusted:
+            # Missing, or left over from an earlier database at the same location
+            return None, []
+        for record in records:
+            if "snapshot" in record:
+                snapshot = record["snapshot"]
+                tail = []
+            elif "type" in record:
+                tail.append(record)
+            self.seq = record.get("seq", self.seq)
+        return snapshot, tail
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+def read_records(path: str) -> Iterator[Dict[str, Any]]:
+    """Every record in a journal file, header first; a torn final line is skipped"""
+    if not os.path.exists(path):
+        return
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                break
+
+def snapshot_of(game_state) -> Dict[str, Any]:
+    """Fields process_action can change, in JSON form"""
+    biome = game_state.current_biome
+    return {
+        "position": dict(game_state.current_position),
+        "biome": getattr(biome, "value", biome),
+        "health": game_state.health,
+        "weather": game_state.weather
+    }
+
+def apply_snapshot(game_state, snapshot: Dict[str, Any]) -> None:
+    """Restore snapshot fields onto a game state"""
+    from src.models.base import BiomeType
+    game_state.current_position = dict(snapshot["position"])
+    game_state.current_biome = BiomeType(snapshot["biome"])
+    game_state.health = snapshot["health"]
+    game_state.weather = snapshot["weather"]
+
+def replay_position(position: Dict[str, int], records: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Position after applying the moves in `records`, without generating any tiles"""
+    from src.core.world import COMPASS
+    x, y = position["x"], position["y"]
+    for record in records:
+        if record["type"] == "move":
+            dx, dy = COMPASS.get(record["params"].get("direction"), (0, 0))
+            x, y = x + dx, y + dy
+    return {"x": x, "y": y}
+
+async def replay(path: str, db_url: str = "sqlite://:memory:") -> Dict[str, Any]:
+    """Re-run every journaled action against a scratch database and time it"""
+    from tortoise import Tortoise
+    from src.models.database import init_schema
+    from src.core.game_manager import GameManager
+    records = list(read_records(path))
+    if not records or "seed" not in records[0]:
+        raise ValueError(f"{path} is not an action journal")
+
+    await Tortoise.init(db_url=db_url, modules={'models': ['src.models.base']})
+    await init_schema()
+    try:
+        # Private world: the scratch database must not leak tiles into a shared cache.
+        # No journal either: the scratch game's id may match a real game's journal file
+        game_manager = GameManager(seed=records[0]["seed"], share_world=False, journal=False)
+        await game_manager.new_game()
+        actions = [record for record in records if "type" in record]
+        start = time.perf_counter()
+        for record in actions:
+            async with game_manager.turn():
+                await game_manager.process_action(record["type"], record["params"], record=False)
+        elapsed = time.perf_counter() - start
+    finally:
+        await Tortoise.close_connections()
+    return {
+        "actions": len(actions),
+        "seconds": elapsed,
+        "final_position": game_manager.current_game_state.current_position
+    }
+
+def main() -> None:
+    import argparse
+    import asyncio
+    from src.utils import metrics
+    parser = argparse.ArgumentParser(description="Replay a Pathfinder action journal headlessly")
+    parser.add_argument("path", help="journal file, e.g. journals/3f2a9c1e0b7d/game_42.jsonl")
+    parser.add_argument("--db-url", default="sqlite://:memory:", help="scratch database to replay into")
+    args = parser.parse_args()
+
+    result = asyncio.run(replay(args.path, args.db_url))
+    per_action = result["seconds"] / result["actions"] * 1000 if result["actions"] else 0.0
+    print(f"Replayed {result['actions']} actions in {result['seconds']:.3f}s "
+          f"({per_action:.2f} ms/action), ending at {result['final_position']}")
+    metrics.export_metrics()
+
+if __name__ == "__main__":
+    main()
@@ -1,123 +1,271 @@
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Mapping, Optional, Sequence, Set, Tuple
 import math
 import random
-from src.models.base import GameState, Location
+from src.models.base import GameState, BiomeType
 from src.core.game_manager import GameManager
+from src.core.tile import Tile
+from src.core.transposition import (
+    TranspositionTable, zobrist_key, marked_key, interaction_id,
+    KEY_X, KEY_Y, KEY_BIOME, KEY_HEALTH
+)
+from src.core.rollout import (
+    RolloutPolicy, NoveltyRolloutPolicy, NoveltyReward, feature_value, rollout
+)
+from src.core.world import BIOME_INDEX, COMPASS
+from src.utils import metrics
+
+# Longest path the selection phase follows from the root
+MAX_SELECTION_DEPTH = 10
+
+Position = Tuple[int, int]
+
+class Descent:
+    """One simulation's path down the tree, walked without touching the game state"""
+    __slots__ = ("key", "position", "biome", "depth", "reward", "entries", "path", "discovered", "done")
+
+    def __init__(self, key: int, position: Position, biome: BiomeType):
+        self.key = key
+        self.position = position
+        self.biome = biome
+        self.depth = 0
+        self.reward = 0.0
+        self.entries = []  # Entries visited, each holding a virtual loss until backpropagation
+        self.path: Set[Position] = {position}  # Tiles already rewarded on this simulation
+        self.discovered: Set[Tuple[int, int, str, str]] = set()  # Features already rewarded
+        self.done = False
 
 class MCTSManager:
-    def __init__(self, game_manager: GameManager, exploration_constant: float = 1.414):
+    def __init__(self, game_manager: GameManager, exploration_constant: float = 1.414,
+                 table_size: int = 1 << 16, simulations: int = 40, rollout_depth: int = 8,
+                 rollout_policy: Optional[RolloutPolicy] = None,
+                 reward_model: Optional[NoveltyReward] = None,
+                 widening_constant: float = 1.0, widening_exponent: float = 0.5,
+                 batch_size: int = 8, virtual_loss: float = 1.0):
         self.game_manager = game_manager
         self.exploration_constant = exploration_constant
-        self.visits: Dict[str, int] = {}  # State visit counts
-        self.rewards: Dict[str, float] = {}  # State total rewards
-        self.children: Dict[str, List[str]] = {}  # State -> possible next states
+        self.simulations = simulations
+        self.rollout_depth = rollout_depth
+        self.rollout_policy = rollout_policy or NoveltyRolloutPolicy()
+        # Tiles the player has stood on persist here across turns
+        self.reward_model = reward_model or NoveltyReward()
+        # Statistics per state key, shared by every path reaching the state
+        self.table = TranspositionTable(table_size)
+        self.widening_constant = widening_constant
+        self.widening_exponent = widening_exponent
+        # Simulations selected together before their tiles are resolved in one call
+        self.batch_size = batch_size
+        # Reward withheld from nodes on an unfinished path, so concurrent selections diverge
+        self.virtual_loss = virtual_loss
         
-    def _get_state_hash(self, state: GameState) -> str:
-        """Generate a unique hash for a game state"""
-        return f"{state.current_position}_{state.current_biome}_{state.health}"
+    def _get_state_key(self, state: GameState) -> int:
+        """Zobrist key of a game state, built from scratch"""
+        position = state.current_position
+        return (zobrist_key(KEY_X, position["x"])
+                ^ zobrist_key(KEY_Y, position["y"])
+                ^ zobrist_key(KEY_BIOME, BIOME_INDEX[BiomeType(state.current_biome)])
+                ^ zobrist_key(KEY_HEALTH, state.health))
+
+    def _get_child_key(self, state_key: int, position: Position, biome: BiomeType,
+                       action: Mapping[str, Any]) -> int:
+        """Key of the state `action` leads to, updated incrementally from `state_key`"""
+        if action["type"] == "move":
+            dx, dy = COMPASS[action["direction"]]
+            x, y = position
+            # Biomes are a pure function of position for a seeded world
+            destination = self.game_manager.world_generator.biome_at(x + dx, y + dy)
+            key = state_key
+            if dx:
+                key ^= zobrist_key(KEY_X, x) ^ zobrist_key(KEY_X, x + dx)
+            if dy:
+                key ^= zobrist_key(KEY_Y, y) ^ zobrist_key(KEY_Y, y + dy)
+            return (key ^ zobrist_key(KEY_BIOME, BIOME_INDEX[BiomeType(biome)])
+                    ^ zobrist_key(KEY_BIOME, BIOME_INDEX[destination]))
+        # Interactions leave position and biome alone; key them as marked states
+        return marked_key(state_key, interaction_id(
+            action["target"], action["variant"], action.get("interaction", "examine")
+        ))
+
+    def _expand_actions(self, actions: Sequence[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+        """Concrete actions: one per move distance and per interaction a feature supports"""
+        concrete = []
+        for action in actions:
+            if action["type"] == "move":
+                for distance in action.get("distances", (100,)):
+                    concrete.append({"type": "move", "direction": action["direction"], "distance": distance})
+            else:
+                for interaction in self.game_manager.get_interaction_types(action["target"]):
+                    concrete.append({
+                        "type": "interact", "target": action["target"],
+                        "variant": action["variant"], "interaction": interaction
+                    })
+        return concrete
+
+    def _prior(self, position: Position, action: Dict[str, Any]) -> float:
+        """Heuristic value used to order children for progressive widening"""
+        if action["type"] == "move":
+            dx, dy = COMPASS[action["direction"]]
+            destination = (position[0] + dx, position[1] + dy)
+            biome = self.game_manager.world_generator.biome_at(*destination)
+            return self.reward_model.move_reward(destination, biome, set())
+        return feature_value(action["target"])
+
+    def _get_children(self, entry, position: Position, biome: BiomeType,
+                      tile: Tile) -> List[Tuple[int, Dict[str, Any]]]:
+        """(child key, action) pairs for a node, best prior first, one per distinct child state
+
+        Actions that lead to the same state (moves that differ only in the
+        distance travelled) collapse into one child via their Zobrist key.
+        The state key doesn't cover the tile's features, so children are
+        rebuilt when the features have changed since they were built.
+        """
+        if entry.children is None or entry.feature_ids != tile.feature_ids:
+            entry.feature_ids = tile.feature_ids
+            children = {}
+            for action in self._expand_actions(tile.actions):
+                children.setdefault(self._get_child_key(entry.key, position, biome, action), action)
+            entry.children = sorted(
+                children.items(), key=lambda child: self._prior(position, child[1]), reverse=True
+            )
+        return entry.children
+
+    def _widened(self, entry, children: List[Tuple[int, Dict[str, Any]]]) -> List[Tuple[int, Dict[str, Any]]]:
+        """Progressive widening: allow ceil(C * N^alpha) children after N visits"""
+        allowed = math.ceil(self.widening_constant * max(entry.visits, 1) ** self.widening_exponent)
+        return children[:max(1, allowed)]
         
-    def _get_ucb1_score(self, state_hash: str, parent_hash: str) -> float:
+    def _get_ucb1_score(self, state_key: int, parent_key: int) -> float:
         """Calculate UCB1 score for state selection"""
-        if state_hash not in self.visits:
+        entry = self.table.get(state_key)
+        if entry is None or entry.visits == 0:
             return float('inf')
             
-        exploitation = self.rewards[state_hash] / self.visits[state_hash]
+        parent = self.table.get(parent_key)
+        exploitation = entry.total_reward / entry.visits
         exploration = self.exploration_constant * math.sqrt(
-            math.log(self.visits[parent_hash]) / self.visits[state_hash]
+            math.log(max(parent.visits if parent else 1, 1)) / entry.visits
         )
         return exploitation + exploration
         
+    @metrics.timed("select_action")
     async def select_action(self, current_state: GameState) -> Dict[str, Any]:
-        """Select the best action using MCTS"""
-        for _ in range(100):  # Number of simulations
-            await self._simulate(current_state)
+        """Select the best action using MCTS
+
+        Simulations run in batches of `batch_size`. Each batch selects its
+        leaves together and resolves every tile they need in one call, so
+        the game state itself is never moved.
+        """
+        self.table.new_search()
+        root_key = self._get_state_key(current_state)
+        position = (current_state.current_position["x"], current_state.current_position["y"])
+        biome = BiomeType(current_state.current_biome)
+        self.reward_model.visit(position)
+        tiles = await self.game_manager.get_locations([position])
+        remaining = self.simulations
+        while remaining > 0:
+            count = min(self.batch_size, remaining)
+            await self._simulate_batch(root_key, position, biome, count, tiles)
+            remaining -= count
             
-        # Get available actions
-        actions = await self.game_manager.get_available_actions()
-        
         # Select best action based on visit counts
-        state_hash = self._get_state_hash(current_state)
+        root = self.table.store(root_key, 0)
         best_action = None
         max_visits = -1
         
-        for action in actions:
-            next_state_hash = f"{state_hash}_{action['type']}_{action.get('direction', '')}"
-            visits = self.visits.get(next_state_hash, 0)
+        for next_key, action in self._get_children(root, position, biome, tiles[position]):
+            entry = self.table.get(next_key)
+            visits = entry.visits if entry else 0
             
             if visits > max_visits:
                 max_visits = visits
                 best_action = action
                 
         return best_action
-        
-    async def _simulate(self, state: GameState) -> float:
-        """Run a single MCTS simulation"""
-        visited_states = []
-        current_state = state
-        depth = 0
-        total_reward = 0
-        
-        # Selection and expansion
-        while depth < 10:  # Max simulation depth
-            state_hash = self._get_state_hash(current_state)
-            visited_states.append(state_hash)
-            
-            if state_hash not in self.visits:
-                self.visits[state_hash] = 0
-                self.rewards[state_hash] = 0
-                break
-                
-            # Get available actions
-            actions = await self.game_manager.get_available_actions()
+
+    def _descend(self, descent: Descent, tiles: Dict[Position, Tile]) -> None:
+        """Walk a descent down the tree until it reaches a leaf or needs a tile not in `tiles`
+
+        Every entry it passes through takes a virtual loss, which steers the
+        other descents of the batch toward different children.
+        """
+        while descent.depth < MAX_SELECTION_DEPTH:
+            entry = self.table.get(descent.key)
+            if entry is None:
+                entry = self.table.store(descent.key, descent.depth)
+                entry.visits += 1
+                entry.total_reward -= self.virtual_loss
+                descent.entries.append(entry)
+                descent.done = True
+                return
+            if descent.position not in tiles:
+                # Resumed once the batch's tiles are resolved; children are checked against the tile
+                return
+            entry.visits += 1
+            entry.total_reward -= self.virtual_loss
+            descent.entries.append(entry)
+            entry.depth = min(entry.depth, descent.depth)
+
+            # Children open up as the node's visits grow
+            children = self._widened(entry, self._get_children(
+                entry, descent.position, descent.biome, tiles[descent.position]
+            ))
             
             # Select action using UCB1
             best_score = float('-inf')
             best_action = None
-            
-            for action in actions:
-                next_hash = f"{state_hash}_{action['type']}_{action.get('direction', '')}"
-                score = self._get_ucb1_score(next_hash, state_hash)
-                
+            best_key = None
+            for next_key, action in children:
+                score = self._get_ucb1_score(next_key, descent.key)
                 if score > best_score:
                     best_score = score
                     best_action = action
-            
+                    best_key = next_key
             if not best_action:
                 break
-                
-            # Execute action
-            result, updates = await self.game_manager.process_action(
-                best_action["type"], best_action
+
+            # Apply the action to the descent and reward it as process_action's updates would be
+            x, y = descent.position
+            if best_action["type"] == "move":
+                dx, dy = COMPASS[best_action["direction"]]
+                descent.position = (x + dx, y + dy)
+                descent.biome = self.game_manager.world_generator.biome_at(*descent.position)
+                descent.reward += self.reward_model.move_reward(descent.position, descent.biome, descent.path)
+            else:
+                feature = {"type": best_action["target"], "variant": best_action["variant"]}
+                descent.reward += self.reward_model.feature_reward(descent.position, feature, descent.discovered)
+                descent.discovered.add((x, y, feature["type"], feature["variant"]))
+            descent.path.add(descent.position)
+            descent.key = best_key
+            descent.depth += 1
+        descent.done = True
+
+    async def _simulate_batch(self, root_key: int, position: Position, biome: BiomeType,
+                              count: int, tiles: Dict[Position, Tile]) -> List[float]:
+        """Run `count` simulations together and return their rewards
+
+        Descents that reach a node whose tile isn't resolved yet pause, and
+        the tiles they wait on are resolved in one get_locations call before
+        they resume. `tiles` keeps every resolved tile for later batches.
+        """
+        descents = [Descent(root_key, position, biome) for _ in range(count)]
+        waiting = descents
+        while waiting:
+            for descent in waiting:
+                self._descend(descent, tiles)
+            waiting = [descent for descent in descents if not descent.done]
+            if waiting:
+                tiles.update(await self.game_manager.get_locations(
+                    descent.position for descent in waiting
+                ))
+
+        # Play out each leaf without touching the game, then backpropagate together
+        rewards = []
+        for descent in descents:
+            total_reward = descent.reward + rollout(
+                self.game_manager.world_generator, descent.position, descent.path,
+                self.rollout_policy, self.reward_model, self.rollout_depth
             )
-            
-            # Calculate reward based on action result
-            reward = self._calculate_reward(result, updates)
-            total_reward += reward
-            
-            depth += 1
-            
-        # Backpropagation
-        for state_hash in visited_states:
-            self.visits[state_hash] = self.visits.get(state_hash, 0) + 1
-            self.rewards[state_hash] = self.rewards.get(state_hash, 0) + total_reward
-            
-        return total_reward
-        
-    def _calculate_reward(self, result: str, updates: Dict[str, Any]) -> float:
-        """Calculate reward for an action result"""
-        reward = 0
-        
-        # Reward for discovering new locations
-        if "position" in updates:
-            reward += 1.0
-            
-        # Reward for finding interesting features
-        if "discovered_feature" in updates:
-            reward += 2.0
-            
-        # Reward for maintaining health
-        if "health" in updates:
-            health_change = updates["health"] - self.game_manager.current_game_state.health
-            reward += health_change * 0.1
-            
-        return reward
+            for entry in descent.entries:
+                # The virtual visit becomes the real one
+                entry.total_reward += self.virtual_loss + total_reward
+            rewards.append(total_reward)
+        return rewards
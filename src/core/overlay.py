@@ -0,0 +1,165 @@
+"""Per-game changes layered over the shared, immutable base world.
+
+Every game on a seed reads the same Location rows and cached tiles. What
+one player changes, such as a resource taken, a structure's condition or a
+creature that wandered in, is kept as a delta for that game alone and
+merged over the base tile on read.
+Storage grows with the number of tiles a player has changed, not with
+players times tiles.
+"""
+from typing import Dict, List, Optional, Set, Tuple
+from src.core import vocabulary
+from src.core.tile import Tile, intern_feature
+from src.models.base import LocationOverlay
+
+def feature_key(feature: dict) -> Tuple[str, str]:
+    return feature["type"], feature["variant"]
+
+class TileDelta:
+    """Changes one game has made to one tile"""
+    __slots__ = ("removed", "conditions", "added", "removed_at", "row")
+
+    def __init__(self, row: LocationOverlay):
+        self.row = row
+        self.removed: Set[Tuple[str, str]] = {tuple(key) for key in row.removed_features}
+        self.conditions: Dict[Tuple[str, str], str] = {
+            tuple(key.split(":", 1)): condition for key, condition in row.feature_conditions.items()
+        }
+        self.added: List[Tuple[str, str]] = [tuple(key) for key in row.added_features or ()]
+        self.removed_at: Dict[Tuple[str, str], float] = {
+            tuple(key.split(":", 1)): hours for key, hours in (row.removed_at or {}).items()
+        }
+
+    def copy(self) -> "TileDelta":
+        """Independent copy of the changes, sharing the row"""
+        clone = TileDelta.__new__(TileDelta)
+        clone.row = self.row
+        clone.removed = set(self.removed)
+        clone.conditions = dict(self.conditions)
+        clone.added = list(self.added)
+        clone.removed_at = dict(self.removed_at)
+        return clone
+
+    def sync_row(self) -> LocationOverlay:
+        """Copy the delta onto its row for saving"""
+        self.row.removed_features = sorted(list(key) for key in self.removed)
+        self.row.feature_conditions = {f"{t}:{v}": condition for (t, v), condition in self.conditions.items()}
+        self.row.added_features = [list(key) for key in self.added]
+        self.row.removed_at = {f"{t}:{v}": hours for (t, v), hours in self.removed_at.items()}
+        return self.row
+
+class GameOverlay:
+    """Deltas of one game keyed by tile, merged over base locations on read"""
+
+    def __init__(self, game_state):
+        self.game_state = game_state
+        self.deltas: Dict[Tuple[int, int], TileDelta] = {}
+        # Merged views, reused until the tile's delta or base object changes
+        self._views: Dict[Tuple[int, int], Tuple[Tile, Tile]] = {}
+        # Deltas as they were at the checkpoint, None for tiles that had none
+        self._saved: Optional[Dict[Tuple[int, int], Optional[TileDelta]]] = None
+
+    async def load(self) -> None:
+        """Read every delta of the game in one query"""
+        rows = await LocationOverlay.filter(game_state_id=self.game_state.id)
+        self.deltas = {(row.x, row.y): TileDelta(row) for row in rows}
+        self._views = {}
+
+    def __len__(self) -> int:
+        return len(self.deltas)
+
+    def apply(self, location: Tile) -> Tile:
+        """The tile as this game sees it; the shared tile itself when unchanged"""
+        key = (location.x, location.y)
+        delta = self.deltas.get(key)
+        if delta is None:
+            return location
+        cached = self._views.get(key)
+        if cached is not None and cached[0] is location:
+            return cached[1]
+        features = []
+        ids = []
+        for index, feature in zip(location.feature_ids, location.features):
+            feature_id = feature_key(feature)
+            if feature_id in delta.removed:
+                continue
+            condition = delta.conditions.get(feature_id)
+            if condition is not None:
+                feature = intern_feature(dict(feature, condition=condition))
+            features.append(feature)
+            ids.append(index)
+        for feature_type, variant in delta.added:
+            index = vocabulary.feature_id(feature_type, variant)
+            features.append(vocabulary.feature_of(index))
+            ids.append(index)
+        view = location._replace(features=tuple(features), feature_ids=tuple(ids))
+        self._views[key] = (location, view)
+        return view
+
+    def checkpoint(self) -> None:
+        """Start remembering changed deltas, so rollback can restore them"""
+        self._saved = {}
+
+    def drop_checkpoint(self) -> None:
+        """Keep every change since the checkpoint"""
+        self._saved = None
+
+    def rollback(self) -> None:
+        """Undo every change since the checkpoint, including on the rows"""
+        for key, delta in (self._saved or {}).items():
+            if delta is None:
+                self.deltas.pop(key, None)
+            else:
+                self.deltas[key] = delta
+                delta.sync_row()
+            self._views.pop(key, None)
+        self._saved = None
+
+    def _delta(self, x: int, y: int) -> TileDelta:
+        delta = self.deltas.get((x, y))
+        if self._saved is not None and (x, y) not in self._saved:
+            self._saved[(x, y)] = delta.copy() if delta is not None else None
+        if delta is None:
+            delta = self.deltas[(x, y)] = TileDelta(LocationOverlay(
+                game_state=self.game_state, x=x, y=y, removed_features=[], feature_conditions={},
+                added_features=[], removed_at={}
+            ))
+        self._views.pop((x, y), None)
+        return delta
+
+    def remove_feature(self, x: int, y: int, feature: dict, hours: Optional[float] = None) -> LocationOverlay:
+        """Hide a feature of the tile from this game; returns the row to save
+
+        `hours` records when it was taken, for features that grow back.
+        """
+        delta = self._delta(x, y)
+        feature_id = feature_key(feature)
+        if feature_id in delta.added:
+            delta.added.remove(feature_id)
+        else:
+            delta.removed.add(feature_id)
+        delta.conditions.pop(feature_id, None)
+        if hours is not None:
+            delta.removed_at[feature_id] = hours
+        return delta.sync_row()
+
+    def add_feature(self, x: int, y: int, feature: dict) -> LocationOverlay:
+        """Show a feature on the tile for this game, undoing a removal if there was one"""
+        delta = self._delta(x, y)
+        feature_id = feature_key(feature)
+        if feature_id in delta.removed:
+            delta.removed.discard(feature_id)
+            delta.removed_at.pop(feature_id, None)
+        elif feature_id not in delta.added:
+            delta.added.append(feature_id)
+        return delta.sync_row()
+
+    def set_condition(self, x: int, y: int, feature: dict, condition: str) -> LocationOverlay:
+        """Change a feature's condition for this game; returns the row to save"""
+        delta = self._delta(x, y)
+        delta.conditions[feature_key(feature)] = condition
+        return delta.sync_row()
+
+    def get(self, x: int, y: int) -> Optional[TileDelta]:
+        """This game's delta for a tile, if it has changed it"""
+        return self.deltas.get((x, y))
@@ -0,0 +1,161 @@
+"""Offline pregeneration of a region of a seed's world into the database.
+
+The region is cut into square chunks that a process pool generates in
+parallel. Each chunk's tiles are written in one transaction with
+bulk inserts, the same rows a player would store on arrival. Chunks whose
+tiles are all stored already are skipped, so an interrupted run resumes
+where it left off. Tiles stored in the meantime are left as they are.
+
+Rows are keyed by seed as well as position, so one database can hold the
+worlds of several seeds, and a run only ever sees its own seed's tiles.
+
+    python -m src.core.pregenerate --seed 1234 --x0 -500 --y0 -500 --width 1000 --height 1000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Tuple
+from src.core import vocabulary
+from src.core.tile import Tile
+from src.core.world import WorldGenerator
+from src.models.base import Location
+
+# Side of the square chunks handed to workers, in tiles
+PREGENERATE_CHUNK = 64
+# Rows per INSERT statement
+INSERT_BATCH = 1000
+
+Row = Tuple[int, int, str, str, Optional[list], Optional[bytes]]
+
+_worker_generator: Optional[WorldGenerator] = None
+
+def _init_worker(seed: int) -> None:
+    """Build one warm generator per worker process"""
+    global _worker_generator
+    _worker_generator = WorldGenerator(seed=seed)
+    _worker_generator.warm_up()
+
+def chunk_rows(x0: int, y0: int, width: int, height: int) -> List[Row]:
+    """Column values of a chunk's location rows, generated in a worker process"""
+    rows = []
+    for x, y, biome, features, description in _worker_generator.generate_region(x0, y0, width, height):
+        tile = Tile.create(x, y, biome, features, description)
+        codes = vocabulary.encode(tile.feature_ids)
+        rows.append((x, y, biome.value, description, features if codes is None else None, codes))
+    return rows
+
+def region_chunks(x0: int, y0: int, width: int, height: int,
+                  size: int = PREGENERATE_CHUNK) -> Iterator[Tuple[int, int, int, int]]:
+    """(x0, y0, width, height) of each chunk covering the region, row by row"""
+    for cy in range(y0, y0 + height, size):
+        for cx in range(x0, x0 + width, size):
+            yield cx, cy, min(size, x0 + width - cx), min(size, y0 + height - cy)
+
+async def _stored(seed: int, x0: int, y0: int, width: int, height: int) -> int:
+    """Number of tiles of a chunk already in the database"""
+    return await Location.filter(
+        seed=seed, x__gte=x0, x__lt=x0 + width, y__gte=y0, y__lt=y0 + height
+    ).count()
+
+async def _insert(seed: int, rows: List[Row], batch_size: int) -> None:
+    """Store a chunk's rows in one transaction; rows stored by someone else first are kept"""
+    from tortoise.transactions import in_transaction
+    locations = [
+        Location(seed=seed, x=x, y=y, biome_type=biome, description=description, features=features,
+                 feature_codes=codes, weather=None, discovered=False)
+        for x, y, biome, description, features, codes in rows
+    ]
+    async with in_transaction():
+        await Location.bulk_create(locations, batch_size=batch_size, ignore_conflicts=True)
+
+def _report(done: int, skipped: int, total: int, start: float) -> None:
+    """Overwrite the progress line on stderr"""
+    elapsed = time.perf_counter() - start
+    rate = (done - skipped) / elapsed if elapsed > 0 else 0.0
+    eta = (total - done) / rate if rate > 0 else 0.0
+    sys.stderr.write(f"\r{done}/{total} tiles ({done * 100 // max(total, 1)}%), "
+                     f"{skipped} already stored, {rate:,.0f} tiles/s, {eta:.0f}s left  ")
+    sys.stderr.flush()
+
+async def pregenerate(seed: int, x0: int, y0: int, width: int, height: int,
+                      workers: Optional[int] = None, chunk_size: int = PREGENERATE_CHUNK,
+                      batch_size: int = INSERT_BATCH, progress: bool = True) -> dict:
+    """Generate and store every missing tile of a region; Tortoise must be initialized"""
+    if width < 1 or height < 1 or chunk_size < 1:
+        raise ValueError("Region and chunk sizes must be positive")
+    total = width * height
+    done = skipped = 0
+    start = time.perf_counter()
+    loop = asyncio.get_running_loop()
+    workers = workers or os.cpu_count() or 1
+    # Enough chunks in flight to keep every worker busy while rows are inserted
+    window = 2 * workers
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(seed,)) as executor:
+        chunks = region_chunks(x0, y0, width, height, chunk_size)
+        pending = set()
+        while True:
+            for chunk in chunks:
+                area = chunk[2] * chunk[3]
+                if await _stored(seed, *chunk) == area:
+                    done += area
+                    skipped += area
+                    continue
+                pending.add(loop.run_in_executor(executor, chunk_rows, *chunk))
+                if len(pending) >= window:
+                    break
+            if not pending:
+                break
+            finished, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in finished:
+                rows = future.result()
+                await _insert(seed, rows, batch_size)
+                done += len(rows)
+            if progress:
+                _report(done, skipped, total, start)
+    if progress:
+        _report(done, skipped, total, start)
+        sys.stderr.write("\n")
+    return {"tiles": total, "generated": total - skipped, "seconds": time.perf_counter() - start}
+
+async def _run(args: argparse.Namespace) -> dict:
+    from dotenv import load_dotenv
+    from tortoise import Tortoise
+    from src.models.database import init_schema
+    load_dotenv()
+    await Tortoise.init(db_url=args.db_url or os.getenv('DATABASE_URL'), modules={'models': ['src.models.base']})
+    await init_schema()
+    try:
+        return await pregenerate(args.seed, args.x0, args.y0, args.width, args.height,
+                                 args.workers, args.chunk, args.batch_size, not args.quiet)
+    finally:
+        await Tortoise.close_connections()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Pregenerate a region of a Pathfinder world into the database")
+    parser.add_argument("--seed", type=int, required=True, help="world seed")
+    parser.add_argument("--x0", type=int, default=None, help="west edge (default: centered on 0)")
+    parser.add_argument("--y0", type=int, default=None, help="south edge (default: centered on 0)")
+    parser.add_argument("--width", type=int, default=256)
+    parser.add_argument("--height", type=int, default=256)
+    parser.add_argument("--workers", type=int, default=None, help="generator processes (default: one per CPU)")
+    parser.add_argument("--chunk", type=int, default=PREGENERATE_CHUNK, help="side of each work unit, in tiles")
+    parser.add_argument("--batch-size", type=int, default=INSERT_BATCH, help="rows per INSERT statement")
+    parser.add_argument("--db-url", default=None, help="database to fill (default: DATABASE_URL)")
+    parser.add_argument("--quiet", action="store_true", help="don't show progress")
+    args = parser.parse_args()
+    if args.x0 is None:
+        args.x0 = -(args.width // 2)
+    if args.y0 is None:
+        args.y0 = -(args.height // 2)
+
+    try:
+        result = asyncio.run(_run(args))
+    except ValueError as e:
+        parser.exit(1, f"Error: {e}\n")
+    print(f"Stored {result['generated']} new of {result['tiles']} tiles in {result['seconds']:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Rollout policies and the novelty reward model for MCTS.
+
+Rollouts play out from a freshly expanded leaf without touching the game or
+the database: moves walk over tiles whose biomes come from the cached chunk
+arrays, and each step is scored by how new the destination is against the
+set of tiles already visited.
+"""
+import math
+import random
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Set, Tuple
+from src.core.world import BIOME_FEATURES, COMPASS
+from src.models.base import BiomeType
+
+# How much finding each kind of feature is worth; anything unlisted is scenery
+FEATURE_VALUES = {
+    "landmark": 3.0,
+    "mineral": 2.5,
+    "resource": 2.0,
+    "structure": 2.0,
+    "creature_nest": 1.5,
+    "creature": 1.0,
+    "water": 1.0
+}
+DEFAULT_FEATURE_VALUE = 0.5
+
+# Expected features per tile, from FEATURE_COUNTS and their weights in world.py
+EXPECTED_FEATURE_COUNT = 1 * 0.4 + 2 * 0.3 + 3 * 0.2 + 4 * 0.1
+
+def feature_value(feature_type: str) -> float:
+    """Value of discovering one feature of this type"""
+    return FEATURE_VALUES.get(feature_type, DEFAULT_FEATURE_VALUE)
+
+# Average discovery value of entering a tile of each biome
+BIOME_FEATURE_VALUES: Dict[BiomeType, float] = {
+    biome: EXPECTED_FEATURE_COUNT * sum(feature_value(kind) for kind, _ in table) / len(table)
+    for biome, table in BIOME_FEATURES.items()
+}
+
+class NoveltyReward:
+    """Rewards reaching tiles and features that are new against a visited set
+
+    `visited` counts how often each tile has been visited by the player and
+    by previous simulations, so repeatedly explored ground pays less and
+    less. Tiles already on the current path pay nothing.
+    """
+
+    def __init__(self, feature_weight: float = 0.25):
+        self.feature_weight = feature_weight
+        self.visited: Dict[Tuple[int, int], int] = {}
+
+    def visit(self, position: Tuple[int, int]) -> None:
+        """Record a tile the player actually stood on"""
+        self.visited[position] = self.visited.get(position, 0) + 1
+
+    def novelty(self, position: Tuple[int, int], path: Set[Tuple[int, int]]) -> float:
+        """1 for an unseen tile, decaying with visits, 0 if already on this path"""
+        if position in path:
+            return 0.0
+        return 1.0 / (1 + self.visited.get(position, 0))
+
+    def move_reward(self, position: Tuple[int, int], biome: BiomeType, path: Set[Tuple[int, int]]) -> float:
+        """Reward for stepping onto `position`"""
+        return self.novelty(position, path) * (1.0 + self.feature_weight * BIOME_FEATURE_VALUES[biome])
+
+    def feature_reward(self, position: Tuple[int, int], feature: Dict[str, str],
+                       discovered: Set[Tuple[int, int, str, str]]) -> float:
+        """Reward for interacting with a feature not yet discovered on this path"""
+        key = (position[0], position[1], feature["type"], feature["variant"])
+        if key in discovered:
+            return 0.0
+        return feature_value(feature["type"])
+
+class RolloutPolicy(ABC):
+    """Chooses moves during a rollout; subclasses provide `weights`"""
+
+    @abstractmethod
+    def weights(self, moves: List[Tuple[str, Tuple[int, int], BiomeType]], path: Set[Tuple[int, int]],
+                reward_model: NoveltyReward) -> List[float]:
+        """Relative probability of each (direction, destination, biome) move"""
+
+    def choose(self, moves: List[Tuple[str, Tuple[int, int], BiomeType]], path: Set[Tuple[int, int]],
+               reward_model: NoveltyReward, rng: random.Random) -> Tuple[str, Tuple[int, int], BiomeType]:
+        """Sample one move according to `weights`"""
+        return rng.choices(moves, weights=self.weights(moves, path, reward_model))[0]
+
+class RandomRolloutPolicy(RolloutPolicy):
+    """Uniformly random moves, the classic MCTS default policy"""
+
+    def weights(self, moves, path, reward_model) -> List[float]:
+        return [1.0] * len(moves)
+
+class NoveltyRolloutPolicy(RolloutPolicy):
+    """Softmax over the move reward, biased toward unexplored, feature-rich tiles"""
+
+    def __init__(self, temperature: float = 0.3):
+        self.temperature = temperature
+
+    def weights(self, moves, path, reward_model) -> List[float]:
+        return [
+            math.exp(reward_model.move_reward(position, biome, path) / self.temperature)
+            for _, position, biome in moves
+        ]
+
+def rollout(world_generator, position: Tuple[int, int], path: Set[Tuple[int, int]],
+            policy: RolloutPolicy, reward_model: NoveltyReward, depth: int,
+            discount: float = 0.9, rng: Optional[random.Random] = None) -> float:
+    """Discounted reward of a `depth`-step walk from `position` chosen by `policy`"""
+    rng = rng or random
+    path = set(path)
+    total = 0.0
+    factor = 1.0
+    x, y = position
+    for _ in range(depth):
+        moves = []
+        for direction, (dx, dy) in COMPASS.items():
+            destination = (x + dx, y + dy)
+            moves.append((direction, destination, world_generator.biome_at(*destination)))
+        _, (x, y), biome = policy.choose(moves, path, reward_model, rng)
+        total += factor * reward_model.move_reward((x, y), biome, path)
+        path.add((x, y))
+        factor *= discount
+    return total
@@ -0,0 +1,154 @@
+import asyncio
+from typing import Optional, Set
+from colorama import Fore, Style
+from src.core.game_manager import GameManager
+from src.core.commands import render_location, execute_command
+from src.utils import metrics
+
+PROMPT = f"\n{Fore.GREEN}What would you like to do? {Style.RESET_ALL}"
+START_PROMPT = f"{Fore.GREEN}Press Enter to start a new game, or type 'load <id>' to resume: {Style.RESET_ALL}"
+
+class PlayerSession:
+    """Per-connection state: the player's game and their stream"""
+    __slots__ = ("game_manager", "reader", "writer", "peer")
+
+    def __init__(self, game_manager: GameManager, reader: asyncio.StreamReader,
+                 writer: asyncio.StreamWriter):
+        self.game_manager = game_manager
+        self.reader = reader
+        self.writer = writer
+        self.peer = writer.get_extra_info("peername")
+
+class GameServer:
+    """Line-based TCP server hosting many players on one shared world per seed"""
+
+    def __init__(self, seed: int, host: str = "127.0.0.1", port: int = 8023,
+                 max_sessions: int = 500, drain_timeout: float = 5.0,
+                 idle_timeout: float = 900.0, line_limit: int = 1024,
+                 write_buffer_limit: int = 64 * 1024):
+        self.seed = seed
+        self.host = host
+        self.port = port
+        self.max_sessions = max_sessions
+        self.drain_timeout = drain_timeout  # Slow clients are dropped after this
+        self.idle_timeout = idle_timeout
+        self.line_limit = line_limit
+        self.write_buffer_limit = write_buffer_limit
+        self.sessions: Set[PlayerSession] = set()
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        """Start listening for connections"""
+        self._server = await asyncio.start_server(
+            self._handle_client, self.host, self.port, limit=self.line_limit
+        )
+
+    async def serve_forever(self) -> None:
+        """Start (if needed) and serve until cancelled"""
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """Stop accepting connections and disconnect every player"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for session in list(self.sessions):
+            session.writer.close()
+
+    async def _send(self, session: PlayerSession, text: str) -> bool:
+        """Write text to a player; False if they can't keep up and were dropped"""
+        session.writer.write(text.encode())
+        try:
+            await asyncio.wait_for(session.writer.drain(), self.drain_timeout)
+        except (asyncio.TimeoutError, ConnectionError):
+            return False
+        return True
+
+    async def _read_line(self, session: PlayerSession) -> Optional[str]:
+        """Read one line of input, or None on disconnect, idle timeout or overlong input"""
+        try:
+            line = await asyncio.wait_for(session.reader.readline(), self.idle_timeout)
+        except (asyncio.TimeoutError, asyncio.LimitOverrunError, ValueError, ConnectionError):
+            return None
+        if not line:
+            return None
+        return line.decode(errors="replace").rstrip("\r\n")
+
+    async def _start_game(self, session: PlayerSession) -> bool:
+        """Run the start prompt, creating or loading this player's game"""
+        if not await self._send(session, f"{Fore.GREEN}Welcome to Pathfinder!{Style.RESET_ALL}\n{START_PROMPT}"):
+            return False
+        line = await self._read_line(session)
+        if line is None:
+            return False
+
+        game_manager = session.game_manager
+        start_command = line.lower().split()
+        if len(start_command) >= 2 and start_command[0] == "load":
+            try:
+                game_state = await game_manager.load_game(int(start_command[1]))
+                return await self._send(session, f"Resuming game {game_state.id}...\n")
+            except ValueError as e:
+                if not await self._send(session, f"Error: {e}\n"):
+                    return False
+        game_state = await game_manager.new_game()
+        return await self._send(session, f"Starting new game...\nGame id: {game_state.id}\n")
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Drive one player's session until they quit or disconnect"""
+        if len(self.sessions) >= self.max_sessions:
+            writer.write(b"Server is full, please try again later.\n")
+            writer.close()
+            return
+
+        writer.transport.set_write_buffer_limits(high=self.write_buffer_limit)
+        session = PlayerSession(GameManager(seed=self.seed, share_world=True), reader, writer)
+        self.sessions.add(session)
+        metrics.increment("sessions_opened")
+        try:
+            if not await self._start_game(session):
+                return
+
+            game_manager = session.game_manager
+            while True:
+                output = ""
+                if not game_manager.in_interaction:
+                    async with game_manager.turn():
+                        output = await render_location(game_manager)
+                if not await self._send(session, output + PROMPT):
+                    break
+                # Read outside any turn: a player may sit at the prompt for minutes
+                line = await self._read_line(session)
+                if line is None:
+                    break
+                async with game_manager.turn():
+                    output, quit_requested = await execute_command(game_manager, line)
+                if output and not await self._send(session, output + "\n"):
+                    break
+                if quit_requested:
+                    break
+        except Exception as e:
+            await self._send(session, f"An error occurred: {e}\n")
+        finally:
+            self.sessions.discard(session)
+            if session.game_manager.current_game_state:
+                try:
+                    await session.game_manager.save_game()
+                except Exception:
+                    pass
+                if session.game_manager.journal is not None:
+                    session.game_manager.journal.close()
+            writer.close()
+
+async def serve(seed: int, host: str = "127.0.0.1", port: int = 8023, **options) -> None:
+    """Run a GameServer until cancelled"""
+    server = GameServer(seed, host=host, port=port, **options)
+    await server.start()
+    print(f"Pathfinder server for seed {seed} listening on {host}:{port}")
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
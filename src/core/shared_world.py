@@ -0,0 +1,21 @@
+from typing import Dict
+from src.core.cache import LocationCache
+
+class SharedWorld:
+    """One world generator and location cache, shared by every game on a seed"""
+
+    def __init__(self, seed: int):
+        from src.core.world import WorldGenerator
+        self.seed = seed
+        self.world_generator = WorldGenerator(seed=seed)
+        self.location_cache = LocationCache()
+
+# Worlds hosted by this process, keyed by seed
+_worlds: Dict[int, SharedWorld] = {}
+
+def get_shared_world(seed: int) -> SharedWorld:
+    """Return the process-wide world for `seed`, creating it on first use"""
+    world = _worlds.get(seed)
+    if world is None:
+        world = _worlds[seed] = SharedWorld(seed)
+    return world
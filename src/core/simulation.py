@@ -0,0 +1,214 @@
+"""World simulation driven by a hierarchical timer wheel.
+
+Only tiles near the player take part. When the player's turn starts, tiles
+within ACTIVE_RADIUS that have not been scheduled yet get their creature
+events put on the wheel. Events whose time has come are queued per tile
+and applied to the game's overlay when that tile is next observed. Tiles
+outside the active region schedule nothing. Anything time-based about them,
+such as resources growing back, is caught up from the elapsed game time
+when they are observed. Simulation cost follows player activity, not the
+size of the world.
+
+Time is the shared game clock, WeatherSystem.game_hours, in ticks of
+TICK_HOURS.
+"""
+import random
+from typing import Any, Dict, List, Optional, Set, Tuple
+from src.core.weather import WeatherSystem
+
+TICK_HOURS = 0.25
+# Tiles within this many steps (on each axis) of the player are simulated
+ACTIVE_RADIUS = 6
+# Game hours before a taken feature of these types grows back
+REGROW_HOURS = {"resource": 24.0, "mineral": 168.0}
+# Feature types that wander between tiles, and the range of hours between moves
+WANDERING_FEATURE_TYPES = ("creature",)
+WANDER_HOURS = (1.0, 8.0)
+
+def current_tick(hours: Optional[float] = None) -> int:
+    """Tick of the shared game clock"""
+    return int((WeatherSystem.game_hours() if hours is None else hours) / TICK_HOURS)
+
+class TimerWheel:
+    """Hierarchical timing wheel
+
+    Level L has `slots` buckets, each covering slots**L ticks. An event goes
+    into the lowest level whose span reaches its due tick. When a level's
+    cursor wraps, the next bucket up is re-sorted into the levels below.
+    Scheduling is O(1), and each event is moved at most once per level
+    before it fires.
+    """
+
+    def __init__(self, now: int = 0, slots: int = 64, levels: int = 4):
+        self.now = now
+        self.slots = slots
+        self.levels = levels
+        self.wheels: List[List[List[Tuple[int, Any]]]] = [[[] for _ in range(slots)] for _ in range(levels)]
+        self.overflow: List[Tuple[int, Any]] = []  # Beyond the top level's span
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _insert(self, due: int, event: Any) -> None:
+        delta = due - self.now
+        span = 1
+        for level in range(self.levels):
+            if delta < span * self.slots:
+                self.wheels[level][(due // span) % self.slots].append((due, event))
+                return
+            span *= self.slots
+        self.overflow.append((due, event))
+
+    def schedule(self, delay: int, event: Any) -> None:
+        """Fire `event` `delay` ticks from now (at least one)"""
+        self._insert(self.now + max(1, delay), event)
+        self.count += 1
+
+    def _cascade(self) -> None:
+        """Re-sort the buckets of upper levels whose span starts at `now`"""
+        span = self.slots ** self.levels
+        if self.now % span == 0 and self.overflow:
+            pending, self.overflow = self.overflow, []
+            for due, event in pending:
+                self._insert(due, event)
+        for level in range(self.levels - 1, 0, -1):
+            span = self.slots ** level
+            if self.now % span == 0:
+                slot = (self.now // span) % self.slots
+                bucket, self.wheels[level][slot] = self.wheels[level][slot], []
+                for due, event in bucket:
+                    self._insert(due, event)
+
+    def advance(self, to: int) -> List[Any]:
+        """Move the clock to `to` and return the events that fell due, in order"""
+        fired = []
+        while self.now < to:
+            if self.count == 0:
+                # Nothing to fire: jump straight to the target
+                self.now = to
+                break
+            self.now += 1
+            self._cascade()
+            slot = self.now % self.slots
+            bucket, self.wheels[0][slot] = self.wheels[0][slot], []
+            for _, event in bucket:
+                fired.append(event)
+            self.count -= len(bucket)
+        return fired
+
+class WorldSimulation:
+    """Creature movement near the player and regrowth of taken features for one game"""
+
+    def __init__(self, world_generator, overlay, location_cache=None):
+        self.world_generator = world_generator
+        self.overlay = overlay
+        self.location_cache = location_cache
+        self.wheel = TimerWheel(current_tick())
+        self.center: Optional[Tuple[int, int]] = None
+        self._scheduled: Set[Tuple[int, int]] = set()  # Active tiles whose events are on the wheel
+        self.pending: Dict[Tuple[int, int], List[Tuple[str, Tuple[str, str]]]] = {}
+        self._saved_pending: Optional[Dict[Tuple[int, int], List[Tuple[str, Tuple[str, str]]]]] = None
+
+    def _active(self, x: int, y: int) -> bool:
+        return (self.center is not None and abs(x - self.center[0]) <= ACTIVE_RADIUS
+                and abs(y - self.center[1]) <= ACTIVE_RADIUS)
+
+    def _rng(self, x: int, y: int, salt: int) -> random.Random:
+        """Deterministic stream for one tile and moment"""
+        return random.Random(hash((self.world_generator.seed, x, y, salt)))
+
+    def _features(self, x: int, y: int) -> list:
+        """Features of a tile as this game sees it, including changes not yet observed
+
+        The tile is neither generated nor stored.
+        """
+        location = self.location_cache.peek(x, y) if self.location_cache is not None else None
+        if location is not None:
+            features = list(self.overlay.apply(location).features)
+        else:
+            features = self.world_generator.features_at(x, y)
+            delta = self.overlay.get(x, y)
+            if delta is not None:
+                features = [f for f in features if (f["type"], f["variant"]) not in delta.removed]
+                features += [{"type": t, "variant": v} for t, v in delta.added]
+        for change, key in self.pending.get((x, y), ()):
+            present = any((f["type"], f["variant"]) == key for f in features)
+            if change == "depart":
+                features = [f for f in features if (f["type"], f["variant"]) != key]
+            elif not present:
+                features.append({"type": key[0], "variant": key[1]})
+        return features
+
+    def _schedule_wander(self, x: int, y: int, key: Tuple[str, str]) -> None:
+        low, high = WANDER_HOURS
+        hours = self._rng(x, y, self.wheel.now).uniform(low, high)
+        self.wheel.schedule(int(hours / TICK_HOURS), ("wander", x, y, key))
+
+    def activate(self, x: int, y: int) -> None:
+        """Make the region around (x, y) the active one, scheduling tiles that just entered it"""
+        self.center = (x, y)
+        self._scheduled = {tile for tile in self._scheduled if self._active(*tile)}
+        for tile_x in range(x - ACTIVE_RADIUS, x + ACTIVE_RADIUS + 1):
+            for tile_y in range(y - ACTIVE_RADIUS, y + ACTIVE_RADIUS + 1):
+                if (tile_x, tile_y) in self._scheduled:
+                    continue
+                self._scheduled.add((tile_x, tile_y))
+                for feature in self._features(tile_x, tile_y):
+                    if feature["type"] in WANDERING_FEATURE_TYPES:
+                        self._schedule_wander(tile_x, tile_y, (feature["type"], feature["variant"]))
+
+    def advance(self, hours: Optional[float] = None) -> int:
+        """Fire every event due by now; returns how many fired"""
+        fired = self.wheel.advance(current_tick(hours))
+        for kind, x, y, key in fired:
+            if kind != "wander" or not self._active(x, y):
+                # Left the active region; it is rescheduled if the player comes back
+                continue
+            if not any((f["type"], f["variant"]) == key for f in self._features(x, y)):
+                # Already moved on, e.g. by an event from before the tile left and re-entered the region
+                continue
+            dx, dy = self._rng(x, y, self.wheel.now).choice(((0, 1), (0, -1), (1, 0), (-1, 0)))
+            self.pending.setdefault((x, y), []).append(("depart", key))
+            self.pending.setdefault((x + dx, y + dy), []).append(("arrive", key))
+            if self._active(x + dx, y + dy):
+                self._schedule_wander(x + dx, y + dy, key)
+        return len(fired)
+
+    def checkpoint(self) -> None:
+        """Remember the pending changes, so rollback can restore ones observed since"""
+        self._saved_pending = {tile: list(changes) for tile, changes in self.pending.items()}
+
+    def drop_checkpoint(self) -> None:
+        self._saved_pending = None
+
+    def rollback(self) -> None:
+        """Put back the pending changes as they were at the checkpoint"""
+        if self._saved_pending is not None:
+            self.pending = self._saved_pending
+            self._saved_pending = None
+
+    def observe(self, x: int, y: int, hours: Optional[float] = None) -> list:
+        """Apply what has happened to a tile since it was last seen; returns overlay rows to save"""
+        rows = []
+        present = None
+        for change, key in self.pending.pop((x, y), ()):
+            if present is None:
+                present = {(f["type"], f["variant"]) for f in self._features(x, y)}
+            feature = {"type": key[0], "variant": key[1]}
+            if change == "depart" and key in present:
+                rows.append(self.overlay.remove_feature(x, y, feature))
+                present.discard(key)
+            elif change == "arrive" and key not in present:
+                rows.append(self.overlay.add_feature(x, y, feature))
+                present.add(key)
+
+        # Catch up on regrowth from the time each feature was taken
+        delta = self.overlay.get(x, y)
+        if delta is not None and delta.removed_at:
+            now = WeatherSystem.game_hours() if hours is None else hours
+            for key, taken in list(delta.removed_at.items()):
+                if now - taken >= REGROW_HOURS.get(key[0], float("inf")):
+                    rows.append(self.overlay.add_feature(x, y, {"type": key[0], "variant": key[1]}))
+        # A row changed several times is saved once
+        return list({id(row): row for row in rows}.values())
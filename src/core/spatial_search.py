@@ -0,0 +1,162 @@
+"""Nearest-biome and nearest-feature search over the generated world.
+
+Searches walk chunks outward from the player in order of their distance and
+skip any chunk that cannot contain a match. A chunk summary records which
+biomes it holds, and hence which features its tiles can have. Tiles are
+examined only inside chunks that survive pruning. Biomes are read from
+the chunk arrays. Features come from the location cache or are derived
+from the tile's seed. Nothing is generated through get_current_location
+and nothing is written to the database.
+
+Distances are in steps (Manhattan distance), since movement is one tile
+north, south, east or west at a time.
+"""
+from collections import OrderedDict
+from typing import FrozenSet, Iterator, List, Optional, Tuple
+import numpy as np
+from src.core.world import BIOME_FEATURES, BIOME_CODES, BIOME_INDEX, CHUNK_SIZE
+from src.models.base import BiomeType
+
+SUMMARY_CACHE_SIZE = 4096
+
+class ChunkSummary:
+    """What a chunk can contain: its biomes and every (type, variant) they allow"""
+    __slots__ = ("biomes", "feature_types", "variants")
+
+    def __init__(self, biomes: FrozenSet[BiomeType]):
+        self.biomes = biomes
+        self.feature_types = frozenset(kind for biome in biomes for kind, _ in BIOME_FEATURES[biome])
+        self.variants = frozenset(
+            variant for biome in biomes for _, variants in BIOME_FEATURES[biome] for variant in variants
+        )
+
+class SearchResult:
+    """A match, where it is and how many steps away"""
+    __slots__ = ("x", "y", "distance", "biome", "feature")
+
+    def __init__(self, x: int, y: int, distance: int, biome: BiomeType, feature: Optional[dict] = None):
+        self.x = x
+        self.y = y
+        self.distance = distance
+        self.biome = biome
+        self.feature = feature
+
+def _feature_matches(feature: dict, feature_type: Optional[str], variant: Optional[str]) -> bool:
+    return ((feature_type is None or feature["type"] == feature_type)
+            and (variant is None or feature["variant"] == variant))
+
+def _biome_can_match(biome: BiomeType, feature_type: Optional[str], variant: Optional[str]) -> bool:
+    """Whether any feature of this biome could match the query"""
+    for kind, variants in BIOME_FEATURES[biome]:
+        if (feature_type is None or kind == feature_type) and (variant is None or variant in variants):
+            return True
+    return False
+
+class WorldSearch:
+    """Spatial queries against one world generator"""
+
+    def __init__(self, world_generator, location_cache=None, overlay=None):
+        self.world_generator = world_generator
+        self.location_cache = location_cache
+        self.overlay = overlay  # GameOverlay hiding features this game has used up
+        self._summaries: "OrderedDict[Tuple[int, int], ChunkSummary]" = OrderedDict()
+
+    def chunk_summary(self, cx: int, cy: int) -> ChunkSummary:
+        """Summary of chunk (cx, cy), cached"""
+        key = (cx, cy)
+        summary = self._summaries.get(key)
+        if summary is None:
+            codes = self.world_generator.chunk_biomes(cx, cy)
+            summary = ChunkSummary(frozenset(BIOME_CODES[code] for code in np.unique(codes)))
+            self._summaries[key] = summary
+            if len(self._summaries) > SUMMARY_CACHE_SIZE:
+                self._summaries.popitem(last=False)
+        else:
+            self._summaries.move_to_end(key)
+        return summary
+
+    def _chunks_by_distance(self, x: int, y: int, max_distance: int) -> Iterator[Tuple[int, int, int]]:
+        """(min steps from (x, y), cx, cy) for chunks within reach, nearest first"""
+        lo_cx, hi_cx = (x - max_distance) // CHUNK_SIZE, (x + max_distance) // CHUNK_SIZE
+        lo_cy, hi_cy = (y - max_distance) // CHUNK_SIZE, (y + max_distance) // CHUNK_SIZE
+        chunks = []
+        for cx in range(lo_cx, hi_cx + 1):
+            gap_x = max(cx * CHUNK_SIZE - x, 0, x - (cx * CHUNK_SIZE + CHUNK_SIZE - 1))
+            for cy in range(lo_cy, hi_cy + 1):
+                gap_y = max(cy * CHUNK_SIZE - y, 0, y - (cy * CHUNK_SIZE + CHUNK_SIZE - 1))
+                if gap_x + gap_y <= max_distance:
+                    chunks.append((gap_x + gap_y, cx, cy))
+        chunks.sort()
+        return iter(chunks)
+
+    def _chunk_tiles(self, x: int, y: int, cx: int, cy: int, codes_wanted: List[int],
+                     max_distance: int) -> List[Tuple[int, int, int, int]]:
+        """(distance, tile x, tile y, biome code) of tiles in a chunk with a wanted biome, nearest first"""
+        codes = self.world_generator.chunk_biomes(cx, cy)
+        rows, cols = np.nonzero(np.isin(codes, codes_wanted))
+        tile_x = cols + cx * CHUNK_SIZE
+        tile_y = rows + cy * CHUNK_SIZE
+        distance = np.abs(tile_x - x) + np.abs(tile_y - y)
+        within = distance <= max_distance
+        order = np.argsort(distance[within], kind="stable")
+        return list(zip(
+            distance[within][order].tolist(), tile_x[within][order].tolist(),
+            tile_y[within][order].tolist(), codes[rows, cols][within][order].tolist()
+        ))
+
+    def nearest_biome(self, x: int, y: int, biome: BiomeType,
+                      max_distance: int = 256) -> Optional[SearchResult]:
+        """Nearest tile of `biome` within `max_distance` steps of (x, y)"""
+        best = None
+        for gap, cx, cy in self._chunks_by_distance(x, y, max_distance):
+            if best is not None and gap >= best.distance:
+                break
+            if biome not in self.chunk_summary(cx, cy).biomes:
+                continue
+            tiles = self._chunk_tiles(x, y, cx, cy, [BIOME_INDEX[biome]], max_distance)
+            if tiles and (best is None or tiles[0][0] < best.distance):
+                distance, tile_x, tile_y, _ = tiles[0]
+                best = SearchResult(tile_x, tile_y, distance, biome)
+        return best
+
+    def _features(self, x: int, y: int, biome: BiomeType) -> list:
+        """Features of a tile: stored ones if cached, otherwise derived from the tile seed"""
+        features = None
+        if self.location_cache is not None:
+            location = self.location_cache.peek(x, y)
+            if location is not None:
+                features = location.features
+        if features is None:
+            features = self.world_generator.features_at(x, y, biome)
+        delta = self.overlay.get(x, y) if self.overlay is not None else None
+        if delta is not None:
+            features = [f for f in features if (f["type"], f["variant"]) not in delta.removed]
+        return features
+
+    def nearest_feature(self, x: int, y: int, feature_type: Optional[str] = None,
+                        variant: Optional[str] = None, max_distance: int = 64) -> Optional[SearchResult]:
+        """Nearest tile with a matching feature within `max_distance` steps of (x, y)"""
+        if feature_type is None and variant is None:
+            raise ValueError("Search needs a feature type or variant")
+        candidates = [biome for biome in BIOME_FEATURES if _biome_can_match(biome, feature_type, variant)]
+        if not candidates:
+            return None
+        best = None
+        for gap, cx, cy in self._chunks_by_distance(x, y, max_distance):
+            if best is not None and gap >= best.distance:
+                break
+            summary = self.chunk_summary(cx, cy)
+            if feature_type is not None and feature_type not in summary.feature_types:
+                continue
+            if variant is not None and variant not in summary.variants:
+                continue
+            codes = [BIOME_INDEX[biome] for biome in candidates if biome in summary.biomes]
+            for distance, tile_x, tile_y, code in self._chunk_tiles(x, y, cx, cy, codes, max_distance):
+                if best is not None and distance >= best.distance:
+                    break
+                biome = BIOME_CODES[code]
+                for feature in self._features(tile_x, tile_y, biome):
+                    if _feature_matches(feature, feature_type, variant):
+                        best = SearchResult(tile_x, tile_y, distance, biome, feature)
+                        break
+        return best
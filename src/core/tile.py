@@ -0,0 +1,131 @@
+"""Immutable tile records used everywhere except the persistence boundary.
+
+A Location model instance carries ORM metadata and a freshly decoded list
+of feature dicts. Game code only reads tiles, so the cache and hot paths
+hold Tile tuples instead. Features are interned: every tile with the same
+(type, variant) shares one read-only mapping, and each tile also carries
+the features' vocabulary ids so matching is integer comparison. Tiles are
+converted to Location rows only when written, and rows become tiles as
+soon as they are read.
+"""
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+from src.core import vocabulary
+from src.core.weather import WeatherSystem, WeatherType
+from src.core.world import COMPASS
+from src.models.base import BiomeType, Location
+
+Feature = Mapping[str, str]
+Action = Mapping[str, Any]
+
+# Distances offered with each move action, in yards
+MOVE_DISTANCES = (50, 100, 150)
+_MOVE_ACTIONS: Tuple[Action, ...] = tuple(
+    MappingProxyType({"type": "move", "direction": direction, "distances": MOVE_DISTANCES})
+    for direction in COMPASS
+)
+
+# One shared read-only mapping per distinct feature
+_features: Dict[Tuple[Tuple[str, Any], ...], Feature] = {}
+
+def intern_feature(feature: Mapping[str, Any]) -> Feature:
+    """The shared read-only copy of a feature dict"""
+    key = tuple(sorted(feature.items()))
+    interned = _features.get(key)
+    if interned is None:
+        interned = _features[key] = MappingProxyType(dict(feature))
+    return interned
+
+def intern_features(features: Iterable[Mapping[str, Any]]) -> Tuple[Tuple[Feature, ...], Tuple[int, ...]]:
+    """Interned features and their vocabulary ids"""
+    interned = []
+    ids = []
+    for feature in features:
+        index = vocabulary.feature_id(feature["type"], feature["variant"])
+        # Plain features are the vocabulary's own mapping; extra keys need their own
+        interned.append(vocabulary.feature_of(index) if len(feature) == 2 else intern_feature(feature))
+        ids.append(index)
+    return tuple(interned), tuple(ids)
+
+@lru_cache(maxsize=4096)
+def tile_actions(feature_ids: Tuple[int, ...]) -> Tuple[Action, ...]:
+    """Read-only actions on a tile with these features: the four moves, then one interact per feature
+
+    Actions depend only on the features, so tiles with the same features
+    share one tuple, and a tile whose features change gets the tuple for
+    its new ids.
+    """
+    return _MOVE_ACTIONS + tuple(
+        MappingProxyType({"type": "interact", "target": feature_type, "variant": variant})
+        for feature_type, variant in map(vocabulary.pair_of, feature_ids)
+    )
+
+class Tile(NamedTuple):
+    """Read-only view of one location, with the attribute names of the Location model"""
+    x: int
+    y: int
+    biome_type: BiomeType
+    description: str
+    features: Tuple[Feature, ...]
+    weather: Optional[WeatherType] = None
+    discovered: bool = False
+    feature_ids: Tuple[int, ...] = ()  # Vocabulary id of each feature, in order
+
+    @classmethod
+    def create(cls, x: int, y: int, biome: BiomeType, features: Iterable[Mapping[str, Any]],
+               description: str, weather: Optional[WeatherType] = None) -> "Tile":
+        """Tile from freshly generated parts"""
+        interned, ids = intern_features(features)
+        return cls(x, y, BiomeType(biome), description, interned, weather, False, ids)
+
+    @classmethod
+    def from_location(cls, location: Location) -> "Tile":
+        """Tile from a stored row, decoding packed feature ids when it has them
+
+        Weather is described when a tile is observed, so a weather sentence
+        left in the description by older versions is dropped.
+        """
+        weather = WeatherType(location.weather) if location.weather else None
+        if location.feature_codes is not None:
+            ids = vocabulary.decode(location.feature_codes)
+            interned = tuple(vocabulary.feature_of(index) for index in ids)
+        else:
+            interned, ids = intern_features(location.features or ())
+        description = WeatherSystem.strip_description(location.description)
+        return cls(location.x, location.y, BiomeType(location.biome_type), description,
+                   interned, weather, location.discovered, ids)
+
+    @property
+    def actions(self) -> Tuple[Action, ...]:
+        """Actions available here, computed once per distinct set of features"""
+        return tile_actions(self.feature_ids)
+
+    def find_feature(self, feature_type: str, variant: str) -> Optional[Feature]:
+        """The tile's (type, variant) feature, if it has one"""
+        index = vocabulary.lookup(feature_type, variant)
+        if index is not None:
+            for feature_index, feature in zip(self.feature_ids, self.features):
+                if feature_index == index:
+                    return feature
+        return None
+
+    def features_json(self) -> List[Dict[str, Any]]:
+        """Features as plain dicts, ready for a JSON column"""
+        return [dict(feature) for feature in self.features]
+
+    def to_location(self, seed: int) -> Location:
+        """Unsaved Location row holding this tile of the `seed` world, with features packed as ids when possible"""
+        plain = all(len(feature) == 2 for feature in self.features)
+        codes = vocabulary.encode(self.feature_ids) if plain else None
+        return Location(
+            seed=seed,
+            x=self.x,
+            y=self.y,
+            biome_type=self.biome_type,
+            description=self.description,
+            features=self.features_json() if codes is None else None,
+            feature_codes=codes,
+            weather=self.weather.value if self.weather else None,
+            discovered=self.discovered
+        )
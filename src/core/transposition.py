@@ -0,0 +1,105 @@
+"""Zobrist-style state keys and a bounded transposition table for MCTS.
+
+A state key is the XOR of one pseudo-random 64-bit key per state component
+(x, y, biome, health), so applying an action only XORs out the old component
+keys and XORs in the new ones. Paths that reach the same state produce the
+same key and share one table entry. Interactions change no component; the
+state after one is keyed with marked_key, which is not self-inverse, so
+interaction paths never loop back to an ancestor.
+"""
+import zlib
+from typing import List, Optional
+
+_MASK64 = 0xFFFFFFFFFFFFFFFF
+_GOLDEN = 0x9E3779B97F4A7C15
+
+# Salts that keep each component's keys independent
+KEY_X = 1
+KEY_Y = 2
+KEY_BIOME = 3
+KEY_HEALTH = 4
+KEY_INTERACTION = 5
+
+def _mix64(value: int) -> int:
+    """splitmix64 finalizer"""
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return value ^ (value >> 31)
+
+def zobrist_key(component: int, value: int) -> int:
+    """Pseudo-random 64-bit key for one value of one state component"""
+    return _mix64(((value & _MASK64) + component * _GOLDEN) & _MASK64)
+
+def marked_key(state_key: int, mark: int) -> int:
+    """Key of a state reached by an action that changes no component
+
+    Mixed rather than XORed in, so repeating the action never leads back
+    to `state_key` and interactions can't form cycles in the search graph.
+    """
+    return _mix64(state_key ^ zobrist_key(KEY_INTERACTION, mark))
+
+def interaction_id(target: str, variant: str, interaction: str = "examine") -> int:
+    """Stable integer id for an interaction, independent of hash randomization"""
+    return zlib.crc32(f"{target}:{variant}:{interaction}".encode())
+
+class TranspositionEntry:
+    """Search statistics shared by every path reaching one state"""
+    __slots__ = ("key", "visits", "total_reward", "depth", "generation", "children", "feature_ids")
+
+    def __init__(self, key: int, depth: int, generation: int):
+        self.key = key
+        self.visits = 0
+        self.total_reward = 0.0
+        self.depth = depth  # Shallowest depth from the root the state was reached at
+        self.generation = generation  # Search that last touched the entry
+        self.children = None  # Candidate actions, best prior first, filled on first visit
+        self.feature_ids = None  # Features of the tile the children were built from
+
+class TranspositionTable:
+    """Fixed-size table of TranspositionEntry, two slots per bucket
+
+    The first slot of a bucket is depth-preferred: it keeps whichever entry
+    sits closest to the root, since those carry the most visits, unless that
+    entry is from an older search. The second slot always takes the newest
+    entry, so deep states still get shared within a search.
+    """
+
+    def __init__(self, size: int = 1 << 16):
+        self.size = size
+        self.generation = 0
+        self._slots: List[Optional[TranspositionEntry]] = [None] * (2 * size)
+
+    def new_search(self) -> None:
+        """Age every stored entry; older entries become preferred for replacement"""
+        self.generation += 1
+
+    def get(self, key: int) -> Optional[TranspositionEntry]:
+        """Entry for `key` if it is still stored"""
+        index = 2 * (key % self.size)
+        for entry in (self._slots[index], self._slots[index + 1]):
+            if entry is not None and entry.key == key:
+                entry.generation = self.generation
+                return entry
+        return None
+
+    def store(self, key: int, depth: int) -> TranspositionEntry:
+        """Entry for `key`, inserting a fresh one (and evicting) if absent"""
+        entry = self.get(key)
+        if entry is not None:
+            entry.depth = min(entry.depth, depth)
+            return entry
+
+        entry = TranspositionEntry(key, depth, self.generation)
+        index = 2 * (key % self.size)
+        preferred = self._slots[index]
+        if preferred is None or preferred.generation != self.generation or depth <= preferred.depth:
+            if preferred is not None:
+                # Demote the displaced entry instead of dropping it outright
+                self._slots[index + 1] = preferred
+            self._slots[index] = entry
+        else:
+            self._slots[index + 1] = entry
+        return entry
+
+    def __len__(self) -> int:
+        return sum(entry is not None for entry in self._slots)
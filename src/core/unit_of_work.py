@@ -0,0 +1,86 @@
+from typing import List, Optional
+from src.models.base import GameState, Location, LocationOverlay, Item
+from src.utils import metrics
+
+class UnitOfWork:
+    """Writes deferred for one player turn
+
+    Reads made during the turn are counted here, and writes are queued so
+    that `commit` applies them in a single transaction.
+    """
+
+    def __init__(self):
+        self.game_state: Optional[GameState] = None  # Saved on commit when set
+        self.new_locations: List[Location] = []
+        self.new_items: List[Item] = []
+        self.deleted_items: List[Item] = []
+        self.overlays: List[LocationOverlay] = []
+        self.reads = 0
+        self.writes = 0
+
+    def count(self, kind: str = "read") -> None:
+        """Count a database round trip against this turn"""
+        if kind == "read":
+            self.reads += 1
+        else:
+            self.writes += 1
+        metrics.count_query(kind)
+
+    def save(self, game_state: GameState) -> None:
+        """Save the game state when the turn commits"""
+        self.game_state = game_state
+
+    def add_location(self, location: Location) -> None:
+        """Insert a newly generated tile when the turn commits"""
+        self.new_locations.append(location)
+
+    def add_item(self, item: Item) -> None:
+        """Insert an inventory item when the turn commits"""
+        self.new_items.append(item)
+
+    def delete_item(self, item: Item) -> None:
+        """Delete an inventory item when the turn commits"""
+        # Unsaved models all compare equal (their pk is None), so match by identity
+        index = next((i for i, pending in enumerate(self.new_items) if pending is item), None)
+        if index is not None:
+            # Taken and dropped within the same turn; never reaches the database
+            del self.new_items[index]
+        else:
+            self.deleted_items.append(item)
+
+    def save_overlay(self, row: LocationOverlay) -> None:
+        """Insert or update a game's tile overlay when the turn commits"""
+        # New rows all compare equal (pk None), so deduplicate by identity
+        if not any(pending is row for pending in self.overlays):
+            self.overlays.append(row)
+
+    @property
+    def pending(self) -> bool:
+        """Whether any writes are waiting for commit"""
+        return bool(self.game_state or self.new_locations or self.new_items or self.deleted_items
+                    or self.overlays)
+
+    async def commit(self) -> None:
+        """Apply every queued write in one transaction"""
+        if not self.pending:
+            return
+        from tortoise.transactions import in_transaction
+        self.count("write")
+        async with in_transaction():
+            if self.new_locations:
+                # Another session may have stored a tile first; its row wins
+                await Location.bulk_create(self.new_locations, ignore_conflicts=True)
+            for item in self.new_items:
+                # Saved one by one so each gets its id for a later drop
+                await item.save()
+            if self.deleted_items:
+                await Item.filter(id__in=[item.id for item in self.deleted_items]).delete()
+            for row in self.overlays:
+                await row.save()
+            if self.game_state is not None:
+                await self.game_state.save()
+        self.game_state = None
+        self.new_locations = []
+        self.new_items = []
+        self.deleted_items = []
+        self.overlays = []
@@ -0,0 +1,100 @@
+"""Small integer ids for every (type, variant) feature the game knows about.
+
+Ids are assigned in a fixed order: the generator's BIOME_FEATURES tables
+biome by biome, then structure and resource definitions. Stored rows pack
+them as little-endian uint16s, so new features must be appended to the end
+of those tables to keep existing ids valid. Features met at run time that
+are not in the tables get ids past the static range. Those ids are never
+persisted; tiles holding them are stored as JSON instead.
+"""
+import sys
+from array import array
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple
+from src.core.world import BIOME_FEATURES
+from src.models.base import BiomeType
+from src.utils.resource_definitions import RESOURCE_DEFINITIONS
+from src.utils.structure_definitions import STRUCTURE_DEFINITIONS
+
+Feature = Mapping[str, str]
+
+_pairs: List[Tuple[str, str]] = []  # id -> (type, variant)
+_features: List[Feature] = []  # id -> shared read-only feature mapping
+_ids: Dict[Tuple[str, str], int] = {}
+
+def _add(feature_type: str, variant: str) -> int:
+    key = (feature_type, variant)
+    index = _ids.get(key)
+    if index is None:
+        index = _ids[key] = len(_pairs)
+        _pairs.append(key)
+        _features.append(MappingProxyType({"type": feature_type, "variant": variant}))
+    return index
+
+for _biome in BiomeType:
+    for _kind, _variants in BIOME_FEATURES[_biome]:
+        for _variant in _variants:
+            _add(_kind, _variant)
+for _name in STRUCTURE_DEFINITIONS:
+    _add("structure", _name)
+for _name in RESOURCE_DEFINITIONS:
+    _add("resource", _name)
+
+# Ids below this are fixed by the tables and safe to store
+STATIC_VOCABULARY_SIZE = len(_pairs)
+
+_BIG_ENDIAN = sys.byteorder == "big"
+
+def feature_id(feature_type: str, variant: str) -> int:
+    """Id of a (type, variant) pair, assigning a run-time id to unseen pairs"""
+    index = _ids.get((feature_type, variant))
+    if index is None:
+        index = _add(feature_type, variant)
+        named_ids.cache_clear()
+        matching_ids.cache_clear()
+    return index
+
+def lookup(feature_type: str, variant: str) -> Optional[int]:
+    """Id of a pair if it has one, without assigning"""
+    return _ids.get((feature_type, variant))
+
+def feature_of(feature_id: int) -> Feature:
+    """The shared read-only {"type", "variant"} mapping for an id"""
+    return _features[feature_id]
+
+def pair_of(feature_id: int) -> Tuple[str, str]:
+    return _pairs[feature_id]
+
+def encode(feature_ids: Iterable[int]) -> Optional[bytes]:
+    """Ids packed as little-endian uint16s, or None if any id cannot be stored"""
+    packed = array("H", feature_ids)
+    if any(i >= STATIC_VOCABULARY_SIZE for i in packed):
+        return None
+    if _BIG_ENDIAN:
+        packed.byteswap()
+    return packed.tobytes()
+
+def decode(data: bytes) -> Tuple[int, ...]:
+    """Ids from `encode` output"""
+    packed = array("H")
+    packed.frombytes(data)
+    if _BIG_ENDIAN:
+        packed.byteswap()
+    return tuple(packed)
+
+@lru_cache(maxsize=256)
+def named_ids(item_name: str) -> FrozenSet[int]:
+    """Ids of features whose type or variant contains the item name"""
+    name = item_name.lower()
+    return frozenset(
+        i for i, (kind, variant) in enumerate(_pairs)
+        if name in variant.lower() or name in kind.lower()
+    )
+
+@lru_cache(maxsize=256)
+def matching_ids(item_name: str) -> FrozenSet[int]:
+    """Ids of features an item can be taken from: any resource, or a type or variant containing the name"""
+    return named_ids(item_name) | frozenset(
+        i for i, (kind, _) in enumerate(_pairs) if kind.lower() == "resource"
+    )
@@ -1,8 +1,24 @@
 from enum import Enum
-from typing import Dict, Optional
-import random
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+import time
 from src.models.base import BiomeType
 
+# Real seconds per game hour; weather fronts drift over a few game hours
+SECONDS_PER_GAME_HOUR = 60.0
+
+# Spatial and temporal frequency of the weather noise field
+WEATHER_SPACE_SCALE = 0.05
+WEATHER_TIME_SCALE = 0.15
+
+# Empirical 5%..95% quantiles of OpenSimplex noise3, used to flatten noise
+# values into a roughly uniform sample so the biome probabilities hold
+NOISE3_QUANTILES = (
+    -0.9, -0.508, -0.422, -0.356, -0.297, -0.242, -0.191, -0.142, -0.093, -0.047,
+    -0.001, 0.046, 0.093, 0.141, 0.190, 0.240, 0.295, 0.353, 0.420, 0.507, 0.9
+)
+
 class WeatherType(str, Enum):
     CLEAR = "clear"
     CLOUDY = "cloudy"
@@ -56,9 +72,81 @@ class WeatherSystem:
         }
     }
 
+    WEATHER_DESCRIPTIONS = {
+        WeatherType.CLEAR: "The sky is clear and bright.",
+        WeatherType.CLOUDY: "Gray clouds drift overhead.",
+        WeatherType.RAIN: "A steady rain falls from above.",
+        WeatherType.STORM: "Thunder rumbles as storm clouds loom.",
+        WeatherType.SNOW: "Snowflakes drift gently from the sky.",
+        WeatherType.BLIZZARD: "Howling winds drive snow through the air.",
+        WeatherType.SANDSTORM: "Sand whips through the air in stinging clouds.",
+        WeatherType.FOG: "A thick fog limits visibility.",
+        WeatherType.MISTY: "A light mist hangs in the air."
+    }
+
+    @staticmethod
+    def _elevation_band(elevation: float) -> int:
+        """Bucket elevation into the bands that change weather odds"""
+        if elevation > 0.5:
+            return 1
+        if elevation < -0.5:
+            return -1
+        return 0
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _cumulative_weather(cls, biome: BiomeType, band: int) -> Tuple[Tuple[WeatherType, ...], Tuple[float, ...]]:
+        """Weather types and their cumulative probabilities for a biome and elevation band"""
+        elevation = 1.0 if band > 0 else -1.0 if band < 0 else 0.0
+        normalized_probs = cls._weather_probabilities(biome, elevation)
+        weathers = tuple(normalized_probs)
+        cumulative = []
+        total = 0.0
+        for weather in weathers:
+            total += normalized_probs[weather]
+            cumulative.append(total)
+        return weathers, tuple(cumulative)
+
+    @classmethod
+    def weather_from_sample(cls, biome: BiomeType, elevation: float, sample: float) -> WeatherType:
+        """Pick weather for a uniform sample in [0, 1)"""
+        weathers, cumulative = cls._cumulative_weather(biome, cls._elevation_band(elevation))
+        index = bisect_right(cumulative, sample)
+        return weathers[index] if index < len(weathers) else WeatherType.CLEAR
+
+    @staticmethod
+    def noise_to_sample(value: float) -> float:
+        """Flatten an OpenSimplex noise3 value into a roughly uniform sample in [0, 1]"""
+        index = bisect_right(NOISE3_QUANTILES, value)
+        if index <= 0:
+            return 0.0
+        if index >= len(NOISE3_QUANTILES):
+            return 1.0
+        low, high = NOISE3_QUANTILES[index - 1], NOISE3_QUANTILES[index]
+        step = 1.0 / (len(NOISE3_QUANTILES) - 1)
+        return (index - 1 + (value - low) / (high - low)) * step
+
+    @staticmethod
+    def game_hours(now: Optional[float] = None) -> float:
+        """Current world time in game hours, shared by every game in the process"""
+        return (time.time() if now is None else now) / SECONDS_PER_GAME_HOUR
+
+    @classmethod
+    def describe(cls, weather: WeatherType) -> str:
+        """One sentence describing the weather"""
+        return cls.WEATHER_DESCRIPTIONS.get(weather, "")
+
     @classmethod
-    def get_weather(cls, biome: BiomeType, elevation: float = 0) -> WeatherType:
-        """Generate weather appropriate for the biome and elevation"""
+    def strip_description(cls, description: str) -> str:
+        """A location description without the weather sentence older versions stored at its end"""
+        for sentence in cls.WEATHER_DESCRIPTIONS.values():
+            if description.endswith(" " + sentence):
+                return description[:-len(sentence) - 1]
+        return description
+
+    @classmethod
+    def _weather_probabilities(cls, biome: BiomeType, elevation: float) -> Dict[WeatherType, float]:
+        """Normalized weather probabilities for the biome and elevation"""
         weather_probs = cls.BIOME_WEATHER[biome].copy()
         
         # Adjust probabilities based on elevation
@@ -73,14 +161,4 @@ class WeatherSystem:
 
         # Normalize probabilities
         total = sum(weather_probs.values())
-        normalized_probs = {k: v/total for k, v in weather_probs.items()}
-
-        # Select weather based on probabilities
-        rand = random.random()
-        cumulative = 0
-        for weather, prob in normalized_probs.items():
-            cumulative += prob
-            if rand <= cumulative:
-                return weather
-        
-        return WeatherType.CLEAR  # Fallback
+        return {k: v/total for k, v in weather_probs.items()}
@@ -1,43 +1,220 @@
-from opensimplex import OpenSimplex
 from src.models.base import BiomeType, Location
-from src.core.weather import WeatherSystem, WeatherType
+from src.core.biome_table import BiomeTable
+from src.core.weather import WeatherSystem, WeatherType, WEATHER_SPACE_SCALE, WEATHER_TIME_SCALE
+from src.utils.startup import lazy_import
+from src.utils import metrics
 import random
-from typing import Tuple, Dict, Any
+from bisect import bisect_right
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import permutations
+from typing import Tuple, Dict, Any, List, Optional, Sequence
+
+# Static feature tables per biome: (feature type, possible variants)
+BIOME_FEATURES: Dict[BiomeType, Tuple[Tuple[str, Tuple[str, ...]], ...]] = {
+    BiomeType.FOREST: (
+        ("tree", ("oak", "pine", "birch", "maple", "ancient", "magical", "hollow")),
+        ("bush", ("berry", "flower", "thorny", "healing", "poisonous", "glowing")),
+        ("mushroom", ("red", "brown", "spotted", "giant", "luminous", "medicinal")),
+        ("landmark", ("shrine", "statue", "ruins", "camp", "cave")),
+        ("creature_nest", ("bird", "squirrel", "fox", "owl", "fairy")),
+        ("resource", ("herbs", "fruits", "wood", "flowers", "honey"))
+    ),
+    BiomeType.MOUNTAIN: (
+        ("rock", ("boulder", "cliff", "cave", "arch", "peak", "crystal")),
+        ("mineral", ("crystal", "ore", "gems", "gold", "silver", "diamond")),
+        ("landmark", ("shrine", "mine", "bridge", "watchtower", "tomb")),
+        ("creature_nest", ("eagle", "goat", "dragon", "griffin", "yeti")),
+        ("weather", ("mist", "storm", "snow", "wind", "clear")),
+        ("path", ("steep", "winding", "dangerous", "hidden", "ancient"))
+    ),
+    BiomeType.PLAINS: (
+        ("grass", ("tall", "flowering", "wild", "golden", "magical", "whispering")),
+        ("creature", ("rabbit", "deer", "bird", "unicorn", "wolf", "fairy")),
+        ("landmark", ("well", "stone_circle", "camp", "village", "tower")),
+        ("water", ("stream", "pond", "spring", "oasis", "waterfall")),
+        ("resource", ("herbs", "berries", "flowers", "grain", "cotton")),
+        ("structure", ("fence", "bridge", "signpost", "shelter", "ruins"))
+    ),
+    BiomeType.DESERT: (
+        ("cactus", ("barrel", "saguaro", "prickly", "flowering", "giant", "rare")),
+        ("dune", ("rolling", "steep", "windswept", "shifting", "massive", "golden")),
+        ("landmark", ("oasis", "ruins", "pyramid", "temple", "mirage")),
+        ("creature_nest", ("scorpion", "snake", "lizard", "phoenix", "djinn")),
+        ("resource", ("water", "dates", "minerals", "herbs", "crystals")),
+        ("structure", ("well", "shelter", "camp", "tomb", "trading_post"))
+    ),
+    BiomeType.SWAMP: (
+        ("water", ("pool", "marsh", "bog", "river", "quicksand", "mystic_pool")),
+        ("vegetation", ("vine", "moss", "reed", "mangrove", "mushroom", "willow")),
+        ("landmark", ("hut", "ruins", "altar", "bridge", "statue")),
+        ("creature_nest", ("frog", "snake", "bird", "witch", "spirit")),
+        ("resource", ("herbs", "roots", "fish", "magic_essence", "poison")),
+        ("atmosphere", ("fog", "mist", "glow", "darkness", "whispers"))
+    ),
+    BiomeType.TUNDRA: (
+        ("ice", ("formation", "sheet", "crystal", "cave", "bridge", "sculpture")),
+        ("rock", ("frozen", "snow-covered", "weathered", "crystal", "magical")),
+        ("landmark", ("cave", "shrine", "monolith", "settlement", "beacon")),
+        ("creature_nest", ("penguin", "seal", "bear", "wolf", "frost_giant")),
+        ("weather", ("blizzard", "aurora", "clear", "storm", "whiteout")),
+        ("resource", ("ice_crystal", "fur", "fish", "magic_ice", "minerals"))
+    )
+}
+
+# Features per tile:
+# 40% chance: 1 feature
+# 30% chance: 2 features
+# 20% chance: 3 features
+# 10% chance: 4 features
+FEATURE_COUNTS = (1, 2, 3, 4)
+FEATURE_COUNT_CUM_WEIGHTS = (0.4, 0.7, 0.9, 1.0)
+
+# Biome codes used by the vectorized grids: code i is BIOME_CODES[i]
+BIOME_CODES: Tuple[BiomeType, ...] = tuple(BiomeType)
+BIOME_INDEX: Dict[BiomeType, int] = {biome: i for i, biome in enumerate(BIOME_CODES)}
+
+# Tiles per chunk side, and how many chunk biome arrays a generator keeps
+CHUNK_SIZE = 32
+CHUNK_CACHE_SIZE = 1024
+
+# Compass directions as (dx, dy); north is +y
+COMPASS = {"north": (0, 1), "south": (0, -1), "east": (1, 0), "west": (-1, 0)}
+
+# Horizon previews: how far they reach, their sample spacing and noise octaves used
+HORIZON_DISTANCE = 64
+HORIZON_STEP = 4
+HORIZON_OCTAVES = 2
+
+# Salts for the seeded per-tile dithering in biome classification
+DITHER_MOISTURE_LOCAL = 0
+DITHER_ELEVATION = 1
+DITHER_MOISTURE = 2
+DITHER_ELEVATION_BAND = 3
+DITHER_MOISTURE_BAND = 4
+
+# Salts for the seeded per-tile feature draws; variants use one salt per feature slot
+SAMPLE_COUNT = 5
+SAMPLE_ORDERING = 6
+SAMPLE_VARIANT = 7
+
+@lru_cache(maxsize=None)
+def _feature_orderings(table_size: int, count: int) -> Tuple[Tuple[int, ...], ...]:
+    """All ordered index selections of `count` rows, so one draw picks a whole sample"""
+    return tuple(permutations(range(table_size), min(count, table_size)))
+
+@lru_cache(maxsize=None)
+def _sampling_tables():
+    """Arrays for sampling features by biome code, shared by every generator
+
+    orderings[biome, count index, ordering, slot] is a table row, -1 past the
+    sample; ordering_counts[biome, count index] how many orderings there are;
+    variant_counts[biome, row] the row's variants; and pair_index[biome, row,
+    variant] the position in `pairs` of its (type, variant).
+    """
+    np = lazy_import("numpy")
+    slots = max(FEATURE_COUNTS)
+    tables = [BIOME_FEATURES.get(biome, ()) for biome in BIOME_CODES]
+    rows = max(1, max(len(table) for table in tables))
+    variants = max([1] + [len(row[1]) for table in tables for row in table])
+    largest = max([1] + [len(_feature_orderings(len(table), count)) for table in tables if table
+                         for count in FEATURE_COUNTS])
+    orderings = np.full((len(tables), len(FEATURE_COUNTS), largest, slots), -1, dtype=np.int64)
+    ordering_counts = np.zeros((len(tables), len(FEATURE_COUNTS)), dtype=np.int64)
+    variant_counts = np.ones((len(tables), rows), dtype=np.int64)
+    pair_index = np.zeros((len(tables), rows, variants), dtype=np.int64)
+    pairs = []
+    for code, table in enumerate(tables):
+        for row, (feature_type, row_variants) in enumerate(table):
+            variant_counts[code, row] = len(row_variants)
+            for variant_index, variant in enumerate(row_variants):
+                pair_index[code, row, variant_index] = len(pairs)
+                pairs.append((feature_type, variant))
+        if not table:
+            continue
+        for count_index, count in enumerate(FEATURE_COUNTS):
+            choices = _feature_orderings(len(table), count)
+            ordering_counts[code, count_index] = len(choices)
+            orderings[code, count_index, :len(choices), :len(choices[0])] = choices
+    return orderings, ordering_counts, variant_counts, pair_index, tuple(pairs)
 
 class WorldGenerator:
-    def __init__(self, seed: int = None):
+    def __init__(self, seed: int = None, biome_table: Optional[Dict[str, Any]] = None):
         self.seed = seed or random.randint(0, 1000000)
-        # Create two noise generators for more varied terrain
-        self.elevation_noise = OpenSimplex(seed=self.seed)
-        self.moisture_noise = OpenSimplex(seed=self.seed + 1)
+        # Two noise generators for more varied terrain, built on first use
+        self._elevation_noise = None
+        self._moisture_noise = None
+        self._weather_noise = None
+        self._generation_pool = None
         
         # Configure multi-layered noise parameters
         self.ELEVATION_SCALES = [0.02, 0.04, 0.08]  # Multiple scales for varied terrain
         self.MOISTURE_SCALES = [0.015, 0.03, 0.06]  # Multiple scales for varied moisture
         self.WEIGHTS = [0.5, 0.3, 0.2]  # Weights for each scale layer
         
-        # Add some random offset to prevent grid-like patterns
-        self.x_offset = random.uniform(-2000, 2000)
-        self.y_offset = random.uniform(-2000, 2000)
+        # Add some offset to prevent grid-like patterns, derived from the seed
+        # so every generator for the same seed produces the same terrain
+        offset_rng = random.Random(self.seed)
+        self.x_offset = offset_rng.uniform(-2000, 2000)
+        self.y_offset = offset_rng.uniform(-2000, 2000)
+
+        # Cache of per-chunk biome code arrays, see chunk_biomes
+        self._chunk_biomes: "OrderedDict[Tuple[int, int], Any]" = OrderedDict()
         
-        # Biome determination matrix [elevation][moisture]
-        self.BIOME_MATRIX = {
-            'high': {
-                'wet': BiomeType.MOUNTAIN,
-                'medium': BiomeType.MOUNTAIN,
-                'dry': BiomeType.DESERT
-            },
-            'medium': {
-                'wet': BiomeType.SWAMP,
-                'medium': BiomeType.FOREST,
-                'dry': BiomeType.PLAINS
-            },
-            'low': {
-                'wet': BiomeType.SWAMP,
-                'medium': BiomeType.PLAINS,
-                'dry': BiomeType.TUNDRA
-            }
-        }
+        # Elevation/moisture thresholds and the biome matrix, as a lookup table
+        self.biome_table = BiomeTable(biome_table) if biome_table is not None else BiomeTable.from_environment()
+
+    @property
+    def elevation_noise(self):
+        """Elevation noise generator, constructed lazily"""
+        if self._elevation_noise is None:
+            OpenSimplex = lazy_import("opensimplex").OpenSimplex
+            self._elevation_noise = OpenSimplex(seed=self.seed)
+        return self._elevation_noise
+
+    @property
+    def moisture_noise(self):
+        """Moisture noise generator, constructed lazily"""
+        if self._moisture_noise is None:
+            OpenSimplex = lazy_import("opensimplex").OpenSimplex
+            self._moisture_noise = OpenSimplex(seed=self.seed + 1)
+        return self._moisture_noise
+
+    @property
+    def weather_noise(self):
+        """Space-time weather noise generator, constructed lazily"""
+        if self._weather_noise is None:
+            OpenSimplex = lazy_import("opensimplex").OpenSimplex
+            self._weather_noise = OpenSimplex(seed=self.seed + 2)
+        return self._weather_noise
+
+    @property
+    def world_key(self) -> Tuple[int, float, float, str]:
+        """Values that fully determine this generator's terrain"""
+        return (self.seed, self.x_offset, self.y_offset, self.biome_table.key)
+
+    @property
+    def generation_pool(self):
+        """Pool that runs generation off the event loop, created lazily"""
+        if self._generation_pool is None:
+            from src.core.generation import GenerationPool
+            self._generation_pool = GenerationPool(self)
+        return self._generation_pool
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle without noise generators or pool so process workers rebuild them lazily"""
+        state = self.__dict__.copy()
+        state["_elevation_noise"] = None
+        state["_moisture_noise"] = None
+        state["_weather_noise"] = None
+        state["_generation_pool"] = None
+        state["_chunk_biomes"] = OrderedDict()
+        return state
+
+    def warm_up(self) -> None:
+        """Build the noise generators ahead of the first generated tile"""
+        self.elevation_noise.noise2(0, 0)
+        self.moisture_noise.noise2(0, 0)
 
     def _get_elevation(self, x: int, y: int) -> float:
         """Generate elevation value using multiple noise layers"""
@@ -59,112 +236,183 @@ class WorldGenerator:
                 (y + self.y_offset) * scale
             )
         # Add some local variation
-        local_variation = random.uniform(-0.1, 0.1)
+        local_variation = self._dither(x, y, DITHER_MOISTURE_LOCAL) * 0.2 - 0.1
         return (moisture / sum(self.WEIGHTS)) + local_variation
 
+    def _dither(self, x: int, y: int, salt: int) -> float:
+        """Seeded per-tile uniform in [0, 1), identical to the vectorized grids"""
+        from src.utils.noise_generator import hash_uniform_scalar
+        return hash_uniform_scalar(self.seed, x, y, salt)
+
     def _determine_biome(self, x: int, y: int) -> BiomeType:
         """Determine biome based on elevation and moisture with some randomization"""
         elevation = self._get_elevation(x, y)
         moisture = self._get_moisture(x, y)
         
-        # Add slight random variation
-        elevation += random.uniform(-0.1, 0.1)
-        moisture += random.uniform(-0.1, 0.1)
-        
-        # Convert noise values to categories with more granular thresholds
-        if elevation > 0.4:
-            elev_category = 'high'
-        elif elevation > 0.1:
-            elev_category = 'medium'
-        elif elevation > -0.2:
-            elev_category = 'medium' if random.random() > 0.3 else 'low'
+        # Add slight seeded variation
+        elevation += self._dither(x, y, DITHER_ELEVATION) * 0.2 - 0.1
+        moisture += self._dither(x, y, DITHER_MOISTURE) * 0.2 - 0.1
+
+        code = self.biome_table.classify(
+            elevation, moisture,
+            lambda: self._dither(x, y, DITHER_ELEVATION_BAND),
+            lambda: self._dither(x, y, DITHER_MOISTURE_BAND)
+        )
+        return BIOME_CODES[code]
+
+    def _noise_grid(self, seed: int, scales: List[float], x0: int, y0: int,
+                    width: int, height: int, step: int = 1, octaves: Optional[int] = None):
+        """Weighted multi-octave noise over a tile region, shaped (height, width) / step
+
+        With `octaves`, only that many of the lowest-frequency layers are
+        evaluated. The missing layers average zero, so the result is still
+        normalized by the full weight sum.
+        """
+        np = lazy_import("numpy")
+        from src.utils.noise_generator import octave_noise2_grid
+        count = len(scales) if octaves is None else max(1, min(octaves, len(scales)))
+        xs = np.arange(x0, x0 + width, step, dtype=np.float64) + self.x_offset
+        ys = np.arange(y0, y0 + height, step, dtype=np.float64) + self.y_offset
+        return octave_noise2_grid(seed, xs, ys, scales[:count], self.WEIGHTS[:count]) / sum(self.WEIGHTS)
+
+    def elevation_grid(self, x0: int, y0: int, width: int, height: int, step: int = 1,
+                       octaves: Optional[int] = None):
+        """Elevation for every step-th tile of a region; row i is y0 + i*step, column j is x0 + j*step"""
+        return self._noise_grid(self.seed, self.ELEVATION_SCALES, x0, y0, width, height, step, octaves)
+
+    def moisture_grid(self, x0: int, y0: int, width: int, height: int, step: int = 1,
+                      octaves: Optional[int] = None):
+        """Moisture for a tile region before any per-tile dithering"""
+        return self._noise_grid(self.seed + 1, self.MOISTURE_SCALES, x0, y0, width, height, step, octaves)
+
+    def biome_grid(self, x0: int, y0: int, width: int, height: int, elevation=None, step: int = 1,
+                   octaves: Optional[int] = None):
+        """Biome codes (indices into BIOME_CODES) for every step-th tile of a region, as uint8
+
+        Matches _determine_biome tile for tile, since both use the same seeded
+        dithering. Passing `octaves` gives a cheaper low-detail preview: only
+        the broadest noise layers, and every dither at its median instead of
+        per-tile speckle. It keeps the large-scale shape of the terrain but
+        can differ tile by tile.
+        """
+        np = lazy_import("numpy")
+        from src.utils.noise_generator import hash_uniform
+        if elevation is None:
+            elevation = self.elevation_grid(x0, y0, width, height, step, octaves)
+        moisture = self.moisture_grid(x0, y0, width, height, step, octaves)
+        if octaves is not None:
+            median = np.full(elevation.shape, 0.5)
+            return self.biome_table.classify_grid(elevation, moisture, median, median)
+        xs = np.arange(x0, x0 + width, step)[np.newaxis, :]
+        ys = np.arange(y0, y0 + height, step)[:, np.newaxis]
+
+        def dither(salt: int):
+            return hash_uniform(self.seed, xs, ys, salt)
+
+        moisture = moisture + (dither(DITHER_MOISTURE_LOCAL) * 0.2 - 0.1)
+        elevation = elevation + (dither(DITHER_ELEVATION) * 0.2 - 0.1)
+        moisture = moisture + (dither(DITHER_MOISTURE) * 0.2 - 0.1)
+
+        return self.biome_table.classify_grid(
+            elevation, moisture, dither(DITHER_ELEVATION_BAND), dither(DITHER_MOISTURE_BAND)
+        )
+
+    def horizon(self, x: int, y: int, direction: str, distance: int = HORIZON_DISTANCE,
+                step: int = HORIZON_STEP, octaves: Optional[int] = HORIZON_OCTAVES) -> List[Tuple[int, BiomeType]]:
+        """(steps away, biome) every `step` tiles along a compass direction, from a low-detail preview"""
+        dx, dy = COMPASS[direction]
+        count = distance // step
+        if count < 1:
+            return []
+        reach = count * step
+        # A one-tile-wide strip, west-to-east or south-to-north like every grid
+        if dx:
+            x0 = x + step if dx > 0 else x - reach
+            codes = self.biome_grid(x0, y, reach, 1, step=step, octaves=octaves)[0]
         else:
-            elev_category = 'low'
-            
-        if moisture > 0.3:
-            moist_category = 'wet'
-        elif moisture > 0:
-            moist_category = 'medium'
-        elif moisture > -0.3:
-            moist_category = 'medium' if random.random() > 0.3 else 'dry'
+            y0 = y + step if dy > 0 else y - reach
+            codes = self.biome_grid(x, y0, 1, reach, step=step, octaves=octaves)[:, 0]
+        codes = codes.tolist()
+        if dx < 0 or dy < 0:
+            codes.reverse()
+        return [(step * (i + 1), BIOME_CODES[code]) for i, code in enumerate(codes)]
+
+    def chunk_biomes(self, cx: int, cy: int):
+        """Biome codes for the CHUNK_SIZE x CHUNK_SIZE chunk at chunk coordinates (cx, cy)"""
+        key = (cx, cy)
+        codes = self._chunk_biomes.get(key)
+        if codes is None:
+            codes = self.biome_grid(cx * CHUNK_SIZE, cy * CHUNK_SIZE, CHUNK_SIZE, CHUNK_SIZE)
+            codes.flags.writeable = False
+            self._chunk_biomes[key] = codes
+            if len(self._chunk_biomes) > CHUNK_CACHE_SIZE:
+                self._chunk_biomes.popitem(last=False)
         else:
-            moist_category = 'dry'
-        
-        return self.BIOME_MATRIX[elev_category][moist_category]
+            self._chunk_biomes.move_to_end(key)
+        return codes
+
+    def biome_at(self, x: int, y: int) -> BiomeType:
+        """Biome of one tile, read from its cached chunk"""
+        codes = self.chunk_biomes(x // CHUNK_SIZE, y // CHUNK_SIZE)
+        return BIOME_CODES[codes[y % CHUNK_SIZE, x % CHUNK_SIZE]]
 
-    def _generate_features(self, biome: BiomeType) -> list:
-        """Generate list of features for the location based on biome"""
+    def features_at(self, x: int, y: int, biome: Optional[BiomeType] = None) -> list:
+        """Features a tile has (or will have once generated), without generating it
+
+        Drawn from seeded per-tile uniforms, the same ones features_grid
+        uses: the count from FEATURE_COUNT_CUM_WEIGHTS, one ordering of
+        that many table rows, then a variant for each chosen row only.
+        """
+        if biome is None:
+            biome = self.biome_at(x, y)
+        table = BIOME_FEATURES.get(biome, ())
+        if not table:
+            return []
+        count = FEATURE_COUNTS[bisect_right(FEATURE_COUNT_CUM_WEIGHTS, self._dither(x, y, SAMPLE_COUNT))]
+        choices = _feature_orderings(len(table), count)
+        indices = choices[int(self._dither(x, y, SAMPLE_ORDERING) * len(choices))]
         features = []
-        feature_chance = random.random()
-        
-        biome_features = {
-            BiomeType.FOREST: [
-                {"type": "tree", "variant": random.choice(["oak", "pine", "birch", "maple", "ancient", "magical", "hollow"])},
-                {"type": "bush", "variant": random.choice(["berry", "flower", "thorny", "healing", "poisonous", "glowing"])},
-                {"type": "mushroom", "variant": random.choice(["red", "brown", "spotted", "giant", "luminous", "medicinal"])},
-                {"type": "landmark", "variant": random.choice(["shrine", "statue", "ruins", "camp", "cave"])},
-                {"type": "creature_nest", "variant": random.choice(["bird", "squirrel", "fox", "owl", "fairy"])},
-                {"type": "resource", "variant": random.choice(["herbs", "fruits", "wood", "flowers", "honey"])}
-            ],
-            BiomeType.MOUNTAIN: [
-                {"type": "rock", "variant": random.choice(["boulder", "cliff", "cave", "arch", "peak", "crystal"])},
-                {"type": "mineral", "variant": random.choice(["crystal", "ore", "gems", "gold", "silver", "diamond"])},
-                {"type": "landmark", "variant": random.choice(["shrine", "mine", "bridge", "watchtower", "tomb"])},
-                {"type": "creature_nest", "variant": random.choice(["eagle", "goat", "dragon", "griffin", "yeti"])},
-                {"type": "weather", "variant": random.choice(["mist", "storm", "snow", "wind", "clear"])},
-                {"type": "path", "variant": random.choice(["steep", "winding", "dangerous", "hidden", "ancient"])}
-            ],
-            BiomeType.PLAINS: [
-                {"type": "grass", "variant": random.choice(["tall", "flowering", "wild", "golden", "magical", "whispering"])},
-                {"type": "creature", "variant": random.choice(["rabbit", "deer", "bird", "unicorn", "wolf", "fairy"])},
-                {"type": "landmark", "variant": random.choice(["well", "stone_circle", "camp", "village", "tower"])},
-                {"type": "water", "variant": random.choice(["stream", "pond", "spring", "oasis", "waterfall"])},
-                {"type": "resource", "variant": random.choice(["herbs", "berries", "flowers", "grain", "cotton"])},
-                {"type": "structure", "variant": random.choice(["fence", "bridge", "signpost", "shelter", "ruins"])}
-            ],
-            BiomeType.DESERT: [
-                {"type": "cactus", "variant": random.choice(["barrel", "saguaro", "prickly", "flowering", "giant", "rare"])},
-                {"type": "dune", "variant": random.choice(["rolling", "steep", "windswept", "shifting", "massive", "golden"])},
-                {"type": "landmark", "variant": random.choice(["oasis", "ruins", "pyramid", "temple", "mirage"])},
-                {"type": "creature_nest", "variant": random.choice(["scorpion", "snake", "lizard", "phoenix", "djinn"])},
-                {"type": "resource", "variant": random.choice(["water", "dates", "minerals", "herbs", "crystals"])},
-                {"type": "structure", "variant": random.choice(["well", "shelter", "camp", "tomb", "trading_post"])}
-            ],
-            BiomeType.SWAMP: [
-                {"type": "water", "variant": random.choice(["pool", "marsh", "bog", "river", "quicksand", "mystic_pool"])},
-                {"type": "vegetation", "variant": random.choice(["vine", "moss", "reed", "mangrove", "mushroom", "willow"])},
-                {"type": "landmark", "variant": random.choice(["hut", "ruins", "altar", "bridge", "statue"])},
-                {"type": "creature_nest", "variant": random.choice(["frog", "snake", "bird", "witch", "spirit"])},
-                {"type": "resource", "variant": random.choice(["herbs", "roots", "fish", "magic_essence", "poison"])},
-                {"type": "atmosphere", "variant": random.choice(["fog", "mist", "glow", "darkness", "whispers"])}
-            ],
-            BiomeType.TUNDRA: [
-                {"type": "ice", "variant": random.choice(["formation", "sheet", "crystal", "cave", "bridge", "sculpture"])},
-                {"type": "rock", "variant": random.choice(["frozen", "snow-covered", "weathered", "crystal", "magical"])},
-                {"type": "landmark", "variant": random.choice(["cave", "shrine", "monolith", "settlement", "beacon"])},
-                {"type": "creature_nest", "variant": random.choice(["penguin", "seal", "bear", "wolf", "frost_giant"])},
-                {"type": "weather", "variant": random.choice(["blizzard", "aurora", "clear", "storm", "whiteout"])},
-                {"type": "resource", "variant": random.choice(["ice_crystal", "fur", "fish", "magic_ice", "minerals"])}
-            ]
-        }
-        
-        # Enhanced feature generation:
-        # 40% chance: 1 feature
-        # 30% chance: 2 features
-        # 20% chance: 3 features
-        # 10% chance: 4 features
-        if feature_chance < 0.4:
-            features.append(random.choice(biome_features.get(biome, [])))
-        elif feature_chance < 0.7:
-            features.extend(random.sample(biome_features.get(biome, []), 2))
-        elif feature_chance < 0.9:
-            features.extend(random.sample(biome_features.get(biome, []), 3))
-        else:
-            features.extend(random.sample(biome_features.get(biome, []), 4))
+        for slot, row in enumerate(indices):
+            feature_type, variants = table[row]
+            variant = variants[int(self._dither(x, y, SAMPLE_VARIANT + slot) * len(variants))]
+            features.append({"type": feature_type, "variant": variant})
         return features
 
-    def _generate_description(self, biome: BiomeType, features: list, weather: WeatherType) -> str:
-        """Generate descriptive text for the location"""
+    def features_grid(self, x0: int, y0: int, codes) -> List[list]:
+        """Features of every tile of a region whose biome codes are `codes`, row by row
+
+        Matches features_at tile for tile. The counts, orderings and variant
+        indices of the whole region are drawn as arrays and looked up in
+        precomputed tables; only building the dicts is done per tile.
+        """
+        np = lazy_import("numpy")
+        from src.utils.noise_generator import hash_uniform
+        orderings, ordering_counts, variant_counts, pair_index, pairs = _sampling_tables()
+        height, width = codes.shape
+        xs = np.arange(x0, x0 + width)[np.newaxis, :]
+        ys = np.arange(y0, y0 + height)[:, np.newaxis]
+        codes = codes.astype(np.int64)
+
+        count_index = np.searchsorted(FEATURE_COUNT_CUM_WEIGHTS, hash_uniform(self.seed, xs, ys, SAMPLE_COUNT),
+                                      side="right")
+        choices = ordering_counts[codes, count_index]
+        ordering = (hash_uniform(self.seed, xs, ys, SAMPLE_ORDERING) * choices).astype(np.int64)
+        slots = []
+        for slot in range(orderings.shape[-1]):
+            rows = orderings[codes, count_index, ordering, slot]
+            chosen = np.maximum(rows, 0)
+            variant = (hash_uniform(self.seed, xs, ys, SAMPLE_VARIANT + slot)
+                       * variant_counts[codes, chosen]).astype(np.int64)
+            slots.append(np.where(rows >= 0, pair_index[codes, chosen, variant], -1))
+        picked = np.stack(slots, axis=-1).reshape(-1, len(slots)).tolist()
+        counts = np.where(choices > 0, np.asarray(FEATURE_COUNTS)[count_index], 0).ravel().tolist()
+        return [
+            [{"type": pairs[i][0], "variant": pairs[i][1]} for i in tile[:count] if i >= 0]
+            for tile, count in zip(picked, counts)
+        ]
+
+    def _generate_description(self, biome: BiomeType, features: list) -> str:
+        """Generate descriptive text for the location; weather is described when observed"""
         base_desc = {
             BiomeType.FOREST: "Dense trees surround you, their branches creating a natural canopy overhead.",
             BiomeType.PLAINS: "Rolling grasslands stretch out before you, swaying gently in the breeze.",
@@ -185,27 +433,61 @@ class WorldGenerator:
                 
         return description
 
-    def generate_location(self, x: int, y: int) -> Tuple[BiomeType, list, str, str]:
-        """Generate a complete location at the given coordinates"""
+    def weather_at(self, x: int, y: int, biome: BiomeType,
+                   hours: Optional[float] = None, elevation: Optional[float] = None) -> WeatherType:
+        """Weather at a tile and game time, read from an (x, y, t) noise field
+
+        Nothing is stored: the same tile and time always give the same weather,
+        and fronts drift smoothly across neighbouring tiles as time passes.
+        """
+        if hours is None:
+            hours = WeatherSystem.game_hours()
+        if elevation is None:
+            elevation = self._get_elevation(x, y)
+        value = self.weather_noise.noise3(
+            (x + self.x_offset) * WEATHER_SPACE_SCALE,
+            (y + self.y_offset) * WEATHER_SPACE_SCALE,
+            hours * WEATHER_TIME_SCALE
+        )
+        return WeatherSystem.weather_from_sample(biome, elevation, WeatherSystem.noise_to_sample(value))
+
+    def generate_region(self, x0: int, y0: int, width: int, height: int) -> List[Tuple[int, int, BiomeType, list, str]]:
+        """(x, y, biome, features, description) of every tile in a rectangle, row by row
+
+        Gives the same tiles as generate_location, with the biomes of the
+        whole rectangle classified in one grid pass and its features sampled
+        in one features_grid pass.
+        """
+        codes = self.biome_grid(x0, y0, width, height)
+        features = iter(self.features_grid(x0, y0, codes))
+        tiles = []
+        for row, y in zip(codes.tolist(), range(y0, y0 + height)):
+            for code, x in zip(row, range(x0, x0 + width)):
+                biome = BIOME_CODES[code]
+                tile_features = next(features)
+                tiles.append((x, y, biome, tile_features, self._generate_description(biome, tile_features)))
+        return tiles
+
+    @metrics.timed("generate_location")
+    def generate_location(self, x: int, y: int) -> Tuple[BiomeType, list, str]:
+        """Generate a complete location at the given coordinates
+
+        Weather is not part of a location: it is evaluated with weather_at
+        only when a tile is observed.
+        """
         biome = self._determine_biome(x, y)
-        elevation = self._get_elevation(x, y)
-        weather = WeatherSystem.get_weather(biome, elevation)
-        features = self._generate_features(biome)
-        description = self._generate_description(biome, features, weather)
-        
-        # Add weather description
-        weather_descriptions = {
-            WeatherType.CLEAR: "The sky is clear and bright.",
-            WeatherType.CLOUDY: "Gray clouds drift overhead.",
-            WeatherType.RAIN: "A steady rain falls from above.",
-            WeatherType.STORM: "Thunder rumbles as storm clouds loom.",
-            WeatherType.SNOW: "Snowflakes drift gently from the sky.",
-            WeatherType.BLIZZARD: "Howling winds drive snow through the air.",
-            WeatherType.SANDSTORM: "Sand whips through the air in stinging clouds.",
-            WeatherType.FOG: "A thick fog limits visibility.",
-            WeatherType.MISTY: "A light mist hangs in the air."
-        }
-        
-        description += f" {weather_descriptions[weather]}"
-        
-        return biome, features, description, weather
+        features = self.features_at(x, y, biome)
+        description = self._generate_description(biome, features)
+        return biome, features, description
+
+    async def generate_location_async(self, x: int, y: int) -> Tuple[BiomeType, list, str]:
+        """Generate a location on the generation pool without blocking the event loop"""
+        return await self.generation_pool.run("generate_location", x, y)
+
+    def generate_locations(self, positions: Sequence[Tuple[int, int]]) -> List[Tuple[BiomeType, list, str]]:
+        """generate_location for each of several positions, in order"""
+        return [self.generate_location(x, y) for x, y in positions]
+
+    async def generate_locations_async(self, positions: Sequence[Tuple[int, int]]) -> List[Tuple[BiomeType, list, str]]:
+        """Generate several locations in one call on the generation pool"""
+        return await self.generation_pool.run("generate_locations", tuple(positions))
@@ -34,17 +34,34 @@ class GameState(models.Model):
 
 class Location(models.Model):
     id = fields.IntField(pk=True)
+    seed = fields.IntField(null=True)  # World the tile belongs to; None on rows stored before seeds were
     x = fields.IntField()
     y = fields.IntField()
     biome_type = fields.CharEnumField(BiomeType)
     description = fields.TextField()
-    features = fields.JSONField()
+    features = fields.JSONField(null=True)  # Only for features outside the vocabulary
+    feature_codes = fields.BinaryField(null=True)  # Vocabulary ids as little-endian uint16s
     weather = fields.CharField(max_length=20, null=True)  # Current weather
     discovered = fields.BooleanField(default=False)
     
     class Meta:
         table = "locations"
-        unique_together = (("x", "y"),)
+        unique_together = (("seed", "x", "y"),)
+
+class LocationOverlay(models.Model):
+    """One game's changes to a shared tile; the locations row itself is never modified"""
+    id = fields.IntField(pk=True)
+    game_state = fields.ForeignKeyField('models.GameState', related_name='overlays')
+    x = fields.IntField()
+    y = fields.IntField()
+    removed_features = fields.JSONField(default=list)  # [[type, variant], ...]
+    feature_conditions = fields.JSONField(default=dict)  # {"type:variant": condition}
+    added_features = fields.JSONField(default=list)  # [[type, variant], ...] that moved here
+    removed_at = fields.JSONField(default=dict)  # {"type:variant": game hour} for features that regrow
+
+    class Meta:
+        table = "location_overlays"
+        unique_together = (("game_state", "x", "y"),)
 
 class Item(models.Model):
     id = fields.IntField(pk=True)
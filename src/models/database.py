@@ -0,0 +1,113 @@
+"""Schema creation plus in-place upgrades of databases made by older versions.
+
+Tortoise's generate_schemas only creates missing tables and never alters
+existing ones. Columns added to existing tables since are added here,
+constraints relaxed since are relaxed here, and unique keys widened since
+are replaced here. Every step checks the current schema first, so running
+it on an up-to-date database does nothing.
+"""
+from typing import Dict, Tuple
+
+# Columns added to existing tables: table -> column -> definition per dialect
+ADDED_COLUMNS: Dict[str, Dict[str, Dict[str, str]]] = {
+    "locations": {
+        "feature_codes": {"sqlite": "BLOB", "postgres": "BYTEA"},
+        # Rows stored before it keep NULL: their world is unknown, so no game reads them
+        "seed": {"sqlite": "INT", "postgres": "INT"}
+    },
+    "location_overlays": {
+        "added_features": {"sqlite": "JSON NOT NULL DEFAULT '[]'", "postgres": "JSONB NOT NULL DEFAULT '[]'"},
+        "removed_at": {"sqlite": "JSON NOT NULL DEFAULT '{}'", "postgres": "JSONB NOT NULL DEFAULT '{}'"}
+    }
+}
+# Columns that used to be NOT NULL: table -> columns
+NULLABLE_COLUMNS: Dict[str, tuple] = {
+    "locations": ("features",)
+}
+# Unique keys that gained columns: table -> (old columns, new columns)
+WIDENED_UNIQUE_KEYS: Dict[str, Tuple[tuple, tuple]] = {
+    "locations": (("x", "y"), ("seed", "x", "y"))
+}
+
+async def init_schema() -> None:
+    """Create missing tables and bring existing ones up to date; Tortoise must be initialized"""
+    from tortoise import Tortoise
+    await Tortoise.generate_schemas()
+    await upgrade_schema(Tortoise.get_connection("default"))
+
+async def _columns(connection, table: str) -> Dict[str, bool]:
+    """Column name -> whether it accepts NULL, empty if the table doesn't exist"""
+    dialect = connection.capabilities.dialect
+    if dialect == "sqlite":
+        rows = await connection.execute_query_dict(f'PRAGMA table_info("{table}")')
+        return {row["name"]: not row["notnull"] for row in rows}
+    if dialect == "postgres":
+        rows = await connection.execute_query_dict(
+            "SELECT column_name, is_nullable FROM information_schema.columns "
+            f"WHERE table_schema = current_schema() AND table_name = '{table}'"
+        )
+        return {row["column_name"]: row["is_nullable"] == "YES" for row in rows}
+    raise RuntimeError(f"Schema upgrades are not implemented for {dialect} databases")
+
+async def _unique_keys(connection, table: str) -> Dict[tuple, str]:
+    """Columns of each unique constraint on a table -> the constraint's name"""
+    if connection.capabilities.dialect == "sqlite":
+        keys = {}
+        for index in await connection.execute_query_dict(f'PRAGMA index_list("{table}")'):
+            if index["unique"]:
+                rows = await connection.execute_query_dict(f'PRAGMA index_info("{index["name"]}")')
+                keys[tuple(row["name"] for row in sorted(rows, key=lambda row: row["seqno"]))] = index["name"]
+        return keys
+    rows = await connection.execute_query_dict(
+        "SELECT con.conname AS name, array_agg(att.attname ORDER BY k.ord) AS columns "
+        "FROM pg_constraint con "
+        "CROSS JOIN LATERAL unnest(con.conkey) WITH ORDINALITY AS k(attnum, ord) "
+        "JOIN pg_attribute att ON att.attrelid = con.conrelid AND att.attnum = k.attnum "
+        f"WHERE con.conrelid = '\"{table}\"'::regclass AND con.contype = 'u' GROUP BY con.conname"
+    )
+    return {tuple(row["columns"]): row["name"] for row in rows}
+
+async def _rebuild_sqlite_table(connection, table: str) -> None:
+    """Recreate a sqlite table from its model, since sqlite can't alter constraints in place"""
+    from tortoise import Tortoise
+    old = f"{table}_old"
+    if not await _columns(connection, old):
+        await connection.execute_script(f'ALTER TABLE "{table}" RENAME TO "{old}"')
+        await Tortoise.generate_schemas()
+    # Also finishes a rebuild that was interrupted after the rename
+    old_columns = await _columns(connection, old)
+    shared = ", ".join(f'"{column}"' for column in await _columns(connection, table) if column in old_columns)
+    await connection.execute_script(
+        f'INSERT OR IGNORE INTO "{table}" ({shared}) SELECT {shared} FROM "{old}"; DROP TABLE "{old}"'
+    )
+
+async def upgrade_schema(connection) -> None:
+    """Apply every pending schema change to an existing database"""
+    dialect = connection.capabilities.dialect
+    for table, added in ADDED_COLUMNS.items():
+        columns = await _columns(connection, table)
+        for column, definitions in added.items():
+            if columns and column not in columns:
+                await connection.execute_script(
+                    f'ALTER TABLE "{table}" ADD COLUMN "{column}" {definitions[dialect]}'
+                )
+    for table in {**NULLABLE_COLUMNS, **WIDENED_UNIQUE_KEYS}:
+        columns = await _columns(connection, table)
+        relaxed = [column for column in NULLABLE_COLUMNS.get(table, ()) if not columns.get(column, True)]
+        old_key = None
+        if table in WIDENED_UNIQUE_KEYS:
+            old_key = (await _unique_keys(connection, table)).get(WIDENED_UNIQUE_KEYS[table][0])
+        if dialect == "sqlite":
+            if relaxed or old_key or await _columns(connection, f"{table}_old"):
+                await _rebuild_sqlite_table(connection, table)
+            continue
+        for column in relaxed:
+            await connection.execute_script(f'ALTER TABLE "{table}" ALTER COLUMN "{column}" DROP NOT NULL')
+        if old_key:
+            new_columns = WIDENED_UNIQUE_KEYS[table][1]
+            name = f"uid_{table}_{'_'.join(new_columns)}"
+            quoted = ", ".join(f'"{column}"' for column in new_columns)
+            await connection.execute_script(
+                f'ALTER TABLE "{table}" DROP CONSTRAINT "{old_key}"; '
+                f'ALTER TABLE "{table}" ADD CONSTRAINT "{name}" UNIQUE ({quoted})'
+            )
@@ -0,0 +1,212 @@
+"""Bulk loot generation from precomputed alias tables.
+
+Each biome has one alias table over every (item type, rarity) pair, so a
+single O(1) draw picks both. Name parts and description words are drawn as
+whole numpy index arrays, giving a LootBatch of compact integer columns.
+Strings and property dicts are only built when a record is read or turned
+into an Item row, and `insert_loot` stores a whole batch with one bulk_create.
+"""
+from typing import Any, Dict, Iterator, List, Sequence, Tuple, Union
+import numpy as np
+from src.models.base import BiomeType, Item, ItemType
+from src.utils.items import (
+    ITEM_NAME_PREFIXES, ITEM_NAME_ROOTS, ITEM_NAME_SUFFIXES,
+    ITEM_DESCRIPTION_TEMPLATES, DESCRIPTION_ATTRIBUTES
+)
+
+# (name, weight, multiplier applied to value, damage, defense and durability)
+RARITIES: Tuple[Tuple[str, float, float], ...] = (
+    ("common", 60.0, 1.0),
+    ("uncommon", 25.0, 1.25),
+    ("rare", 10.0, 1.6),
+    ("epic", 4.0, 2.2),
+    ("legendary", 1.0, 3.0)
+)
+RARITY_NAMES = tuple(name for name, _, _ in RARITIES)
+
+# Item types generated loot can have; keys are only ever placed, never rolled
+LOOT_TYPES = (ItemType.WEAPON, ItemType.ARMOR, ItemType.POTION, ItemType.TOOL, ItemType.TREASURE)
+
+# How common each item type is in each biome's loot
+BIOME_LOOT_WEIGHTS: Dict[BiomeType, Dict[ItemType, float]] = {
+    BiomeType.FOREST: {ItemType.WEAPON: 3, ItemType.ARMOR: 2, ItemType.POTION: 3, ItemType.TOOL: 2, ItemType.TREASURE: 1},
+    BiomeType.PLAINS: {ItemType.WEAPON: 2, ItemType.ARMOR: 2, ItemType.POTION: 2, ItemType.TOOL: 3, ItemType.TREASURE: 2},
+    BiomeType.MOUNTAIN: {ItemType.WEAPON: 2, ItemType.ARMOR: 3, ItemType.POTION: 1, ItemType.TOOL: 3, ItemType.TREASURE: 3},
+    BiomeType.DESERT: {ItemType.WEAPON: 2, ItemType.ARMOR: 1, ItemType.POTION: 2, ItemType.TOOL: 1, ItemType.TREASURE: 4},
+    BiomeType.SWAMP: {ItemType.WEAPON: 1, ItemType.ARMOR: 1, ItemType.POTION: 5, ItemType.TOOL: 2, ItemType.TREASURE: 1},
+    BiomeType.TUNDRA: {ItemType.WEAPON: 3, ItemType.ARMOR: 3, ItemType.POTION: 2, ItemType.TOOL: 2, ItemType.TREASURE: 2}
+}
+
+# Properties of a common item of each type, scaled by the rarity multiplier
+BASE_LOOT_PROPERTIES: Dict[ItemType, Dict[str, Any]] = {
+    ItemType.WEAPON: {"damage": 10, "durability": 60, "value": 30.00},
+    ItemType.ARMOR: {"defense": 8, "durability": 80, "value": 35.00},
+    ItemType.POTION: {"health_restore": 25, "value": 20.00},
+    ItemType.TOOL: {"durability": 40, "value": 15.00},
+    ItemType.TREASURE: {"value": 50.00}
+}
+SCALED_PROPERTIES = ("damage", "defense", "durability", "health_restore")
+
+# Which description word each template slot draws from, in DESCRIPTION_ATTRIBUTES order
+ATTRIBUTE_NAMES = tuple(DESCRIPTION_ATTRIBUTES)
+
+class AliasTable:
+    """Walker/Vose alias table: O(n) to build, O(1) per weighted draw"""
+
+    def __init__(self, weights: Sequence[float]):
+        n = len(weights)
+        total = float(sum(weights))
+        if n == 0 or total <= 0:
+            raise ValueError("Alias table needs at least one positive weight")
+        scaled = [w * n / total for w in weights]
+        self.probability = np.ones(n)
+        self.alias = np.arange(n)
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.probability[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        # Whatever is left is 1 up to rounding error and keeps probability 1
+
+    def sample(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        """`n` indices drawn with the table's weights"""
+        column = rng.integers(len(self.alias), size=n)
+        keep = rng.random(n) < self.probability[column]
+        return np.where(keep, column, self.alias[column])
+
+def _scale_properties(base: Dict[str, Any], multiplier: float) -> Dict[str, Any]:
+    properties = dict(base)
+    if "value" in properties:
+        properties["value"] = round(properties["value"] * multiplier, 2)
+    for key in SCALED_PROPERTIES:
+        if key in properties:
+            properties[key] = round(properties[key] * multiplier)
+    return properties
+
+# Every (type, rarity) outcome in the order the alias tables index it
+OUTCOMES: Tuple[Tuple[int, int], ...] = tuple(
+    (t, r) for t in range(len(LOOT_TYPES)) for r in range(len(RARITIES))
+)
+OUTCOME_TYPE = np.array([t for t, _ in OUTCOMES], dtype=np.int8)
+OUTCOME_RARITY = np.array([r for _, r in OUTCOMES], dtype=np.int8)
+
+# Scaled properties per (type, rarity), computed once and copied per Item row
+LOOT_PROPERTIES: Tuple[Tuple[Dict[str, Any], ...], ...] = tuple(
+    tuple(_scale_properties(BASE_LOOT_PROPERTIES[item_type], multiplier) for _, _, multiplier in RARITIES)
+    for item_type in LOOT_TYPES
+)
+
+ROOT_COUNTS = np.array([len(ITEM_NAME_ROOTS[item_type]) for item_type in LOOT_TYPES])
+ATTRIBUTE_COUNTS = np.array([len(DESCRIPTION_ATTRIBUTES[name]) for name in ATTRIBUTE_NAMES])
+
+_alias_tables: Dict[BiomeType, AliasTable] = {}
+
+def loot_table(biome: BiomeType) -> AliasTable:
+    """Alias table over (type, rarity) outcomes for a biome, built on first use"""
+    table = _alias_tables.get(biome)
+    if table is None:
+        type_weights = BIOME_LOOT_WEIGHTS[biome]
+        table = _alias_tables[biome] = AliasTable([
+            type_weights.get(LOOT_TYPES[t], 0.0) * RARITIES[r][1] for t, r in OUTCOMES
+        ])
+    return table
+
+class LootBatch:
+    """Columns of small integer codes describing `len(batch)` generated items"""
+
+    def __init__(self, item_type: np.ndarray, rarity: np.ndarray, prefix: np.ndarray, root: np.ndarray,
+                 suffix: np.ndarray, template: np.ndarray, attributes: np.ndarray):
+        self.item_type = item_type  # Index into LOOT_TYPES
+        self.rarity = rarity  # Index into RARITIES
+        self.prefix = prefix
+        self.root = root  # Index into ITEM_NAME_ROOTS of the item's type
+        self.suffix = suffix
+        self.template = template
+        self.attributes = attributes  # (n, len(ATTRIBUTE_NAMES)) word indices
+
+    def __len__(self) -> int:
+        return len(self.item_type)
+
+    def name(self, i: int) -> str:
+        item_type = LOOT_TYPES[self.item_type[i]]
+        return (f"{ITEM_NAME_PREFIXES[self.prefix[i]]} {ITEM_NAME_ROOTS[item_type][self.root[i]]} "
+                f"{ITEM_NAME_SUFFIXES[self.suffix[i]]}")
+
+    def description(self, i: int) -> str:
+        words = {
+            name: DESCRIPTION_ATTRIBUTES[name][index]
+            for name, index in zip(ATTRIBUTE_NAMES, self.attributes[i].tolist())
+        }
+        return ITEM_DESCRIPTION_TEMPLATES[self.template[i]].format(
+            rarity=RARITY_NAMES[self.rarity[i]], item_type=LOOT_TYPES[self.item_type[i]].value, **words
+        )
+
+    def properties(self, i: int) -> Dict[str, Any]:
+        """A fresh copy of the item's properties, safe to mutate"""
+        return dict(LOOT_PROPERTIES[self.item_type[i]][self.rarity[i]])
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        """Each item as a plain dict, shaped like GameManager.get_inventory entries"""
+        # Columns become lists once; indexing numpy scalars per row is several times slower
+        columns = zip(
+            self.item_type.tolist(), self.rarity.tolist(), self.prefix.tolist(), self.root.tolist(),
+            self.suffix.tolist(), self.template.tolist(), self.attributes.tolist()
+        )
+        word_lists = [DESCRIPTION_ATTRIBUTES[name] for name in ATTRIBUTE_NAMES]
+        for item_type, rarity, prefix, root, suffix, template, attributes in columns:
+            loot_type = LOOT_TYPES[item_type]
+            words = {name: words[index] for name, words, index in zip(ATTRIBUTE_NAMES, word_lists, attributes)}
+            yield {
+                "name": f"{ITEM_NAME_PREFIXES[prefix]} {ITEM_NAME_ROOTS[loot_type][root]} {ITEM_NAME_SUFFIXES[suffix]}",
+                "type": loot_type,
+                "rarity": RARITY_NAMES[rarity],
+                "description": ITEM_DESCRIPTION_TEMPLATES[template].format(
+                    rarity=RARITY_NAMES[rarity], item_type=loot_type.value, **words
+                ),
+                "properties": dict(LOOT_PROPERTIES[item_type][rarity])
+            }
+
+    def to_items(self, game_state) -> List[Item]:
+        """Unsaved Item rows for every record, owned by `game_state`"""
+        return [
+            Item(
+                name=record["name"],
+                item_type=record["type"],
+                description=record["description"],
+                properties=record["properties"],
+                game_state=game_state
+            )
+            for record in self.records()
+        ]
+
+def generate_loot(biome: BiomeType, n: int,
+                  rng: Union[np.random.Generator, int, None] = None) -> LootBatch:
+    """Roll `n` items of loot for a biome in one vectorized pass"""
+    if not isinstance(rng, np.random.Generator):
+        rng = np.random.default_rng(rng)
+    outcome = loot_table(biome).sample(rng, n)
+    item_type = OUTCOME_TYPE[outcome]
+    # Uniform picks from lists of different lengths per row
+    root = (rng.random(n) * ROOT_COUNTS[item_type]).astype(np.int16)
+    attributes = (rng.random((n, len(ATTRIBUTE_NAMES))) * ATTRIBUTE_COUNTS).astype(np.int8)
+    return LootBatch(
+        item_type=item_type,
+        rarity=OUTCOME_RARITY[outcome],
+        prefix=rng.integers(len(ITEM_NAME_PREFIXES), size=n, dtype=np.int16),
+        root=root,
+        suffix=rng.integers(len(ITEM_NAME_SUFFIXES), size=n, dtype=np.int16),
+        template=rng.integers(len(ITEM_DESCRIPTION_TEMPLATES), size=n, dtype=np.int8),
+        attributes=attributes
+    )
+
+async def insert_loot(batch: LootBatch, game_state, using_db=None) -> List[Item]:
+    """Store a batch as Item rows with a single bulk_create"""
+    from src.utils import metrics
+    items = batch.to_items(game_state)
+    if items:
+        metrics.count_query("write")
+        await Item.bulk_create(items, using_db=using_db)
+    return items
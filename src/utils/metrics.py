@@ -0,0 +1,204 @@
+import functools
+import inspect
+import json
+import os
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Optional
+
+# Metrics are switched on by environment variable before the game modules are
+# imported. When disabled, `timed` hands back the undecorated function, so the
+# instrumented hot paths pay nothing.
+ENABLED = os.getenv("PTHFNDR_METRICS", "").lower() in ("1", "true", "yes")
+
+# Latency bucket upper bounds in seconds (Prometheus style, +Inf implied)
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5
+)
+
+# Bucket upper bounds for per-turn query counts
+QUERY_BUCKETS = (0, 1, 2, 3, 4, 6, 8, 12, 16, 32)
+
+class Histogram:
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Record a single observation"""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Cumulative bucket counts plus sum and count"""
+        cumulative = 0
+        buckets = {}
+        for bound, bucket_count in zip(self.buckets + ("+Inf",), self.counts):
+            cumulative += bucket_count
+            buckets[str(bound)] = cumulative
+        return {"buckets": buckets, "sum": self.total, "count": self.count}
+
+class MetricsRegistry:
+    def __init__(self):
+        self.latencies: Dict[str, Histogram] = {}
+        self.counters: Dict[str, int] = {}
+        self.cache_hits: Dict[str, int] = {}
+        self.cache_misses: Dict[str, int] = {}
+        self.queries_per_turn = Histogram(QUERY_BUCKETS)
+        self.turn_queries = 0
+
+    def observe_latency(self, name: str, seconds: float) -> None:
+        """Record how long one call to `name` took"""
+        histogram = self.latencies.get(name)
+        if histogram is None:
+            histogram = self.latencies[name] = Histogram(LATENCY_BUCKETS)
+        histogram.observe(seconds)
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        """Bump a named counter"""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def count_query(self, kind: str = "read") -> None:
+        """Count one database round trip against the current turn"""
+        self.turn_queries += 1
+        self.increment(f"db_queries_{kind}")
+
+    def end_turn(self, queries: Optional[int] = None) -> None:
+        """Close out a turn; `queries` overrides the process-wide tally when the caller counted its own"""
+        self.queries_per_turn.observe(self.turn_queries if queries is None else queries)
+        self.turn_queries = 0
+        self.increment("turns")
+
+    def cache_hit(self, cache: str) -> None:
+        """Record a lookup in `cache` that was served from it"""
+        self.cache_hits[cache] = self.cache_hits.get(cache, 0) + 1
+
+    def cache_miss(self, cache: str) -> None:
+        """Record a lookup in `cache` that had to fall through"""
+        self.cache_misses[cache] = self.cache_misses.get(cache, 0) + 1
+
+    def hit_rate(self, cache: str) -> float:
+        """Fraction of lookups in `cache` that were hits"""
+        hits = self.cache_hits.get(cache, 0)
+        total = hits + self.cache_misses.get(cache, 0)
+        return hits / total if total else 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-serializable view of everything recorded so far"""
+        caches = sorted(set(self.cache_hits) | set(self.cache_misses))
+        return {
+            "latency_seconds": {name: h.to_dict() for name, h in self.latencies.items()},
+            "counters": dict(self.counters),
+            "db_queries_per_turn": self.queries_per_turn.to_dict(),
+            "caches": {
+                name: {
+                    "hits": self.cache_hits.get(name, 0),
+                    "misses": self.cache_misses.get(name, 0),
+                    "hit_rate": self.hit_rate(name)
+                }
+                for name in caches
+            }
+        }
+
+    def to_prometheus(self) -> str:
+        """Render metrics in the Prometheus text exposition format"""
+        lines = []
+
+        def histogram_lines(metric: str, histogram: Histogram, labels: str = "") -> None:
+            data = histogram.to_dict()
+            sep = "," if labels else ""
+            for bound, count in data["buckets"].items():
+                lines.append(f'{metric}_bucket{{{labels}{sep}le="{bound}"}} {count}')
+            label_block = f"{{{labels}}}" if labels else ""
+            lines.append(f"{metric}_sum{label_block} {data['sum']}")
+            lines.append(f"{metric}_count{label_block} {data['count']}")
+
+        lines.append("# HELP pthfndr_call_latency_seconds Latency of instrumented calls")
+        lines.append("# TYPE pthfndr_call_latency_seconds histogram")
+        for name, histogram in sorted(self.latencies.items()):
+            histogram_lines("pthfndr_call_latency_seconds", histogram, f'call="{name}"')
+
+        lines.append("# HELP pthfndr_db_queries_per_turn Database round trips per turn")
+        lines.append("# TYPE pthfndr_db_queries_per_turn histogram")
+        histogram_lines("pthfndr_db_queries_per_turn", self.queries_per_turn)
+
+        lines.append("# TYPE pthfndr_events_total counter")
+        for name, value in sorted(self.counters.items()):
+            lines.append(f'pthfndr_events_total{{event="{name}"}} {value}')
+
+        lines.append("# TYPE pthfndr_cache_lookups_total counter")
+        for name in sorted(set(self.cache_hits) | set(self.cache_misses)):
+            lines.append(f'pthfndr_cache_lookups_total{{cache="{name}",result="hit"}} {self.cache_hits.get(name, 0)}')
+            lines.append(f'pthfndr_cache_lookups_total{{cache="{name}",result="miss"}} {self.cache_misses.get(name, 0)}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, path: str) -> None:
+        """Write a Prometheus text file (.prom/.txt) or a JSON snapshot (anything else)"""
+        if path.endswith((".prom", ".txt")):
+            content = self.to_prometheus()
+        else:
+            content = json.dumps(self.snapshot(), indent=2)
+        with open(path, "w") as f:
+            f.write(content)
+
+# Process-wide registry used by the instrumented modules
+METRICS = MetricsRegistry()
+
+def timed(name: str) -> Callable:
+    """Decorator recording call latency under `name`; a no-op when metrics are disabled"""
+    def decorator(func: Callable) -> Callable:
+        if not ENABLED:
+            return func
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    METRICS.observe_latency(name, time.perf_counter() - start)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                METRICS.observe_latency(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+def increment(name: str, amount: int = 1) -> None:
+    """Bump a named counter if metrics are enabled"""
+    if ENABLED:
+        METRICS.increment(name, amount)
+
+def count_query(kind: str = "read") -> None:
+    """Count a database round trip if metrics are enabled"""
+    if ENABLED:
+        METRICS.count_query(kind)
+
+def cache_lookup(cache: str, hit: bool) -> None:
+    """Record a cache hit or miss if metrics are enabled"""
+    if ENABLED:
+        if hit:
+            METRICS.cache_hit(cache)
+        else:
+            METRICS.cache_miss(cache)
+
+def end_turn(queries: Optional[int] = None) -> None:
+    """Mark the end of a player turn if metrics are enabled"""
+    if ENABLED:
+        METRICS.end_turn(queries)
+
+def export_metrics(path: Optional[str] = None) -> None:
+    """Export to `path` or PTHFNDR_METRICS_PATH if metrics are enabled"""
+    path = path or os.getenv("PTHFNDR_METRICS_PATH")
+    if ENABLED and path:
+        METRICS.export(path)
@@ -0,0 +1,220 @@
+"""Vectorized 2D OpenSimplex noise.
+
+opensimplex only vectorizes through numba, and without numba its array
+functions fall back to a Python loop per point. This module reimplements
+the same 2D algorithm with whole-array NumPy operations, so a region or
+chunk of tiles is evaluated in a few dozen array passes. For a given seed
+the values match OpenSimplex(seed).noise2 to floating point precision.
+"""
+from functools import lru_cache
+import numpy as np
+
+STRETCH_CONSTANT2 = -0.211324865405187  # (1/sqrt(2+1)-1)/2
+SQUISH_CONSTANT2 = 0.366025403784439  # (sqrt(2+1)-1)/2
+NORM_CONSTANT2 = 47
+
+GRADIENTS2 = np.array([5, 2, 2, 5, -5, 2, -2, 5, 5, -2, 2, -5, -5, -2, -2, -5], dtype=np.float64)
+
+def _overflow(value: int) -> int:
+    """Wrap an integer to signed 64 bits"""
+    value &= 0xFFFFFFFFFFFFFFFF
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+@lru_cache(maxsize=64)
+def permutation(seed: int) -> np.ndarray:
+    """Permutation table OpenSimplex(seed) uses internally"""
+    perm = np.zeros(256, dtype=np.int64)
+    source = list(range(256))
+    seed = _overflow(seed * 6364136223846793005 + 1442695040888963407)
+    seed = _overflow(seed * 6364136223846793005 + 1442695040888963407)
+    seed = _overflow(seed * 6364136223846793005 + 1442695040888963407)
+    for i in range(255, -1, -1):
+        seed = _overflow(seed * 6364136223846793005 + 1442695040888963407)
+        r = int((seed + 31) % (i + 1))
+        if r < 0:
+            r += i + 1
+        perm[i] = source[r]
+        source[r] = source[i]
+    perm.flags.writeable = False
+    return perm
+
+# Lattice hashes are tabulated for x & 0xFF and y & 0xFF padded by one cell
+# below and two above, so every vertex offset in -1..2 is a plain index add
+TABLE_PAD = 1
+TABLE_SIDE = 256 + 3
+
+@lru_cache(maxsize=64)
+def gradient_tables(seed: int):
+    """Gradient components for every padded (x, y) lattice cell, flattened"""
+    perm = permutation(seed)
+    cells = (np.arange(TABLE_SIDE) - TABLE_PAD) & 0xFF
+    index = perm[(perm[cells][:, np.newaxis] + cells[np.newaxis, :]) & 0xFF] & 0x0E
+    grad_x = GRADIENTS2[index].ravel()
+    grad_y = GRADIENTS2[index + 1].ravel()
+    grad_x.flags.writeable = False
+    grad_y.flags.writeable = False
+    return grad_x, grad_y
+
+# The six lattice offsets the extra vertex can take, by region code:
+# lower triangle (1,-1), (-1,1), (1,1); upper triangle (2,0), (0,2), (0,0)
+EXTRA_OFFSETS = ((1, -1), (-1, 1), (1, 1), (2, 0), (0, 2), (0, 0))
+EXTRA_X = np.array([ox for ox, _ in EXTRA_OFFSETS], dtype=np.float64)
+EXTRA_Y = np.array([oy for _, oy in EXTRA_OFFSETS], dtype=np.float64)
+EXTRA_SQUISH = np.array([(ox + oy) * SQUISH_CONSTANT2 for ox, oy in EXTRA_OFFSETS])
+EXTRA_CELL = np.array([ox * TABLE_SIDE + oy for ox, oy in EXTRA_OFFSETS], dtype=np.intp)
+
+def _contribution(grad_x: np.ndarray, grad_y: np.ndarray, cell: np.ndarray,
+                  dx: np.ndarray, dy: np.ndarray) -> np.ndarray:
+    """Attenuated gradient contribution of the vertex at `cell` displaced by (dx, dy)"""
+    attn = dx * dx
+    np.subtract(2, attn, out=attn)
+    attn -= dy * dy
+    np.maximum(attn, 0, out=attn)
+    attn *= attn
+    attn *= attn
+    dot = grad_x.take(cell)
+    dot *= dx
+    dy *= grad_y.take(cell)
+    dot += dy
+    attn *= dot
+    return attn
+
+def _vertex(grad_x: np.ndarray, grad_y: np.ndarray, base: np.ndarray,
+            dx0: np.ndarray, dy0: np.ndarray, ox: int, oy: int) -> np.ndarray:
+    """Contribution of the lattice vertex at a fixed offset (ox, oy) from the cell origin"""
+    squish = (ox + oy) * SQUISH_CONSTANT2
+    dx = dx0 - ox
+    dx -= squish
+    dy = dy0 - oy
+    dy -= squish
+    return _contribution(grad_x, grad_y, base + (ox * TABLE_SIDE + oy), dx, dy)
+
+# Points evaluated per pass; keeps each temporary below glibc's 128 KiB mmap
+# threshold so blocks reuse heap memory instead of faulting in fresh pages
+BLOCK_SIZE = 8192
+
+def noise2(seed: int, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """2D OpenSimplex noise at broadcastable coordinate arrays x and y"""
+    grad_x, grad_y = gradient_tables(seed)
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64))
+    flat_x = x.ravel()
+    flat_y = y.ravel()
+    out = np.empty(flat_x.size, dtype=np.float64)
+    for start in range(0, flat_x.size, BLOCK_SIZE):
+        stop = start + BLOCK_SIZE
+        out[start:stop] = _noise2_block(grad_x, grad_y, flat_x[start:stop], flat_y[start:stop])
+    return out.reshape(x.shape)
+
+def _noise2_block(grad_x: np.ndarray, grad_y: np.ndarray, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Evaluate noise for 1-D coordinate arrays
+
+    Every floating point operation happens in the same order as the scalar
+    implementation, so results are bit-for-bit identical.
+    """
+
+    # Place input coordinates onto grid
+    stretch_offset = x + y
+    stretch_offset *= STRETCH_CONSTANT2
+    xs = x + stretch_offset
+    ys = y + stretch_offset
+
+    # Rhombus super-cell origin and position within it
+    xsb = np.floor(xs)
+    ysb = np.floor(ys)
+    squish_offset = xsb + ysb
+    squish_offset *= SQUISH_CONSTANT2
+    xins = xs - xsb
+    yins = ys - ysb
+    in_sum = xins + yins
+    dx0 = x - (xsb + squish_offset)
+    dy0 = y - (ysb + squish_offset)
+    base = (xsb.astype(np.intp) & 0xFF) + TABLE_PAD
+    base *= TABLE_SIDE
+    base += (ysb.astype(np.intp) & 0xFF) + TABLE_PAD
+
+    # Contributions (1,0) and (0,1)
+    value = _vertex(grad_x, grad_y, base, dx0, dy0, 1, 0)
+    value += _vertex(grad_x, grad_y, base, dx0, dy0, 0, 1)
+
+    # Contribution (0,0) in the lower triangle or (1,1) in the upper one
+    upper = in_sum > 1
+    both = upper.astype(np.intp)
+    squish = both * (2 * SQUISH_CONSTANT2)
+    dx = dx0 - both
+    dx -= squish
+    dy = dy0 - both
+    dy -= squish
+    both *= TABLE_SIDE + 1
+    both += base
+    value += _contribution(grad_x, grad_y, both, dx, dy)
+
+    # Extra vertex: in the lower triangle (1,-1)/(-1,1) when (0,0) is among the
+    # closest two vertices, else (1,1); in the upper triangle (2,0)/(0,2) when
+    # (1,1) is among the closest two, else (0,0)
+    zins = np.subtract(2, in_sum, out=in_sum, where=upper)
+    np.subtract(1, in_sum, out=zins, where=~upper)
+    near = np.where(upper, zins < np.maximum(xins, yins), zins > np.minimum(xins, yins))
+    region = upper.astype(np.intp)
+    region *= 3
+    region += np.where(near, xins <= yins, 2)
+    dx = dx0 - EXTRA_X.take(region)
+    dx -= EXTRA_SQUISH.take(region)
+    dy = dy0 - EXTRA_Y.take(region)
+    dy -= EXTRA_SQUISH.take(region)
+    value += _contribution(grad_x, grad_y, base + EXTRA_CELL.take(region), dx, dy)
+    value /= NORM_CONSTANT2
+    return value
+
+def noise2_grid(seed: int, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    """Noise over the grid xs × ys, shaped (len(ys), len(xs)) like noise2array"""
+    return octave_noise2_grid(seed, xs, ys, (1.0,), (1.0,))
+
+def octave_noise2_grid(seed: int, xs: np.ndarray, ys: np.ndarray,
+                       scales, weights) -> np.ndarray:
+    """Weighted sum of noise octaves over the grid xs × ys, shaped (len(ys), len(xs))
+
+    Octave k samples (xs * scales[k], ys * scales[k]). Rows are processed a
+    block at a time and every octave is accumulated while the block is hot.
+    """
+    grad_x, grad_y = gradient_tables(seed)
+    xs = np.asarray(xs, dtype=np.float64)
+    ys = np.asarray(ys, dtype=np.float64)
+    out = np.empty((ys.size, xs.size), dtype=np.float64)
+    rows = max(1, BLOCK_SIZE // max(1, xs.size))
+    for start in range(0, ys.size, rows):
+        block_ys = ys[start:start + rows]
+        block_x = np.tile(xs, block_ys.size)
+        block_y = np.repeat(block_ys, xs.size)
+        total = np.zeros(block_x.size, dtype=np.float64)
+        for scale, weight in zip(scales, weights):
+            total += weight * _noise2_block(grad_x, grad_y, block_x * scale, block_y * scale)
+        out[start:start + rows] = total.reshape(block_ys.size, xs.size)
+    return out
+
+_MASK64 = 0xFFFFFFFFFFFFFFFF
+_HASH_SEED = 0x9E3779B97F4A7C15
+_HASH_X = 0xC2B2AE3D27D4EB4F
+_HASH_Y = 0x165667B19E3779F9
+_HASH_SALT = 0x27D4EB2F165667C5
+
+def hash_uniform(seed: int, x, y, salt: int = 0) -> np.ndarray:
+    """Deterministic per-tile uniforms in [0, 1) from a splitmix64 hash of (seed, x, y, salt)"""
+    x = np.asarray(x, dtype=np.int64).astype(np.uint64)
+    y = np.asarray(y, dtype=np.int64).astype(np.uint64)
+    base = np.uint64(((seed * _HASH_SEED) ^ (salt * _HASH_SALT)) & _MASK64)
+    with np.errstate(over="ignore"):
+        key = base ^ (x * np.uint64(_HASH_X)) ^ (y * np.uint64(_HASH_Y))
+        key = (key ^ (key >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        key = (key ^ (key >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        key = key ^ (key >> np.uint64(31))
+    return (key >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+
+def hash_uniform_scalar(seed: int, x: int, y: int, salt: int = 0) -> float:
+    """Scalar twin of hash_uniform for a single tile"""
+    key = ((seed * _HASH_SEED) ^ (salt * _HASH_SALT)) & _MASK64
+    key ^= (x * _HASH_X) & _MASK64
+    key ^= (y * _HASH_Y) & _MASK64
+    key = ((key ^ (key >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    key = ((key ^ (key >> 27)) * 0x94D049BB133111EB) & _MASK64
+    key ^= key >> 31
+    return (key >> 11) * (1.0 / (1 << 53))
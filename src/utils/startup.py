@@ -0,0 +1,55 @@
+import importlib
+import sys
+import time
+from contextlib import contextmanager
+from types import ModuleType
+from typing import Dict, Iterator
+
+# Wall-clock seconds spent importing each lazily loaded module
+IMPORT_TIMES: Dict[str, float] = {}
+
+# Wall-clock seconds spent in each named startup phase
+PHASE_TIMES: Dict[str, float] = {}
+
+_PROCESS_START = time.perf_counter()
+
+def lazy_import(module_name: str) -> ModuleType:
+    """Import a module on first use and record how long the import took"""
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    IMPORT_TIMES.setdefault(module_name, time.perf_counter() - start)
+    return module
+
+@contextmanager
+def startup_phase(name: str) -> Iterator[None]:
+    """Time a named startup phase such as database init or world warm-up"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        PHASE_TIMES[name] = PHASE_TIMES.get(name, 0.0) + time.perf_counter() - start
+
+def format_startup_report() -> str:
+    """Format recorded import and phase timings as a plain-text table"""
+    lines = ["Startup report", "--------------"]
+    lines.append("Lazy imports:")
+    if IMPORT_TIMES:
+        for name, seconds in sorted(IMPORT_TIMES.items(), key=lambda kv: -kv[1]):
+            lines.append(f"  {name:<32} {seconds * 1000:8.1f} ms")
+    else:
+        lines.append("  (none)")
+
+    lines.append("Phases:")
+    if PHASE_TIMES:
+        for name, seconds in PHASE_TIMES.items():
+            lines.append(f"  {name:<32} {seconds * 1000:8.1f} ms")
+    else:
+        lines.append("  (none)")
+
+    elapsed = time.perf_counter() - _PROCESS_START
+    lines.append(f"Elapsed since launch: {elapsed * 1000:.1f} ms")
+    return "\n".join(lines)
@@ -0,0 +1,16 @@
+import os
+
+# Games made by tests must not write journals into the project directory
+os.environ.setdefault("PTHFNDR_JOURNAL_DIR", "")
+
+import pytest
+
+@pytest.fixture
+async def database():
+    """Fresh in-memory sqlite database with the current schema"""
+    from tortoise import Tortoise
+    from src.models.database import init_schema
+    await Tortoise.init(db_url="sqlite://:memory:", modules={"models": ["src.models.base"]})
+    await init_schema()
+    yield
+    await Tortoise.close_connections()
@@ -0,0 +1,76 @@
+import random
+import numpy as np
+import pytest
+from src.core.biome_table import BiomeTable, DEFAULT_BIOME_TABLE
+from src.core.world import BIOME_CODES, BIOME_INDEX, WorldGenerator
+from src.models.base import BiomeType
+
+# The thresholds and matrix the table replaced
+MATRIX = {
+    "high": {"wet": BiomeType.MOUNTAIN, "medium": BiomeType.MOUNTAIN, "dry": BiomeType.DESERT},
+    "medium": {"wet": BiomeType.SWAMP, "medium": BiomeType.FOREST, "dry": BiomeType.PLAINS},
+    "low": {"wet": BiomeType.SWAMP, "medium": BiomeType.PLAINS, "dry": BiomeType.TUNDRA}
+}
+
+def original_biome(elevation: float, moisture: float, elevation_dither: float, moisture_dither: float) -> BiomeType:
+    if elevation > 0.4:
+        elev_category = 'high'
+    elif elevation > 0.1:
+        elev_category = 'medium'
+    elif elevation > -0.2:
+        elev_category = 'medium' if elevation_dither > 0.3 else 'low'
+    else:
+        elev_category = 'low'
+
+    if moisture > 0.3:
+        moist_category = 'wet'
+    elif moisture > 0:
+        moist_category = 'medium'
+    elif moisture > -0.3:
+        moist_category = 'medium' if moisture_dither > 0.3 else 'dry'
+    else:
+        moist_category = 'dry'
+    return MATRIX[elev_category][moist_category]
+
+def _samples(n: int = 20000):
+    rng = random.Random(3)
+    edges = (-0.3, -0.2, 0.0, 0.1, 0.3, 0.4)
+    for _ in range(n):
+        # Land exactly on an edge or threshold now and then
+        elevation = rng.choice(edges) if rng.random() < 0.1 else rng.uniform(-1.2, 1.2)
+        moisture = rng.choice(edges) if rng.random() < 0.1 else rng.uniform(-1.2, 1.2)
+        yield elevation, moisture, rng.choice((0.3, rng.random())), rng.choice((0.3, rng.random()))
+
+def test_default_table_matches_original_thresholds():
+    table = BiomeTable(DEFAULT_BIOME_TABLE)
+    for elevation, moisture, e_dither, m_dither in _samples():
+        code = table.classify(elevation, moisture, lambda: e_dither, lambda: m_dither)
+        assert BIOME_CODES[code] == original_biome(elevation, moisture, e_dither, m_dither)
+
+def test_classify_grid_matches_classify():
+    table = BiomeTable()
+    samples = np.array(list(_samples(5000)))
+    codes = table.classify_grid(*samples.T)
+    for (elevation, moisture, e_dither, m_dither), code in zip(samples.tolist(), codes.tolist()):
+        assert code == table.classify(elevation, moisture, lambda: e_dither, lambda: m_dither)
+
+def test_biome_grid_matches_determine_biome():
+    world = WorldGenerator(seed=2024)
+    codes = world.biome_grid(-40, 10, 48, 40)
+    for row, y in enumerate(range(10, 50)):
+        for column, x in enumerate(range(-40, 8)):
+            biome = world._determine_biome(x, y)
+            assert BIOME_CODES[codes[row, column]] == biome
+            assert world.biome_at(x, y) == biome
+
+def test_custom_table_changes_biomes():
+    config = {**DEFAULT_BIOME_TABLE, "matrix": {
+        category: {moisture: "DESERT" for moisture in row} for category, row in DEFAULT_BIOME_TABLE["matrix"].items()
+    }}
+    world = WorldGenerator(seed=2024, biome_table=config)
+    assert (world.biome_grid(0, 0, 16, 16) == BIOME_INDEX[BiomeType.DESERT]).all()
+
+def test_table_rejects_mismatched_bands():
+    config = {**DEFAULT_BIOME_TABLE, "elevation": {"edges": [0.0], "bands": ["low"]}}
+    with pytest.raises(ValueError):
+        BiomeTable(config)
@@ -0,0 +1,132 @@
+import json
+import os
+from types import SimpleNamespace
+import pytest
+import src.core.journal as journal
+from src.core.game_manager import GameManager
+from src.core.journal import ActionJournal, SNAPSHOT_INTERVAL, read_records, replay, replay_position
+from src.models.base import BiomeType, GameState
+
+def _state(x: int = 0, y: int = 0) -> SimpleNamespace:
+    return SimpleNamespace(current_position={"x": x, "y": y}, current_biome=BiomeType.PLAINS,
+                           health=100, weather="clear")
+
+def _move(direction: str):
+    return "move", {"direction": direction, "distance": 100}
+
+def test_load_returns_the_last_snapshot_and_the_actions_after_it(tmp_path):
+    writer = ActionJournal(7, 42, "/data/game.db", str(tmp_path))
+    writer.begin(_state())
+    for direction in ("north", "north", "east"):
+        writer.record_action(*_move(direction))
+    writer.record_snapshot(_state(1, 2))
+    for direction in ("south", "west"):
+        writer.record_action(*_move(direction))
+    writer.close()
+
+    reader = ActionJournal(7, 42, "/data/game.db", str(tmp_path))
+    snapshot, tail = reader.load()
+    assert reader.trusted
+    assert reader.seq == 5
+    assert snapshot["position"] == {"x": 1, "y": 2}
+    assert [record["params"]["direction"] for record in tail] == ["south", "west"]
+    assert replay_position(snapshot["position"], tail) == {"x": 0, "y": 1}
+
+def test_a_torn_final_line_is_skipped(tmp_path):
+    writer = ActionJournal(1, 5, ":memory:", str(tmp_path))
+    writer.begin(_state())
+    writer.record_action(*_move("north"))
+    writer.close()
+    with open(writer.path, "a", encoding="utf-8") as f:
+        f.write('{"seq": 2, "type": "mo')
+    snapshot, tail = ActionJournal(1, 5, ":memory:", str(tmp_path)).load()
+    assert snapshot is not None and len(tail) == 1
+
+def test_journals_are_kept_apart_per_database(tmp_path):
+    first = ActionJournal(1, 5, "/data/a.db", str(tmp_path))
+    second = ActionJournal(1, 5, "/data/b.db", str(tmp_path))
+    assert first.path != second.path
+    first.begin(_state())
+    first.close()
+    assert second.load() == (None, [])
+
+def test_a_journal_from_another_database_is_not_trusted(tmp_path):
+    writer = ActionJournal(1, 5, "/data/a.db", str(tmp_path))
+    writer.begin(_state())
+    writer.record_action(*_move("north"))
+    writer.close()
+    # Same file, but the header names another database, e.g. after the old one was moved away
+    header = json.loads(open(writer.path, encoding="utf-8").readline())
+    assert header["database"] == "/data/a.db"
+    reader = ActionJournal(1, 5, "/data/b.db", str(tmp_path))
+    reader.path = writer.path
+    assert reader.load() == (None, [])
+    assert not reader.trusted
+    # Or names another seed
+    assert ActionJournal(1, 6, "/data/a.db", str(tmp_path)).load() == (None, [])
+
+@pytest.fixture
+def journal_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(journal, "JOURNAL_DIR", str(tmp_path))
+    return tmp_path
+
+async def _play(game_manager: GameManager, directions) -> None:
+    for direction in directions:
+        async with game_manager.turn():
+            await game_manager.process_action(*_move(direction))
+
+async def test_load_game_replays_moves_since_the_last_snapshot(database, journal_dir):
+    game_manager = GameManager(seed=5, share_world=False)
+    state = await game_manager.new_game()
+    await _play(game_manager, ["north", "north", "east"])
+    game_manager.journal.close()
+    # Only the journal knows about the moves; the row still holds the start
+    assert (await GameState.get(id=state.id)).current_position == {"x": 0, "y": 0}
+
+    loaded = GameManager(seed=5, share_world=False)
+    await loaded.load_game(state.id)
+    assert loaded.journal.trusted
+    assert loaded.current_game_state.current_position == {"x": 1, "y": 2}
+    assert loaded.current_game_state.current_biome == loaded.world_generator.biome_at(1, 2)
+    loaded.journal.close()
+
+async def test_state_row_is_saved_at_each_snapshot(database, journal_dir):
+    game_manager = GameManager(seed=5, share_world=False)
+    state = await game_manager.new_game()
+    await _play(game_manager, ["north"] * SNAPSHOT_INTERVAL)
+    game_manager.journal.close()
+    assert (await GameState.get(id=state.id)).current_position == {"x": 0, "y": SNAPSHOT_INTERVAL}
+
+async def test_without_a_journal_the_row_is_saved_on_every_action(database, journal_dir):
+    game_manager = GameManager(seed=5, share_world=False)
+    state = await game_manager.new_game()
+    await _play(game_manager, ["north", "north"])
+    game_manager.journal.close()
+    await game_manager.save_game()
+    os.remove(game_manager.journal.path)
+
+    loaded = GameManager(seed=5, share_world=False)
+    await loaded.load_game(state.id)
+    assert not loaded.journal.trusted
+    assert loaded.current_game_state.current_position == {"x": 0, "y": 2}
+    await _play(loaded, ["east"])
+    loaded.journal.close()
+    assert (await GameState.get(id=state.id)).current_position == {"x": 1, "y": 2}
+
+async def test_replay_reruns_every_action(tmp_path):
+    writer = ActionJournal(3, 11, ":memory:", str(tmp_path))
+    writer.begin(_state())
+    for direction in ("north", "east", "east", "south", "south"):
+        writer.record_action(*_move(direction))
+    writer.close()
+    assert sum("type" in record for record in read_records(writer.path)) == 5
+
+    result = await replay(writer.path)
+    assert result["actions"] == 5
+    assert result["final_position"] == {"x": 2, "y": -1}
+
+async def test_replay_rejects_other_files(tmp_path):
+    path = tmp_path / "notes.jsonl"
+    path.write_text('{"hello": "world"}\n', encoding="utf-8")
+    with pytest.raises(ValueError):
+        await replay(str(path))
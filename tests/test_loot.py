@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+from src.models.base import BiomeType
+from src.utils.loot import (
+    AliasTable, BIOME_LOOT_WEIGHTS, LOOT_TYPES, OUTCOME_RARITY, OUTCOME_TYPE, RARITIES, generate_loot, loot_table
+)
+
+DRAWS = 200_000
+
+def _assert_distribution(counts: np.ndarray, weights) -> None:
+    """Every frequency within five standard deviations of its weight's share"""
+    p = np.asarray(weights, dtype=np.float64) / sum(weights)
+    n = counts.sum()
+    tolerance = 5 * np.sqrt(n * p * (1 - p)) + 1
+    assert (np.abs(counts - n * p) <= tolerance).all(), (counts, n * p)
+
+def test_alias_table_draws_with_its_weights():
+    weights = [5.0, 0.5, 1.0, 0.0, 12.0, 3.25, 0.01]
+    samples = AliasTable(weights).sample(np.random.default_rng(1), DRAWS)
+    counts = np.bincount(samples, minlength=len(weights))
+    assert counts[3] == 0
+    _assert_distribution(counts, weights)
+
+def test_alias_table_with_one_outcome():
+    assert (AliasTable([2.0]).sample(np.random.default_rng(0), 100) == 0).all()
+
+def test_alias_table_rejects_no_weight():
+    with pytest.raises(ValueError):
+        AliasTable([0.0, 0.0])
+    with pytest.raises(ValueError):
+        AliasTable([])
+
+@pytest.mark.parametrize("biome", list(BIOME_LOOT_WEIGHTS))
+def test_loot_types_and_rarities_follow_biome_weights(biome: BiomeType):
+    outcome = loot_table(biome).sample(np.random.default_rng(5), DRAWS)
+    type_weights = [BIOME_LOOT_WEIGHTS[biome].get(item_type, 0.0) for item_type in LOOT_TYPES]
+    _assert_distribution(np.bincount(OUTCOME_TYPE[outcome], minlength=len(LOOT_TYPES)), type_weights)
+    _assert_distribution(np.bincount(OUTCOME_RARITY[outcome], minlength=len(RARITIES)),
+                         [weight for _, weight, _ in RARITIES])
+
+def test_generate_loot_is_reproducible_from_a_seed():
+    first = list(generate_loot(BiomeType.FOREST, 50, 11).records())
+    second = list(generate_loot(BiomeType.FOREST, 50, 11).records())
+    assert first == second
+    assert len(first) == 50
+    record = first[0]
+    assert set(record) == {"name", "type", "rarity", "description", "properties"}
+    # Properties are copies, so changing one item leaves the next untouched
+    record["properties"]["value"] = -1
+    assert list(generate_loot(BiomeType.FOREST, 50, 11).records())[0]["properties"]["value"] != -1
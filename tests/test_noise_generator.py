@@ -0,0 +1,49 @@
+import numpy as np
+from opensimplex import OpenSimplex
+from src.core.world import WorldGenerator
+from src.utils.noise_generator import hash_uniform, hash_uniform_scalar, noise2, noise2_grid, octave_noise2_grid
+
+SEEDS = (0, 1234, 987654)
+
+def _points(seed: int, n: int = 2000):
+    rng = np.random.default_rng(seed)
+    # Mix of world-scale coordinates, tiny ones and exact lattice points
+    x = np.concatenate([rng.uniform(-3000, 3000, n), rng.uniform(-2, 2, n), np.arange(-5, 5, 0.5)])
+    y = np.concatenate([rng.uniform(-3000, 3000, n), rng.uniform(-2, 2, n), np.arange(5, -5, -0.5)])
+    return x, y
+
+def test_noise2_is_bit_identical_to_opensimplex():
+    for seed in SEEDS:
+        reference = OpenSimplex(seed)
+        x, y = _points(seed)
+        expected = np.array([reference.noise2(a, b) for a, b in zip(x.tolist(), y.tolist())])
+        assert np.array_equal(noise2(seed, x, y), expected)
+
+def test_noise2_grid_matches_pointwise():
+    xs = np.linspace(-40.0, 40.0, 37)
+    ys = np.linspace(-15.0, 25.0, 23)
+    grid = noise2_grid(99, xs, ys)
+    assert grid.shape == (ys.size, xs.size)
+    assert np.array_equal(grid, noise2(99, xs[np.newaxis, :], ys[:, np.newaxis]))
+
+def test_elevation_grid_matches_scalar_elevation():
+    world = WorldGenerator(seed=4321)
+    grid = world.elevation_grid(-30, 50, 40, 30)
+    for row, y in enumerate(range(50, 80)):
+        for column, x in enumerate(range(-30, 10)):
+            assert grid[row, column] == world._get_elevation(x, y)
+
+def test_octave_grid_of_one_octave_is_plain_noise():
+    xs = np.arange(-20.0, 20.0)
+    ys = np.arange(0.0, 30.0)
+    grid = octave_noise2_grid(7, xs, ys, [0.05], [1.0])
+    assert np.array_equal(grid, noise2_grid(7, xs * 0.05, ys * 0.05))
+
+def test_hash_uniform_matches_scalar():
+    xs = np.arange(-50, 50)[np.newaxis, :]
+    ys = np.arange(-20, 20)[:, np.newaxis]
+    grid = hash_uniform(55, xs, ys, 3)
+    assert ((grid >= 0) & (grid < 1)).all()
+    for row, y in enumerate(range(-20, 20)):
+        for column, x in enumerate(range(-50, 50)):
+            assert grid[row, column] == hash_uniform_scalar(55, x, y, 3)
@@ -0,0 +1,37 @@
+import heapq
+import random
+from src.core.simulation import TimerWheel
+
+def test_timer_wheel_matches_heap():
+    """Random schedules fire at the same ticks as a binary heap of due times"""
+    rng = random.Random(7)
+    for trial in range(20):
+        start = rng.randrange(0, 10_000)
+        wheel = TimerWheel(start, slots=8, levels=3)  # Small wheels so cascades and overflow happen
+        heap = []
+        now = start
+        counter = 0
+        for _ in range(300):
+            for _ in range(rng.randrange(0, 4)):
+                # Mostly near, some beyond the top level's span of 8**3 ticks
+                delay = rng.choice((rng.randrange(0, 10), rng.randrange(0, 600), rng.randrange(0, 3000)))
+                wheel.schedule(delay, counter)
+                heapq.heappush(heap, (now + max(1, delay), counter))
+                counter += 1
+            now += rng.choice((1, 1, 2, rng.randrange(1, 200)))
+            expected = []
+            while heap and heap[0][0] <= now:
+                expected.append(heapq.heappop(heap)[1])
+            assert sorted(wheel.advance(now)) == sorted(expected), f"trial {trial} at tick {now}"
+            assert len(wheel) == len(heap)
+
+def test_timer_wheel_fires_in_due_order():
+    """Events come out in due order, and a zero delay still waits one tick"""
+    wheel = TimerWheel(0)
+    for delay, event in ((5, "c"), (0, "a"), (3, "b")):
+        wheel.schedule(delay, event)
+    fired = []
+    for tick in range(1, 7):
+        fired += wheel.advance(tick)
+    assert fired == ["a", "b", "c"]
+    assert len(wheel) == 0
@@ -0,0 +1,98 @@
+from types import SimpleNamespace
+from src.core.mcts_manager import MCTSManager
+from src.core.transposition import (
+    KEY_BIOME, KEY_HEALTH, KEY_X, KEY_Y, TranspositionTable, interaction_id, marked_key, zobrist_key
+)
+from src.core.world import COMPASS, WorldGenerator
+
+def _manager(seed: int = 77) -> MCTSManager:
+    return MCTSManager(SimpleNamespace(world_generator=WorldGenerator(seed=seed)), table_size=64)
+
+def _state(manager: MCTSManager, x: int, y: int, health: int = 100) -> SimpleNamespace:
+    biome = manager.game_manager.world_generator.biome_at(x, y)
+    return SimpleNamespace(current_position={"x": x, "y": y}, current_biome=biome, health=health)
+
+def _walk(manager: MCTSManager, x: int, y: int, directions) -> int:
+    """Key after moving from (x, y) through `directions`, updated one move at a time"""
+    key = manager._get_state_key(_state(manager, x, y))
+    for direction in directions:
+        biome = manager.game_manager.world_generator.biome_at(x, y)
+        key = manager._get_child_key(key, (x, y), biome, {"type": "move", "direction": direction})
+        dx, dy = COMPASS[direction]
+        x, y = x + dx, y + dy
+    return key
+
+def test_component_keys_are_distinct():
+    keys = {zobrist_key(component, value) for component in (KEY_X, KEY_Y, KEY_BIOME, KEY_HEALTH)
+            for value in range(-200, 200)}
+    assert len(keys) == 4 * 400
+    assert all(0 <= key < 1 << 64 for key in keys)
+
+def test_incremental_move_keys_match_keys_built_from_scratch():
+    manager = _manager()
+    route = ["north", "north", "east", "south", "west", "west", "north", "east", "east"]
+    x, y = 10, -4
+    for step in range(len(route) + 1):
+        dx = sum(COMPASS[d][0] for d in route[:step])
+        dy = sum(COMPASS[d][1] for d in route[:step])
+        assert _walk(manager, x, y, route[:step]) == manager._get_state_key(_state(manager, x + dx, y + dy))
+
+def test_paths_to_the_same_tile_share_a_key():
+    manager = _manager()
+    assert _walk(manager, 0, 0, ["north", "east"]) == _walk(manager, 0, 0, ["east", "north"])
+    assert _walk(manager, 0, 0, ["north", "south"]) == manager._get_state_key(_state(manager, 0, 0))
+
+def test_health_changes_the_key():
+    manager = _manager()
+    assert manager._get_state_key(_state(manager, 3, 3, 100)) != manager._get_state_key(_state(manager, 3, 3, 90))
+
+def test_interactions_never_lead_back_to_an_ancestor():
+    mark = interaction_id("tree", "oak", "examine")
+    key = zobrist_key(KEY_X, 1) ^ zobrist_key(KEY_Y, 2)
+    seen = {key}
+    for _ in range(100):
+        key = marked_key(key, mark)
+        assert key not in seen
+        seen.add(key)
+    assert interaction_id("tree", "oak", "examine") == mark
+    assert interaction_id("tree", "oak", "climb") != mark
+
+def test_store_returns_the_existing_entry_and_keeps_the_shallowest_depth():
+    table = TranspositionTable(8)
+    entry = table.store(5, depth=4)
+    assert table.store(5, depth=2) is entry
+    assert table.store(5, depth=6) is entry
+    assert entry.depth == 2
+    assert table.get(5) is entry
+    assert table.get(13) is None
+
+def test_deeper_entry_goes_to_the_always_replace_slot():
+    table = TranspositionTable(8)
+    shallow = table.store(3, depth=1)
+    deep = table.store(11, depth=5)  # Same bucket as 3
+    assert table.get(3) is shallow and table.get(11) is deep
+    newer = table.store(19, depth=6)
+    # The shallow entry keeps its slot; the newest deep one replaces the older deep one
+    assert table.get(3) is shallow and table.get(19) is newer
+    assert table.get(11) is None
+    assert len(table) == 2
+
+def test_shallower_entry_demotes_the_preferred_one():
+    table = TranspositionTable(8)
+    first = table.store(2, depth=3)
+    table.store(10, depth=7)
+    second = table.store(18, depth=1)
+    assert table.get(18) is second and table.get(2) is first
+    assert table.get(10) is None
+
+def test_entries_from_an_older_search_give_way():
+    table = TranspositionTable(8)
+    old = table.store(4, depth=0)
+    table.new_search()
+    fresh = table.store(12, depth=9)
+    assert table._slots[8] is fresh and table._slots[9] is old
+    # Reading an entry brings it into the current search
+    table.new_search()
+    table.get(12)
+    assert table.store(20, depth=10) is table._slots[9]
+    assert table.get(12) is fresh
@@ -0,0 +1,108 @@
+import pytest
+from src.core.game_manager import GameManager
+from src.core.unit_of_work import UnitOfWork
+from src.models.base import GameState, Item, ItemType, Location, LocationOverlay
+
+async def _game(seed: int = 1234) -> GameManager:
+    game_manager = GameManager(seed=seed, share_world=False, journal=False)
+    await game_manager.new_game()
+    return game_manager
+
+def _fish_tile(game_manager: GameManager):
+    world = game_manager.world_generator
+    return next((x, y) for x in range(200) for y in range(200)
+                if any(f["type"] == "resource" and f["variant"] == "fish" for f in world.features_at(x, y)))
+
+def _item(game_manager: GameManager, name: str = "Fish") -> Item:
+    return Item(name=name, item_type=ItemType.TREASURE, description="", properties={},
+                game_state=game_manager.current_game_state)
+
+async def test_turn_writes_nothing_until_it_commits(database):
+    game_manager = await _game()
+    async with game_manager.turn() as unit_of_work:
+        await game_manager.process_action("move", {"direction": "north"})
+        await game_manager.get_current_location()
+        assert unit_of_work.pending
+        assert await Location.all().count() == 0
+        assert (await GameState.get(id=game_manager.current_game_state.id)).current_position == {"x": 0, "y": 0}
+    assert not unit_of_work.pending
+    assert await Location.filter(seed=1234, x=0, y=1).exists()
+    assert (await GameState.get(id=game_manager.current_game_state.id)).current_position == {"x": 0, "y": 1}
+
+async def test_a_failed_turn_writes_nothing(database):
+    game_manager = await _game()
+    with pytest.raises(RuntimeError):
+        async with game_manager.turn():
+            await game_manager.process_action("move", {"direction": "east"})
+            await game_manager.get_current_location()
+            raise RuntimeError("interrupted")
+    assert await Location.all().count() == 0
+    # Dropped from the cache, so the tile is stored the next time it is reached
+    assert game_manager.location_cache.peek(1, 0) is None
+
+async def test_a_failed_commit_rolls_back_the_turn(database, monkeypatch):
+    game_manager = await _game()
+    x, y = _fish_tile(game_manager)
+    game_manager.current_game_state.current_position = {"x": x, "y": y}
+
+    async def failing(self):
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(UnitOfWork, "commit", failing)
+    with pytest.raises(RuntimeError):
+        async with game_manager.turn():
+            assert await game_manager.add_item("fish") == "Added fish to inventory"
+    monkeypatch.undo()
+
+    assert game_manager.location_cache.peek(x, y) is None
+    assert game_manager.overlay.get(x, y) is None
+    assert await game_manager.get_inventory() == []
+    assert await Item.all().count() == 0
+    # The fish is still there to take, and this time it sticks
+    async with game_manager.turn():
+        assert await game_manager.add_item("fish") == "Added fish to inventory"
+    assert await Item.all().count() == 1
+    assert await LocationOverlay.all().count() == 1
+    async with game_manager.turn():
+        assert await game_manager.add_item("fish") == "There is no fish here to take."
+
+async def test_a_failed_turn_restores_overlay_changes_to_a_known_tile(database):
+    game_manager = await _game()
+    async with game_manager.turn():
+        location = await game_manager.get_current_location()
+        await game_manager._save_overlay(game_manager.overlay.remove_feature(0, 0, location.features[0]))
+    delta = game_manager.overlay.get(0, 0)
+    removed, row = set(delta.removed), delta.row
+
+    with pytest.raises(RuntimeError):
+        async with game_manager.turn():
+            await game_manager._save_overlay(game_manager.overlay.add_feature(0, 0, location.features[0]))
+            raise RuntimeError("interrupted")
+    delta = game_manager.overlay.get(0, 0)
+    assert delta.removed == removed
+    assert delta.row is row
+    assert [tuple(f) for f in row.removed_features] == [tuple(key) for key in removed]
+
+async def test_dropping_an_item_taken_in_the_same_turn_never_writes_it(database):
+    game_manager = await _game()
+    unit_of_work = UnitOfWork()
+    first, second = _item(game_manager), _item(game_manager)
+    unit_of_work.add_item(first)
+    unit_of_work.add_item(second)
+    unit_of_work.delete_item(second)
+    # Unsaved models compare equal, so the right one must be matched by identity
+    assert len(unit_of_work.new_items) == 1 and unit_of_work.new_items[0] is first
+    assert unit_of_work.deleted_items == []
+    await unit_of_work.commit()
+    assert await Item.all().count() == 1
+
+async def test_overlay_rows_are_queued_once(database):
+    game_manager = await _game()
+    unit_of_work = UnitOfWork()
+    first = LocationOverlay(game_state=game_manager.current_game_state, x=0, y=0)
+    second = LocationOverlay(game_state=game_manager.current_game_state, x=1, y=0)
+    for row in (first, second, first):
+        unit_of_work.save_overlay(row)
+    assert len(unit_of_work.overlays) == 2
+    await unit_of_work.commit()
+    assert await LocationOverlay.all().count() == 2